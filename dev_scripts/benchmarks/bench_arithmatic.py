@@ -0,0 +1,43 @@
+"""Benchmark arithmatic with portfolio lines on the same quarterhourly index.
+
+Run with ``python dev_scripts/benchmarks/bench_arithmatic.py``. Times addition,
+subtraction, negation and multiplication (with a dimensionless timeseries) of
+SinglePfLines with a volume and a price, for several years of data. For comparison, the
+operations are also done with the quick path switched off, i.e., with index alignment,
+``dropna``, resampling, and verification of the resulting data.
+"""
+
+import timeit
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import portfolyo as pf
+from portfolyo.core.pfline import enable_arithmatic
+
+QUICKPATH = "_singlepfline_from_values"
+
+
+def get_pflines(years: int):
+    end = str(2020 + years)
+    i = pd.date_range("2020", end, freq="15T", tz="Europe/Berlin", inclusive="left")
+    pfl1, pfl2 = (pf.dev.get_singlepfline(i, pf.Kind.ALL) for _ in range(2))
+    factor = pd.Series(np.random.rand(len(i)), i).astype("pint[dimensionless]")
+    return pfl1, pfl2, factor
+
+
+if __name__ == "__main__":
+    print(f"{'years':>5} {'operation':>10} {'quick path':>12} {'full path':>12}")
+    for years in [1, 5]:
+        pfl1, pfl2, factor = get_pflines(years)
+        operations = {
+            "add": lambda: pfl1 + pfl2,
+            "sub": lambda: pfl1 - pfl2,
+            "neg": lambda: -pfl1,
+            "mul": lambda: pfl1 * factor,
+        }
+        for name, fn in operations.items():
+            quick = min(timeit.repeat(fn, number=1, repeat=5))
+            with mock.patch.object(enable_arithmatic, QUICKPATH, lambda *_: None):
+                slow = min(timeit.repeat(fn, number=1, repeat=3))
+            print(f"{years:>5} {name:>10} {quick * 1e3:>10.1f}ms {slow * 1e3:>10.1f}ms")
@@ -0,0 +1,59 @@
+"""Benchmark changing the frequency of a dataframe.
+
+Run with ``python dev_scripts/benchmarks/bench_changefreq.py``. Compares
+``changefreq.summable`` (all columns at once, with precomputed period codes) with
+resampling each column separately in pandas. (Float values; with ``pint`` values, pandas
+is slower by orders of magnitude, as it resamples those element by element.) Also
+compares changing the frequency of many portfolio lines with the same index, with and
+without reusing the resampling plan.
+"""
+
+import timeit
+
+import numpy as np
+import pandas as pd
+import portfolyo as pf
+from portfolyo.core import changefreq
+
+
+def get_dataframe(n: int) -> pd.DataFrame:
+    i = pd.date_range("2020", "2022", freq="15T", tz="Europe/Berlin", inclusive="left")
+    return pd.DataFrame(np.random.rand(len(i), n), i)
+
+
+def kernel(df: pd.DataFrame, freq: str) -> pd.DataFrame:
+    return changefreq.summable(df, freq)
+
+
+def pandas_per_column(df: pd.DataFrame, freq: str) -> pd.DataFrame:
+    return pd.DataFrame({c: s.resample(freq).sum() for c, s in df.items()})
+
+
+def many_pflines(pfls, freq: str, reuse_plan: bool) -> None:
+    changefreq.plan_cache_clear()
+    changefreq.set_plan_cache_maxsize(32 if reuse_plan else 0)
+    for pfl in pfls:
+        pfl.asfreq(freq)
+    changefreq.set_plan_cache_maxsize(32)
+
+
+if __name__ == "__main__":
+    print(f"{'columns':>7} {'freq':>4} {'kernel':>10} {'pandas':>10}")
+    for n in [1, 10, 100]:
+        df = get_dataframe(n)
+        for freq in ["H", "MS"]:
+            times = [
+                min(timeit.repeat(lambda: fn(df, freq), number=1, repeat=3))
+                for fn in [kernel, pandas_per_column]
+            ]
+            print(f"{n:>7} {freq:>4} {times[0] * 1e3:>8.1f}ms {times[1] * 1e3:>8.1f}ms")
+
+    print(f"\n{'pflines':>7} {'freq':>4} {'plan reuse':>10} {'no reuse':>10}")
+    i = get_dataframe(1).index
+    pfls = [pf.dev.get_singlepfline(i, pf.Kind.VOLUME_ONLY) for _ in range(100)]
+    for freq in ["H", "MS"]:
+        times = [
+            min(timeit.repeat(lambda: many_pflines(pfls, freq, b), number=1, repeat=3))
+            for b in [True, False]
+        ]
+        print(f"{100:>7} {freq:>4} {times[0] * 1e3:>8.1f}ms {times[1] * 1e3:>8.1f}ms")
@@ -0,0 +1,34 @@
+"""Benchmark ``stamps.duration`` and ``stamps.ts_right`` on multi-decade daily indices.
+
+Run with ``python dev_scripts/benchmarks/bench_duration.py``. The time per timestamp
+should stay (roughly) constant as the index gets longer, i.e., the scaling is linear.
+"""
+
+import timeit
+
+import pandas as pd
+from portfolyo.tools import stamps
+
+
+def bench(years: int, freq: str = "D", tz: str = "Europe/Berlin", repeat: int = 5):
+    i = pd.date_range("1990", freq=freq, periods=1, tz=tz)
+    i = pd.date_range(i[0], i[0] + pd.DateOffset(years=years), freq=freq, tz=tz)
+    results = {}
+    for name, fn in [("duration", stamps.duration), ("ts_right", stamps.ts_right)]:
+        t = min(timeit.repeat(lambda: fn(i), number=1, repeat=repeat))
+        results[name] = t
+    return len(i), results
+
+
+if __name__ == "__main__":
+    print(
+        f"{'freq':>5} {'years':>6} {'length':>8} {'function':>9} {'total':>10} {'per ts':>10}"
+    )
+    for freq in ["D", "MS"]:
+        for years in [10, 20, 40, 80]:
+            length, results = bench(years, freq)
+            for name, t in results.items():
+                print(
+                    f"{freq:>5} {years:>6} {length:>8} {name:>9} {t * 1e3:>8.2f}ms"
+                    f" {t / length * 1e9:>8.0f}ns"
+                )
@@ -0,0 +1,50 @@
+"""Benchmark comparing portfolio lines, and calculating their fingerprint.
+
+Run with ``python dev_scripts/benchmarks/bench_eq.py``. Compares two equal (but not
+identical) SinglePfLines with a volume and a price, for several years of quarterhourly
+values; also two MultiPfLines with 20 such children, stored as a stack. For comparison,
+the SinglePfLines are also compared with ``testing.assert_frame_equal``, as was done
+before.
+"""
+
+import timeit
+
+import pandas as pd
+import portfolyo as pf
+from portfolyo import testing
+
+
+def frames_equal(pfl1, pfl2) -> bool:
+    try:
+        testing.assert_frame_equal(pfl1._df, pfl2._df, rtol=1e-7)
+        return True
+    except AssertionError:
+        return False
+
+
+def fingerprint(pfl) -> str:
+    children = list(pfl.values()) if isinstance(pfl, pf.MultiPfLine) else []
+    for p in [pfl, *children]:
+        p.cache_clear()
+    return pfl.fingerprint()
+
+
+if __name__ == "__main__":
+    print(f"{'years':>5} {'operation':>16} {'time':>10}")
+    for years in [1, 5]:
+        end = str(2020 + years)
+        i = pd.date_range("2020", end, freq="15T", tz="Europe/Berlin", inclusive="left")
+        df = pf.dev.get_dataframe(i, "qr")
+        pfl1, pfl2 = pf.SinglePfLine(df), pf.SinglePfLine(df.copy())
+        wide = pd.concat({f"child{n}": df for n in range(20)}, axis=1)
+        mpfl1, mpfl2 = pf.MultiPfLine(wide), pf.MultiPfLine(wide.copy())
+        operations = {
+            "single ==": lambda: pfl1 == pfl2,
+            "single frames": lambda: frames_equal(pfl1, pfl2),
+            "single hash": lambda: fingerprint(pfl1),
+            "multi ==": lambda: mpfl1 == mpfl2,
+            "multi hash": lambda: fingerprint(mpfl1),
+        }
+        for name, fn in operations.items():
+            time = min(timeit.repeat(fn, number=1, repeat=3))
+            print(f"{years:>5} {name:>16} {time * 1e3:>8.1f}ms")
@@ -0,0 +1,74 @@
+"""Benchmark hedging a power timeseries with a price timeseries.
+
+Run with ``python dev_scripts/benchmarks/bench_hedge.py``. Compares the vectorized
+hedge (one weighted sum per product, for all products at once) with hedging each
+product in a ``groupby.apply``; and hedging many power timeseries at once with hedging
+them one by one.
+"""
+
+import timeit
+
+import numpy as np
+import pandas as pd
+from portfolyo.prices import convert, hedge
+
+
+def get_series(freq: str):
+    i = pd.date_range("2020", "2030", freq=freq, tz="Europe/Berlin", inclusive="left")
+    w = pd.Series(np.random.rand(len(i)) * 10, i)
+    p = pd.Series(np.random.rand(len(i)) * 100 + 50, i)
+    return w, p
+
+
+def vectorized(w: pd.Series, p: pd.Series, aggfreq: str):
+    return hedge.hedge(w, p, "val", aggfreq, po=True)
+
+
+def hedge_product(df: pd.DataFrame) -> pd.Series:
+    """Value hedge of a single product."""
+    p_hedge = (df.p * df.dur).sum() / df.dur.sum()
+    w_hedge = (df.w * df.dur * df.p).sum() / (df.dur * df.p).sum()
+    return pd.Series({"w": w_hedge, "p": p_hedge})
+
+
+def groupby_apply(w: pd.Series, p: pd.Series, aggfreq: str):
+    df = pd.DataFrame({"w": w, "p": p, "dur": w.index.duration.pint.m})
+    keys = convert.group_keys(df.index, aggfreq, True)
+    vals = df.groupby(keys).apply(hedge_product)
+    vals.index = pd.MultiIndex.from_tuples(vals.index)
+    for c in ["w", "p"]:
+        df[c] = df[c].groupby(keys).transform(lambda gr: vals.loc[gr.name, c])
+    return df["w"], df["p"]
+
+
+def batch(w: pd.DataFrame, p: pd.Series):
+    return hedge.hedge(w, p, "val", "MS", po=True)
+
+
+def one_by_one(w: pd.DataFrame, p: pd.Series):
+    return [hedge.hedge(s, p, "val", "MS", po=True) for _, s in w.items()]
+
+
+if __name__ == "__main__":
+    print(f"{'freq':>4} {'products':>8} {'vectorized':>11} {'groupby':>11}")
+    for freq in ["H", "15T"]:
+        w, p = get_series(freq)
+        for aggfreq in ["MS", "QS"]:
+            times = [
+                min(timeit.repeat(lambda: fn(w, p, aggfreq), number=1, repeat=3))
+                for fn in [vectorized, groupby_apply]
+            ]
+            print(
+                f"{freq:>4} {aggfreq:>8} {times[0] * 1e3:>9.1f}ms"
+                f" {times[1] * 1e3:>9.1f}ms"
+            )
+
+    print(f"\n{'series':>6} {'batch':>11} {'one by one':>11}")
+    w, p = get_series("H")
+    for n in [10, 100]:
+        wdf = pd.DataFrame({f"customer{c}": w * np.random.rand() for c in range(n)})
+        times = [
+            min(timeit.repeat(lambda: fn(wdf, p), number=1, repeat=3))
+            for fn in [batch, one_by_one]
+        ]
+        print(f"{n:>6} {times[0] * 1e3:>9.1f}ms {times[1] * 1e3:>9.1f}ms")
@@ -0,0 +1,39 @@
+"""Benchmark inferring the frequency of long quarterhourly indices without frequency.
+
+Run with ``python dev_scripts/benchmarks/bench_inferfreq.py``. Compares
+``pd.infer_freq`` with ``stamps.infer_frequency``, and times ``frames.set_frequency``
+(which infers and then sets the frequency), for 50 years of quarterhourly timestamps:
+tz-aware, tz-agnostic, and in local time (i.e., with DST-transitions, no frequency).
+"""
+
+import timeit
+
+import pandas as pd
+from portfolyo.tools import frames, stamps
+
+
+def get_indices() -> dict:
+    kwargs = {"freq": "15T", "inclusive": "left"}
+    aware = pd.date_range("2000", "2050", tz="Europe/Berlin", **kwargs)
+    agnostic = pd.date_range("2000", "2050", **kwargs)
+    local = aware.tz_localize(None)
+    return {
+        "aware": pd.DatetimeIndex(aware, freq=None),
+        "agnostic": pd.DatetimeIndex(agnostic, freq=None),
+        "local": local[~local.duplicated()],  # gaps at start of DST
+    }
+
+
+if __name__ == "__main__":
+    header = ["index", "pd.infer_freq", "infer_frequency", "set_frequency"]
+    print(f"{header[0]:>9} {header[1]:>15} {header[2]:>15} {header[3]:>15}")
+    for name, i in get_indices().items():
+        s = pd.Series(0.0, i)
+        fns = [
+            lambda: pd.infer_freq(i),
+            lambda: stamps.infer_frequency(i),
+            lambda: frames.set_frequency(s, copy=False),
+        ]
+        times = [min(timeit.repeat(fn, number=1, repeat=5)) for fn in fns]
+        times = [f"{t * 1e3:.1f}ms" for t in times]
+        print(f"{name:>9} {times[0]:>15} {times[1]:>15} {times[2]:>15}")
@@ -0,0 +1,33 @@
+"""Benchmark selecting one month out of long portfolio lines and portfolio states.
+
+Run with ``python dev_scripts/benchmarks/bench_loc.py``. Selects one month (with
+``.loc``) from 10 years of quarterhourly values: of a SinglePfLine with volume and
+price, of a MultiPfLine with 20 such children (stored as a stack), and of a PfState.
+For comparison, the selection is also done with the views switched off, i.e., by
+copying and verifying the selected values.
+"""
+
+import timeit
+from unittest import mock
+
+import pandas as pd
+import portfolyo as pf
+from portfolyo.tools import stamps
+
+
+if __name__ == "__main__":
+    i = pd.date_range("2020", "2030", freq="15T", tz="Europe/Berlin", inclusive="left")
+    df = pf.dev.get_dataframe(i, "qr")
+    wide = pd.concat({f"child{n}": df for n in range(20)}, axis=1)
+    objects = {
+        "SinglePfLine": pf.SinglePfLine(df),
+        "MultiPfLine": pf.MultiPfLine(wide),
+        "PfState": pf.dev.get_pfstate(i),
+    }
+    print(f"{'object':>12} {'view':>10} {'copy':>10}")
+    for name, obj in objects.items():
+        fn = lambda: obj.loc["2025-03":"2025-03"]  # noqa
+        view = min(timeit.repeat(fn, number=1, repeat=5))
+        with mock.patch.object(stamps, "contiguous_slice", lambda *_: None):
+            copy = min(timeit.repeat(fn, number=1, repeat=3))
+        print(f"{name:>12} {view * 1e3:>8.1f}ms {copy * 1e3:>8.1f}ms")
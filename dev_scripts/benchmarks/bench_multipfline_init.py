@@ -0,0 +1,51 @@
+"""Benchmark creating a MultiPfLine with many children.
+
+Run with ``python dev_scripts/benchmarks/bench_multipfline_init.py``. Compares passing
+all children at once (which verifies and trims them in one go) with adding them one by
+one (which re-verifies all children on each addition).
+"""
+
+import timeit
+
+import numpy as np
+import pandas as pd
+import portfolyo as pf
+
+
+def get_children(n: int, staggered: bool) -> dict:
+    i = pd.date_range("2020", "2022", freq="D", tz="Europe/Berlin", inclusive="left")
+    children = {}
+    for c in range(n):
+        # Staggered: each child has a slightly different start, so all must be trimmed.
+        offset = c % 30 if staggered else 0
+        i_child = i[offset:]
+        q = pd.Series(np.random.rand(len(i_child)), i_child)
+        children[f"customer{c}"] = pf.SinglePfLine({"q": q})
+    return children
+
+
+def all_at_once(children: dict) -> pf.MultiPfLine:
+    return pf.MultiPfLine(children)
+
+
+def one_by_one(children: dict) -> pf.MultiPfLine:
+    items = iter(children.items())
+    pfl = pf.MultiPfLine(dict([next(items)]))
+    for name, child in items:
+        pfl[name] = child
+    return pfl
+
+
+if __name__ == "__main__":
+    print(f"{'children':>8} {'staggered':>9} {'all at once':>12} {'one by one':>12}")
+    for n in [10, 100, 1000]:
+        for staggered in [False, True]:
+            children = get_children(n, staggered)
+            times = [
+                min(timeit.repeat(lambda: fn(children), number=1, repeat=3))
+                for fn in [all_at_once, one_by_one]
+            ]
+            print(
+                f"{n:>8} {str(staggered):>9} {times[0] * 1e3:>10.1f}ms"
+                f" {times[1] * 1e3:>10.1f}ms"
+            )
@@ -0,0 +1,43 @@
+"""Benchmark output of a portfolio state, which needs its derived portfolio lines.
+
+Run with ``python dev_scripts/benchmarks/bench_pfstate.py``. Times creating the text
+representation and the dataframe of a portfolio state with several years of
+quarterhourly values, and changing its unsourced prices (after which the unsourced
+volume is still known). Each operation is timed on a new instance, so that no derived
+values are cached beforehand.
+"""
+
+import timeit
+
+import pandas as pd
+import portfolyo as pf
+
+
+def get_pfstate(years: int) -> pf.PfState:
+    end = str(2020 + years)
+    i = pd.date_range("2020", end, freq="15T", tz="Europe/Berlin", inclusive="left")
+    return pf.dev.get_pfstate(i)
+
+
+if __name__ == "__main__":
+    print(f"{'years':>5} {'operation':>22} {'time':>10}")
+    for years in [1, 5]:
+        pfs = get_pfstate(years)
+        newprice = pf.dev.get_singlepfline(pfs.index, pf.Kind.PRICE_ONLY)
+
+        def fresh() -> pf.PfState:
+            return pf.PfState(pfs.offtakevolume, pfs.unsourcedprice, pfs.sourced)
+
+        def output():
+            pfs = fresh()
+            repr(pfs), pfs.df()
+
+        def set_unsourcedprice():
+            pfs = fresh()
+            pfs.unsourced  # also calculates unsourced volume
+            pfs.set_unsourcedprice(newprice).unsourced
+
+        operations = {"repr and df": output, "set_unsourcedprice": set_unsourcedprice}
+        for name, fn in operations.items():
+            time = min(timeit.repeat(fn, number=1, repeat=3))
+            print(f"{years:>5} {name:>22} {time * 1e3:>8.1f}ms")
@@ -0,0 +1,31 @@
+"""Benchmark resampling a portfolio state.
+
+Run with ``python dev_scripts/benchmarks/bench_pfstate_asfreq.py``. Times changing the
+frequency of a portfolio state with several years of quarterhourly values, to hourly,
+daily, and monthly values. Each resampling is done on a new instance, so that no
+derived values (like the unsourced portfolio line) are cached beforehand.
+"""
+
+import timeit
+
+import pandas as pd
+import portfolyo as pf
+
+
+def get_pfstate(years: int) -> pf.PfState:
+    end = str(2020 + years)
+    i = pd.date_range("2020", end, freq="15T", tz="Europe/Berlin", inclusive="left")
+    return pf.dev.get_pfstate(i)
+
+
+if __name__ == "__main__":
+    print(f"{'years':>5} {'freq':>5} {'time':>10}")
+    for years in [1, 5]:
+        pfs = get_pfstate(years)
+
+        def fresh() -> pf.PfState:
+            return pf.PfState(pfs.offtakevolume, pfs.unsourcedprice, pfs.sourced)
+
+        for freq in ["H", "D", "MS"]:
+            time = min(timeit.repeat(lambda: fresh().asfreq(freq), number=1, repeat=3))
+            print(f"{years:>5} {freq:>5} {time * 1e3:>8.1f}ms")
@@ -0,0 +1,34 @@
+"""Benchmark creating flat portfolio lines with and without data validation.
+
+Run with ``python dev_scripts/benchmarks/bench_singleinit.py``. Creates a SinglePfLine
+from a dataframe with power and price timeseries (several years of quarterhourly
+values), once with the default validation and once with ``validate=False``. Also
+times ``.volume`` and ``.price``, which create their SinglePfLine without validation.
+"""
+
+import timeit
+
+import pandas as pd
+import portfolyo as pf
+
+
+def get_dataframe(years: int) -> pd.DataFrame:
+    end = str(2020 + years)
+    i = pd.date_range("2020", end, freq="15T", tz="Europe/Berlin", inclusive="left")
+    return pf.dev.get_dataframe(i, "wp")
+
+
+if __name__ == "__main__":
+    print(f"{'years':>5} {'operation':>12} {'time':>10}")
+    for years in [1, 5]:
+        df = get_dataframe(years)
+        pfl = pf.SinglePfLine(df)
+        operations = {
+            "validate": lambda: pf.SinglePfLine(df),
+            "no validate": lambda: pf.SinglePfLine(df, validate=False),
+            ".volume": lambda: pfl.volume,
+            ".price": lambda: pfl.price,
+        }
+        for name, fn in operations.items():
+            time = min(timeit.repeat(fn, number=1, repeat=5))
+            print(f"{years:>5} {name:>12} {time * 1e3:>8.1f}ms")
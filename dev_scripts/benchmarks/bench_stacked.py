@@ -0,0 +1,56 @@
+"""Benchmark MultiPfLine with many children, created from a wide dataframe.
+
+Run with ``python dev_scripts/benchmarks/bench_stacked.py``. Compares the stacked
+storage (one array for all children, used when creating from a wide dataframe) with a
+dictionary of individual children, for creation, aggregation, and changing frequency.
+"""
+
+import timeit
+
+import numpy as np
+import pandas as pd
+import portfolyo as pf
+
+
+def get_dataframe(n: int) -> pd.DataFrame:
+    i = pd.date_range("2020", "2022", freq="H", tz="Europe/Berlin", inclusive="left")
+    values = np.random.rand(len(i), n)
+    return pd.DataFrame(values, i, [f"customer{c}" for c in range(n)]).astype(
+        "pint[MW]"
+    )
+
+
+def stacked(df: pd.DataFrame) -> pf.MultiPfLine:
+    return pf.MultiPfLine(df)
+
+
+def dictionary(df: pd.DataFrame) -> pf.MultiPfLine:
+    return pf.MultiPfLine({name: pf.SinglePfLine({"w": s}) for name, s in df.items()})
+
+
+def aggregate(pfl: pf.MultiPfLine) -> pd.Series:
+    pfl.cache_clear()
+    return pfl.q
+
+
+def asfreq(pfl: pf.MultiPfLine) -> pf.MultiPfLine:
+    return pfl.asfreq("MS")
+
+
+if __name__ == "__main__":
+    print(f"{'children':>8} {'operation':>9} {'stacked':>10} {'dictionary':>10}")
+    for n in [10, 100, 1000]:
+        df = get_dataframe(n)
+        pfls = [stacked(df), dictionary(df)]
+        for operation in ["create", "q", "asfreq"]:
+            if operation == "create":
+                fns = [lambda: stacked(df), lambda: dictionary(df)]
+            elif operation == "q":
+                fns = [lambda pfl=pfl: aggregate(pfl) for pfl in pfls]
+            else:
+                fns = [lambda pfl=pfl: asfreq(pfl) for pfl in pfls]
+            times = [min(timeit.repeat(fn, number=1, repeat=3)) for fn in fns]
+            print(
+                f"{n:>8} {operation:>9} {times[0] * 1e3:>8.1f}ms"
+                f" {times[1] * 1e3:>8.1f}ms"
+            )
@@ -0,0 +1,52 @@
+"""Benchmark memory use and time of standardizing a frame that is already standardized.
+
+Run with ``python dev_scripts/benchmarks/bench_standardize.py``. Standardizes a
+dataframe with several years of quarterhourly values (left-bound, with frequency, in
+the wanted timezone), once with the default ``copy=True`` and once with ``copy=False``.
+The peak memory allocated during the call is reported as a multiple of the frame's
+size; also for a frame whose index has no frequency and must first be inferred.
+"""
+
+import timeit
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from portfolyo.tools import frames
+
+
+def get_dataframe(years: int, columns: int = 4) -> pd.DataFrame:
+    end = str(2020 + years)
+    i = pd.date_range("2020", end, freq="15T", tz="Europe/Berlin", inclusive="left")
+    return pd.DataFrame(np.random.rand(len(i), columns), i.rename("ts_left"))
+
+
+def peak_memory(fn) -> int:
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+if __name__ == "__main__":
+    widths = [5, 9, 18, 18, 18]
+    header = ["years", "size", "copy=True", "copy=False", "no freq"]
+    print(" ".join(f"{h:>{w}}" for h, w in zip(header, widths)))
+    for years in [1, 5, 10]:
+        df = get_dataframe(years)
+        df_nofreq = df.set_axis(pd.DatetimeIndex(df.index, freq=None))
+        size = df.memory_usage(index=False).sum()
+        fns = [
+            lambda: frames.standardize(df, "aware"),
+            lambda: frames.standardize(df, "aware", copy=False),
+            lambda: frames.standardize(df_nofreq, "aware", copy=False),
+        ]
+        cells = []
+        for fn in fns:
+            fn()  # fill caches
+            peak = peak_memory(fn)
+            time = min(timeit.repeat(fn, number=1, repeat=3))
+            cells.append(f"{peak / size:.2f}x {time * 1e3:.1f}ms")
+        cells = [years, f"{size / 2**20:.0f}MB", *cells]
+        print(" ".join(f"{c:>{w}}" for c, w in zip(cells, widths)))
@@ -0,0 +1,26 @@
+"""Benchmark summing many portfolio lines.
+
+Run with ``python dev_scripts/benchmarks/bench_sum.py``. Sums a number of SinglePfLines
+with a volume and a price (one year of hourly values; each with a slightly different
+index), once with ``PfLine.sum`` and once by adding them one by one with ``sum()``.
+"""
+
+import timeit
+
+import pandas as pd
+import portfolyo as pf
+
+
+def get_pflines(count: int):
+    i = pd.date_range("2020", "2021", freq="H", tz="Europe/Berlin", inclusive="left")
+    starts = [n % 24 for n in range(count)]  # staggered: lines partly overlap
+    return [pf.dev.get_singlepfline(i[start:], pf.Kind.ALL) for start in starts]
+
+
+if __name__ == "__main__":
+    print(f"{'lines':>5} {'PfLine.sum':>12} {'sum()':>12}")
+    for count in [10, 100, 500]:
+        pflines = get_pflines(count)
+        quick = min(timeit.repeat(lambda: pf.PfLine.sum(pflines), number=1, repeat=3))
+        slow = min(timeit.repeat(lambda: sum(pflines), number=1, repeat=1))
+        print(f"{count:>5} {quick * 1e3:>10.1f}ms {slow * 1e3:>10.1f}ms")
@@ -0,0 +1,49 @@
+"""Benchmark converting quarterhourly values between tz-aware and tz-agnostic indices.
+
+Run with ``python dev_scripts/benchmarks/bench_zones.py``. Times both directions
+(``zones._aware_to_agnostic`` and ``zones._agnostic_to_aware``) for several years of
+data. For comparison, the aware-to-agnostic conversion is also done by looking up each
+timestamp individually (the previous implementation), for the shortest period only.
+"""
+
+import timeit
+
+import numpy as np
+import pandas as pd
+from portfolyo.tools import zones
+
+
+def get_series(years: int, tz) -> pd.Series:
+    end = str(2020 + years)
+    i = pd.date_range("2020", end, freq="15T", tz=tz, inclusive="left")
+    return pd.Series(np.random.rand(len(i)), i)
+
+
+def lookup_each(fr: pd.Series) -> pd.Series:
+    idx_out = zones._idx_after_conversion(fr, None)
+    partly = fr.tz_localize(None)
+    partly = partly[~partly.index.duplicated()]
+
+    def value(ts):
+        try:
+            return partly.loc[ts]
+        except KeyError:
+            return partly.loc[ts - pd.Timedelta(hours=1)]
+
+    return fr.__class__([value(ts) for ts in idx_out], index=idx_out)
+
+
+if __name__ == "__main__":
+    header = ["aware->agnostic", "agnostic->aware", "lookup each"]
+    print(f"{'years':>5} {header[0]:>16} {header[1]:>16} {header[2]:>12}")
+    for years in [1, 5, 10]:
+        aware, agnostic = get_series(years, "Europe/Berlin"), get_series(years, None)
+        fns = [
+            lambda: zones._aware_to_agnostic(aware),
+            lambda: zones._agnostic_to_aware(agnostic, "Europe/Berlin"),
+        ]
+        if years == 1:
+            fns.append(lambda: lookup_each(aware))
+        times = [min(timeit.repeat(fn, number=1, repeat=3)) for fn in fns]
+        times = [f"{t * 1e3:.1f}ms" for t in times] + [""] * (3 - len(times))
+        print(f"{years:>5} {times[0]:>16} {times[1]:>16} {times[2]:>12}")
@@ -25,13 +25,14 @@ from .tools.stamps import (
     right_to_left,
 )
 
-from .tools import frames, nits, zones, stamps
+from .tools import frames, nits, zones, stamps, indexcache
 from .tools.frames import fill_gaps, wavg, standardize, set_frequency
 from .tools.nits import Q_
 from .tools.zones import force_tzaware, force_tzagnostic
 
 from .prices.hedge import hedge
 from .prices.utils import is_peak_hour
+from .prices.peakcalendar import PeakCalendar
 
 from . import _version
 
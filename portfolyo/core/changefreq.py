@@ -1,12 +1,20 @@
 """Functions to change frequency of a pandas dataframe."""
 
-from ..tools import stamps
+from ..tools import indexcache, stamps
+from collections import OrderedDict
 from pandas.core.frame import NDFrame
 import pandas as pd
+import numpy as np
 
 
 def _general(s: pd.Series, freq: str = "MS", is_summable: bool = True):
     """Change frequency of a Series, depending on the type of data it contains."""
+    return _frame(pd.DataFrame(s), freq, is_summable).iloc[:, 0].rename(s.name)
+
+
+def _frame(df: pd.DataFrame, freq: str = "MS", is_summable: bool = True):
+    """Change frequency of all columns of a DataFrame at once, depending on the type of
+    data they contain."""
 
     # TODO: Add tests with multiindex columns
 
@@ -17,64 +25,226 @@ def _general(s: pd.Series, freq: str = "MS", is_summable: bool = True):
         raise ValueError(
             f"Parameter ``freq`` must be one of {','.join(stamps.FREQUENCIES)}; got {freq}."
         )
-    if pd.api.types.is_integer_dtype(s.dtype):
-        s = s.astype(float)
 
-    # s is now a Series with an allowed frequency and a 'float' or 'pint' dtype.
+    # Empty frame.
+    if len(df) == 0:
+        return df.astype(_float_dtypes(df)).resample(freq).mean()  # empty frame.
 
-    # Empty series.
-    if len(s) == 0:
-        return s.resample(freq).mean()  # empty frame.
+    # Nothing more needed; portfolio already in desired frequency.
+    if stamps.freq_up_or_down(df.index.freq, freq) == 0:
+        return df.astype(_float_dtypes(df))
 
-    up_or_down = stamps.freq_up_or_down(s.index.freq, freq)
+    # Do resampling on float values; pint units (if any) are added again at the end.
+    dtypes = _float_dtypes(df)
+    values = np.empty(df.shape)
+    for n, (_, s) in enumerate(df.items()):
+        values[:, n] = s.pint.m if hasattr(s.dtype, "units") else s
 
-    # Nothing more needed; portfolio already in desired frequency.
-    if up_or_down == 0:
-        return s
+    plan = get_plan(df.index, freq)
+    values2 = plan.apply(values, is_summable)
+    i2 = plan.index
+    if i2.name != df.index.name:
+        i2 = i2.rename(df.index.name)
 
-    # Must downsample.
-    elif up_or_down == -1:
-        if is_summable:
-            # Downsampling is easiest for summable series: simply sum child values.
-            s2 = s.resample(freq).sum()
-            # Discard rows in new series that are only partially present in original.
-            msk = (s2.index >= s.index[0]) & (s2.index.ts_right <= s.index.ts_right[-1])
-            s2 = s2[msk]
-            # Return if any values found.
-            if not len(s2):
-                raise ValueError("There are no 'full' time periods at this frequency.")
-            return s2
-        else:
-            # For averagable frames: first make summable.
-            summable = s.mul(s.index.duration, axis=0)  # now has a pint dtype
-            summable2 = _general(summable, freq, True)
-            s2 = summable2.div(summable2.index.duration, axis=0)
-            return s2.astype(s.dtype).rename(s.name)
-
-    # Must upsample.
-    else:  # up_or_down == 1
-        if not is_summable:
-            # Upsampling is easiest for averagable frames: simply duplicate parent value.
-            # We cannot simply `.resample()`, because in that case the final value is not
-            # duplicated. We add a dummy value, which we eventually remove again.
-
-            # First, add additional row...
-            # (original code to add additional row, does not work if unit-aware. Maybe with future release of pint_pandas?)
-            # s = s.copy()
-            # s.loc[s.index.ts_right[-1]] = None
-            # (Workaround: turn into dataframe, change frequency, and turn back into series.)
-            df = pd.DataFrame(s)
-            df.loc[s.index.ts_right[-1], :] = None
-            # ... then do upsampling ...
-            df2 = df.resample(freq).asfreq().ffill()  # duplicate value
-            # ... and then remove final row (and turn back into series).
-            return df2.iloc[:-1, 0]
+    df2 = pd.DataFrame(values2, i2, df.columns)
+    return df2.astype(dtypes) if any(hasattr(d, "units") for d in dtypes) else df2
+
+
+def _float_dtypes(df: pd.DataFrame) -> pd.Series:
+    """Data types of the columns of a DataFrame, with integers turned into floats."""
+    return df.dtypes.map(lambda d: float if pd.api.types.is_integer_dtype(d) else d)
+
+
+class ResamplePlan:
+    """
+    Everything needed to change the frequency of values with a certain (gapless) index,
+    derived once so that it can be reused for any number of (e.g. all columns of all
+    dataframes) with that index.
+
+    Parameters
+    ----------
+    i : pd.DatetimeIndex
+        Index of the values to be resampled. Must have a frequency.
+    freq : str
+        Frequency to resample to. One of ``stamps.FREQUENCIES``.
+
+    Attributes
+    ----------
+    index : pd.DatetimeIndex
+        Index of the resampled values.
+    mapping : np.ndarray
+        When downsampling: position, in ``index``, of the period each original
+        timestamp is in (-1 if the period is not fully present and discarded). When
+        upsampling: position, in the original index, of the period each new timestamp
+        is in.
+    weights : np.ndarray
+        When downsampling: duration of each original timestamp, used to average
+        averagable values. When upsampling: fraction of the original period's duration
+        of each new timestamp, used to distribute summable values.
+    mask : np.ndarray
+        Boolean array; True for the original timestamps that are kept, i.e., that are
+        in a period that is fully present. (All True when upsampling.)
+
+    Notes
+    -----
+    Plans are cached; use ``get_plan()`` instead of creating them directly.
+    """
+
+    def __init__(self, i: pd.DatetimeIndex, freq: str):
+        self.up_or_down = stamps.freq_up_or_down(i.freq, freq)
+        if self.up_or_down == -1:
+            self._init_downsample(i, freq)
+        elif self.up_or_down == 1:
+            self._init_upsample(i, freq)
         else:
-            # For summable frames: first make averagable.
-            avgable = s.div(s.index.duration, axis=0)  # now has a pint dtype
-            avgable2 = _general(avgable, freq, False)
-            s2 = avgable2.mul(avgable2.index.duration, axis=0)
-            return s2.astype(s.dtype).rename(s.name)
+            self.index, self.mapping = i, np.arange(len(i))
+            self.weights, self.mask = np.ones(len(i)), np.ones(len(i), bool)
+        for a in (self.mapping, self.weights, self.mask):
+            a.flags.writeable = False  # shared between all users of the plan
+
+    def _init_downsample(self, i: pd.DatetimeIndex, freq: str) -> None:
+        codes = stamps.group_codes(i, freq)  # sorted; each period is a contiguous run
+        starts = np.flatnonzero(np.diff(codes, prepend=-1))
+        ends = np.append(starts[1:], len(i))
+
+        # Discard periods in new index that are only partially present in original.
+        # (Only the first and last period can be partial; the full ones are
+        # consecutive.)
+        full = np.ones(len(starts), bool)
+        full[0] = stamps.floor_ts(i[0], freq) == i[0]
+        last_right = stamps.ts_right(stamps.floor_ts(i[starts[-1]], freq), freq)
+        full[-1] &= stamps.ts_right(i[-1], i.freq) == last_right
+        if not full.any():
+            raise ValueError("There are no 'full' time periods at this frequency.")
+        starts, ends = starts[full], ends[full]
+        self._window = slice(starts[0], ends[-1])  # rows in full periods
+        self._starts = starts - starts[0]
+
+        self.index = pd.date_range(i[starts[0]], periods=len(starts), freq=freq)
+        self.mask = np.zeros(len(i), bool)
+        self.mask[self._window] = True
+        self.mapping = np.full(len(i), -1)
+        runs = np.repeat(np.arange(len(starts)), ends - starts)
+        self.mapping[self._window] = runs
+        self.weights = stamps.duration(i).pint.m.to_numpy(float, copy=True)
+        weights = self.weights[self._window]
+        self._weightsums = np.add.reduceat(weights, self._starts)
+
+    def _init_upsample(self, i: pd.DatetimeIndex, freq: str) -> None:
+        right = stamps.ts_right(i[-1:])[0]
+        self.index = pd.date_range(i[0], right, freq=freq, inclusive="left")
+        # Position, in the original index, of the period that each new timestamp is in.
+        self.mapping = stamps.group_codes(self.index, i.freq)
+        dur, dur2 = (stamps.duration(idx).pint.m.to_numpy() for idx in (i, self.index))
+        self.weights = dur2 / dur.take(self.mapping)
+        self.mask = np.ones(len(i), bool)
+
+    def apply(self, values: np.ndarray, is_summable: bool) -> np.ndarray:
+        """Resample the rows of 2D-array ``values``.
+
+        Parameters
+        ----------
+        values : np.ndarray
+            2D-array with one row for each timestamp in the original index.
+        is_summable : bool
+            True if values are time-summable (e.g. energy), False if they are
+            time-averagable (e.g. power or price).
+
+        Returns
+        -------
+        np.ndarray
+            2D-array with one row for each timestamp in ``.index``.
+        """
+        if self.up_or_down == 0:
+            return values.copy()
+
+        if self.up_or_down == 1:
+            # Upsampling is easiest for averagable values: simply duplicate parent.
+            values2 = values.take(self.mapping, axis=0)
+            if is_summable:
+                # For summable values: distribute parent value according to duration.
+                values2 *= self.weights[:, np.newaxis]
+            return values2
+
+        values = values[self._window]
+        values = np.where(np.isnan(values), 0.0, values)  # missing values are skipped
+        if is_summable:
+            # Downsampling is easiest for summable values: simply sum child values.
+            return np.add.reduceat(values, self._starts, axis=0)
+        # For averagable values: weight with duration.
+        weights = self.weights[self._window, np.newaxis]
+        values2 = np.add.reduceat(values * weights, self._starts, axis=0)
+        return values2 / self._weightsums[:, np.newaxis]
+
+
+_maxsize = 32
+_plans = OrderedDict()  # (index fingerprint, freq) -> ResamplePlan
+_hits = _misses = 0
+
+
+def get_plan(i: pd.DatetimeIndex, freq: str) -> ResamplePlan:
+    """Get plan to resample values with index ``i`` to frequency ``freq``, from cache
+    if possible.
+
+    Parameters
+    ----------
+    i : pd.DatetimeIndex
+        Index of the values to be resampled. Must have a frequency.
+    freq : str
+        Frequency to resample to. One of ``stamps.FREQUENCIES``.
+
+    Returns
+    -------
+    ResamplePlan
+        Must be treated as read-only by the caller.
+
+    Notes
+    -----
+    The plans of the ``plan_cache_info().maxsize`` most recently used (index, frequency)
+    combinations are kept. Indices are matched by their start, frequency, timezone and
+    length (see ``indexcache.fingerprint``).
+    """
+    global _hits, _misses
+
+    fp = indexcache.fingerprint(i)
+    key = None if fp is None else (fp, freq)
+    plan = _plans.get(key) if key is not None else None
+    if plan is not None:
+        _hits += 1
+        _plans.move_to_end(key)
+        return plan
+
+    _misses += 1
+    plan = ResamplePlan(i, freq)
+    if key is not None and _maxsize > 0:
+        _plans[key] = plan
+        while len(_plans) > _maxsize:
+            _plans.popitem(last=False)  # remove least recently used
+    return plan
+
+
+def plan_cache_info() -> indexcache.CacheInfo:
+    """Statistics of the plan cache: hits, misses, maximum number of plans (maxsize),
+    and current number of plans (currsize)."""
+    return indexcache.CacheInfo(_hits, _misses, _maxsize, len(_plans))
+
+
+def plan_cache_clear() -> None:
+    """Remove all plans from the cache and reset the statistics."""
+    global _hits, _misses
+    _plans.clear()
+    _hits = _misses = 0
+
+
+def set_plan_cache_maxsize(maxsize: int) -> None:
+    """Set the maximum number of plans that are kept. The least recently used plans are
+    discarded first. Use 0 to disable caching."""
+    global _maxsize
+    if maxsize < 0:
+        raise ValueError(f"Parameter ``maxsize`` must be 0 or larger; got {maxsize}.")
+    _maxsize = maxsize
+    while len(_plans) > _maxsize:
+        _plans.popitem(last=False)
 
 
 def summable(fr: NDFrame, freq: str = "MS") -> NDFrame:
@@ -101,8 +271,7 @@ def summable(fr: NDFrame, freq: str = "MS") -> NDFrame:
     are not time-summable.
     """
     if isinstance(fr, pd.DataFrame):
-        # Turn into series, change frequency, and turn back into dataframe.
-        return pd.DataFrame({key: summable(value, freq) for key, value in fr.items()})
+        return _frame(fr, freq, True)
 
     return _general(fr, freq, True)
 
@@ -130,7 +299,6 @@ def averagable(fr: NDFrame, freq: str = "MS") -> NDFrame:
     like power [MW]. When downsampling, the values are weighted with their duration.
     """
     if isinstance(fr, pd.DataFrame):
-        # Turn into series, change frequency, and turn back into dataframe.
-        return pd.DataFrame({key: averagable(value, freq) for key, value in fr.items()})
+        return _frame(fr, freq, False)
 
     return _general(fr, freq, False)
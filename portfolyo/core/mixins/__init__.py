@@ -1,3 +1,4 @@
 from .text import PfLineText, PfStateText
 from .plot import PfLinePlot, PfStatePlot
 from .other import OtherOutput
+from .cache import Cached
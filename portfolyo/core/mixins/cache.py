@@ -0,0 +1,28 @@
+"""
+Module with mixin, to cache derived values in PfLine and PfState instances.
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict
+
+
+class Cached:  # for both PfLine and PfState
+    def cache_info(self) -> Dict[str, int]:
+        """Derived values that are currently cached in this instance, and the memory
+        (in bytes) used by each array or series. (0 for other values, e.g. portfolio
+        lines, which may share their memory with other instances.)"""
+        cache = self.__dict__.get("_cache", {})
+        return {key: getattr(value, "nbytes", 0) for key, value in cache.items()}
+
+    def cache_clear(self) -> None:
+        """Remove all cached derived values from this instance."""
+        self.__dict__.pop("_cache", None)
+
+    def _cached(self, key: str, calculate: Callable[[], Any]) -> Any:
+        """Get derived value from cache, or calculate (and store) it if not found. Values
+        are only calculated when first needed, as instances are treated as immutable."""
+        # Use __dict__ directly; MultiPfLine.__getattr__ looks up children.
+        cache = self.__dict__.setdefault("_cache", {})
+        if key not in cache:
+            cache[key] = calculate()
+        return cache[key]
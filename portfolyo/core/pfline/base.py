@@ -7,14 +7,14 @@ from __future__ import annotations
 
 # from . import single, multi, interop  #<-- moved to end of file
 from ..ndframelike import NDFrameLike
-from ..mixins import PfLineText, PfLinePlot, OtherOutput
+from ..mixins import PfLineText, PfLinePlot, OtherOutput, Cached
 from ...prices.utils import duration_bpo
 from ...prices import convert, hedge
 from ...tools.types import Quantity, Value
 
 from abc import abstractmethod
 from enum import Enum
-from typing import Iterable, Union, TYPE_CHECKING
+from typing import Iterable, Mapping, Optional, Union, TYPE_CHECKING
 import pandas as pd
 
 # Developer notes: we would like to be able to handle 2 cases with volume AND financial
@@ -53,7 +53,7 @@ class Kind(Enum):
         return self.value
 
 
-class PfLine(NDFrameLike, PfLineText, PfLinePlot, OtherOutput):
+class PfLine(NDFrameLike, PfLineText, PfLinePlot, OtherOutput, Cached):
     """Class to hold a related energy timeseries. This can be volume timeseries with q
     [MWh] and w [MW], a price timeseries with p [Eur/MWh] or both.
     """
@@ -161,6 +161,10 @@ class PfLine(NDFrameLike, PfLineText, PfLinePlot, OtherOutput):
     def __delitem__(self, *args, **kwargs):  # Remove child
         ...
 
+    @abstractmethod
+    def _calculate_fingerprint(self) -> str:
+        ...
+
     # Implemented directly here.
 
     @property
@@ -176,9 +180,44 @@ class PfLine(NDFrameLike, PfLineText, PfLinePlot, OtherOutput):
             self.kind
         ]
 
+    def fingerprint(self) -> str:
+        """Hash of the content (index, values, and names and content of children) of
+        this instance. Stable between sessions; e.g. to detect unchanged data or as a
+        cache key. Instances with equal fingerprints are equal; equal instances may have
+        distinct fingerprints if their values differ by rounding errors."""
+        return self._cached("fingerprint", self._calculate_fingerprint)
+
+    @staticmethod
+    def sum(
+        pflines: Union[Iterable[PfLine], Mapping[str, PfLine]], flatten: bool = True
+    ) -> PfLine:
+        """Sum of several portfolio lines.
+
+        Parameters
+        ----------
+        pflines : Iterable[PfLine] | Mapping[str, PfLine]
+            Portfolio lines to add. Must all be of the same kind and have the same
+            frequency.
+        flatten : bool, optional (default: True)
+            If True, return the sum as a flat portfolio line. If False, return a
+            MultiPfLine with the portfolio lines as its children; ``pflines`` must then
+            be a Mapping (e.g. a dictionary) from names to portfolio lines.
+
+        Returns
+        -------
+        PfLine
+            Sum, on the intersection of the portfolio lines' indices.
+
+        Notes
+        -----
+        Equal to adding the portfolio lines one by one, but without creating the
+        intermediate results; for many portfolio lines, this is much faster.
+        """
+        return enable_arithmatic.sum_pflines(pflines, flatten)
+
     def flatten(self) -> SinglePfLine:
         """Return flat instance, i.e., without children."""
-        return single.SinglePfLine(self)
+        return single.SinglePfLine(self, validate=False)
 
     @property
     def volume(self) -> SinglePfLine:
@@ -186,13 +225,13 @@ class PfLine(NDFrameLike, PfLineText, PfLinePlot, OtherOutput):
         # Design decision: could also be non-flattened.
         # if isinstance(self, multi.MultiPfLine):
         #     return multi.MultiPfLine({name: child.volume for name, child in self.items){}})
-        return single.SinglePfLine({"q": self.q})
+        return single.SinglePfLine({"q": self.q}, validate=False)
 
     @property
     def price(self) -> SinglePfLine:
         """Return (flattened) price-only PfLine."""
         # Design decision: could also be non-flattened if self.kind is not ALL
-        return single.SinglePfLine({"p": self.p})
+        return single.SinglePfLine({"p": self.p}, validate=False)
 
     def _set_col_val(self, col: str, val: pd.Series | Value) -> SinglePfLine:
         """Set or update a timeseries and return the modified instance."""
@@ -349,6 +388,13 @@ class PfLine(NDFrameLike, PfLineText, PfLinePlot, OtherOutput):
         - If the PfLine contains prices, these are ignored.
         - If ``p`` contains volumes, these are ignored.
         """
+        po = self._hedge_po(p, po)
+        wout, pout = hedge.hedge(self.w, p.p, how, freq, po)
+        return single.SinglePfLine({"w": wout, "p": pout})
+
+    def _hedge_po(self: PfLine, p: PfLine, po: Optional[bool]) -> bool:
+        """Check if portfolio line can be hedged with ``p``, and return (default)
+        value for ``po``."""
         if self.kind is Kind.PRICE_ONLY:
             raise ValueError(
                 "Cannot hedge a PfLine that does not contain volume information."
@@ -367,9 +413,7 @@ class PfLine(NDFrameLike, PfLineText, PfLinePlot, OtherOutput):
             raise ValueError(
                 "Can only hedge with peak and offpeak products if PfLine has (quarter)hourly information."
             )
-
-        wout, pout = hedge.hedge(self.w, p.p, how, freq, po)
-        return single.SinglePfLine({"w": wout, "p": pout})
+        return po
 
 
 # Must be at end, because they depend on PfLine existing.
@@ -0,0 +1,66 @@
+"""Compare portfolio lines without creating (``pint``-) dataframes: equality of indices
+and of float values, and hashes of their content."""
+
+from __future__ import annotations
+
+from ...tools import indexcache
+
+from typing import Mapping
+import hashlib
+import pandas as pd
+import numpy as np
+
+
+def index_equal(i1: pd.DatetimeIndex, i2: pd.DatetimeIndex) -> bool:
+    """Return True if indices are equal. Fast for indices with a frequency."""
+    if i1 is i2:
+        return True
+    fp1, fp2 = indexcache.fingerprint(i1), indexcache.fingerprint(i2)
+    if fp1 is not None and fp2 is not None:
+        return fp1 == fp2 and i1.name == i2.name
+    return i1.equals(i2) and i1.name == i2.name
+
+
+def values_close(
+    a1: np.ndarray, a2: np.ndarray, rtol: float = 1e-7, atol: float = 1e-8
+) -> bool:
+    """Return True if float arrays have the same shape and all values are close. Values
+    are close if they are both nan, both infinite with the same sign, or if their
+    absolute difference is at most ``max(rtol * max(abs(a), abs(b)), atol)``.
+    (Criterion of ``math.isclose``; symmetric in ``a1`` and ``a2``.)"""
+    if a1.shape != a2.shape:
+        return False
+    if a1 is a2 or np.array_equal(a1, a2, equal_nan=True):
+        return True  # usual case; no temporary arrays needed
+    nonfinite = ~np.isfinite(a1)
+    if not np.array_equal(nonfinite, ~np.isfinite(a2)):
+        return False
+    if not np.array_equal(a1[nonfinite], a2[nonfinite], equal_nan=True):
+        return False  # nan vs inf, or inf vs -inf
+    with np.errstate(invalid="ignore"):
+        diff = np.abs(a1 - a2)
+        tol = np.maximum(rtol * np.maximum(np.abs(a1), np.abs(a2)), atol)
+        return bool(np.all((diff <= tol) | nonfinite))
+
+
+def fingerprint(
+    i: pd.DatetimeIndex, values: Mapping[str, np.ndarray], children: Mapping = None
+) -> str:
+    """Hash of index, float values (by column name), and fingerprints of children (by
+    child name). Stable between sessions."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(_index_description(i).encode())
+    for col in sorted(values):
+        h.update(f"|{col}|".encode())
+        h.update(np.ascontiguousarray(values[col], float).tobytes())
+    for name in sorted(children or {}):
+        h.update(f"|{name}|{children[name]}".encode())
+    return h.hexdigest()
+
+
+def _index_description(i: pd.DatetimeIndex) -> str:
+    """String that uniquely describes an index, also between sessions."""
+    description = f"{i.name}|{i.tz}|{i.freqstr}|{len(i)}|"
+    if indexcache.fingerprint(i) is not None:
+        return description + str(i.asi8[0])  # values fully determined by first value
+    return description + i.asi8.tobytes().hex()
@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 
-from . import base, single, multi, interop
+from . import base, single, multi, interop, stacked, compare
 from .base import Kind
+from ...tools import nits, stamps
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, Iterable, List, Mapping, Optional, Union
 import pandas as pd
+import numpy as np
 import warnings
 
 if TYPE_CHECKING:  # needed to avoid circular imports
@@ -45,6 +47,90 @@ class PfLineFlattenedWarning(Warning):
     pass
 
 
+def _float_values(pfl: PfLine, cols: str) -> Dict[str, np.ndarray]:
+    """Float values of timeseries in pfline, in the standard unit of each."""
+    if isinstance(pfl, single.SinglePfLine):
+        return {col: pfl._values(col) for col in cols}
+    df = pfl.df(cols, flatten=True, has_units=False)
+    return {col: s.to_numpy() for col, s in df.items()}
+
+
+def _singlepfline_from_values(
+    values: Dict[str, np.ndarray], index: pd.DatetimeIndex
+) -> Optional[single.SinglePfLine]:
+    """SinglePfLine directly from float values on a valid index. None if values are
+    missing; in that case, the instance must be created (and checked) the usual way."""
+    if any(np.isnan(a).any() for a in values.values()):
+        return None
+    return single.SinglePfLine._from_df(pd.DataFrame(values, index))
+
+
+def _float_block(pfl: PfLine, cols: str, idx: pd.DatetimeIndex) -> List[np.ndarray]:
+    """Float values of timeseries in pfline, on ``idx``, which must be a contiguous part
+    of the pfline's index."""
+    values = _float_values(pfl, cols)
+    if compare.index_equal(pfl.index, idx):
+        return [values[col] for col in cols]
+    start = pfl.index.searchsorted(idx[0])
+    window = slice(start, start + len(idx))
+    return [values[col][window] for col in cols]
+
+
+def sum_pflines(
+    pflines: Union[Iterable[PfLine], Mapping[str, PfLine]], flatten: bool = True
+) -> PfLine:
+    """Sum of several portfolio lines; see ``PfLine.sum``."""
+    if isinstance(pflines, Mapping):
+        names, pflines = list(pflines.keys()), list(pflines.values())
+    else:
+        names, pflines = None, list(pflines)
+
+    # Checks, once for all portfolio lines.
+    if not flatten and names is None:
+        raise TypeError(
+            "Parameter ``pflines`` must be a Mapping (e.g. a dictionary) to keep the "
+            "names of the portfolio lines; or use ``flatten=True``."
+        )
+    if len(pflines) == 0:
+        raise ValueError("Must provide at least 1 portfolio line.")
+    for pfl in pflines:
+        if not isinstance(pfl, base.PfLine):
+            raise TypeError(f"Can only sum PfLine instances; got {type(pfl)}.")
+    if len(set(pfl.kind for pfl in pflines)) != 1:
+        raise ValueError("Cannot add portfolio lines of unequal kind.")
+    if len(freqs := set(pfl.index.freq for pfl in pflines)) != 1:
+        raise ValueError(
+            f"PfLines have unequal frequencies; found {', '.join(str(f) for f in freqs)}."
+            " Resample first to obtain equal frequencies."
+        )
+    idx = stamps.intersection(*[pfl.index for pfl in pflines])
+    if len(idx) == 0:
+        raise ValueError("PfLine indices describe non-overlapping periods.")
+
+    cols = pflines[0].summable
+
+    if not flatten:
+        if not all(isinstance(pfl, single.SinglePfLine) for pfl in pflines):
+            return multi.MultiPfLine(dict(zip(names, pflines)))  # (trims children)
+        # Store values of all children together.
+        block = np.empty((len(cols), len(pflines), len(idx)))
+        for n, pfl in enumerate(pflines):
+            block[:, n, :] = _float_block(pfl, cols, idx)
+        if np.isnan(block).any():
+            return multi.MultiPfLine(dict(zip(names, pflines)))  # (checks values)
+        return multi.MultiPfLine(stacked.Stack(block, cols, names, idx))
+
+    # Accumulate values of all portfolio lines in a single array.
+    total = np.zeros((len(cols), len(idx)))
+    for pfl in pflines:
+        for n, values in enumerate(_float_block(pfl, cols, idx)):
+            total[n] += values
+    values = dict(zip(cols, total))
+    if (pfl := _singlepfline_from_values(values, idx)) is not None:
+        return pfl
+    return single.SinglePfLine(pd.DataFrame(values, idx))
+
+
 def _assert_freq_compatibility(fn):
     """Check frequency compatible before calling the wrapped function"""
 
@@ -85,8 +171,16 @@ def _add_pflines(pfl1: PfLine, pfl2: PfLine):
         )
 
     # at least one of them is a SinglePfLine.
+    # Quick path if on same index: add values directly.
+    if compare.index_equal(pfl1.index, pfl2.index):
+        cols = pfl1.summable
+        v1, v2 = _float_values(pfl1, cols), _float_values(pfl2, cols)
+        values = {col: v1[col] + v2[col] for col in cols}
+        if (pfl := _singlepfline_from_values(values, pfl1.index)) is not None:
+            return pfl
+
     # Get addition and keep only common rows, and resample to keep freq (possibly re-adds gaps in middle).
-    dfs = [pfl.df(pfl.summable, flatten=True) for pfl in [pfl1, pfl2]]
+    dfs = [pfl.df(pfl.summable, flatten=True, has_units=False) for pfl in [pfl1, pfl2]]
     df = sum(dfs).dropna().resample(pfl1.index.freq).asfreq()
     return single.SinglePfLine(df)
 
@@ -117,6 +211,13 @@ def _multiply_pfline_and_dimensionlessseries(pfl: PfLine, s: pd.Series):
     # Scale the price p (kind == 'p') or the volume q (kind == 'q'), returning PfLine of same kind.
     if isinstance(pfl, multi.MultiPfLine):
         return multi.MultiPfLine({name: child * s for name, child in pfl.items()})
+    # Quick path if on same index: scale values directly.
+    if compare.index_equal(pfl.index, s.index):
+        factors = nits.Q_(s.pint.m.to_numpy(), s.pint.units).to("dimensionless").m
+        values = _float_values(pfl, pfl.summable)
+        values = {col: v * factors for col, v in values.items()}
+        if (result := _singlepfline_from_values(values, pfl.index)) is not None:
+            return result
     df = pfl.df(pfl.summable).mul(s, axis=0)  # multiplication with index-alignment
     df = df.dropna().resample(pfl.index.freq).asfreq()
     return single.SinglePfLine(df)
@@ -151,8 +252,10 @@ class PfLineArithmatic:
             return multi.MultiPfLine({name: -child for name, child in self.items()})
 
         # multiply price (kind == 'p'), volume (kind == 'q') or volume and revenue (kind == 'all') with -1
-        # Workaround to make negation work for pint quantity
-        df = (-self.df(self.summable).pint.dequantify()).pint.quantify()
+        values = {col: -v for col, v in _float_values(self, self.summable).items()}
+        if (pfl := _singlepfline_from_values(values, self.index)) is not None:
+            return pfl
+        df = pd.DataFrame(values, self.index)  # float values in standard units
         return single.SinglePfLine(df)
 
     def __add__(self: PfLine, other) -> PfLine:
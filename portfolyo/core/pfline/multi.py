@@ -6,13 +6,16 @@ their name.
 
 from __future__ import annotations
 
-from . import multi_helper
+from . import compare, multi_helper, stacked
+from ...prices import hedge
 from .base import PfLine, Kind
+from ...tools import nits, stamps
 
 from typing import Dict, Iterable, Mapping, Optional, Union, Any
 import pandas as pd
 import numpy as np
 import warnings
+import weakref
 
 
 class MultiPfLine(PfLine, Mapping):
@@ -26,6 +29,13 @@ class MultiPfLine(PfLine, Mapping):
     data: Any
         Generally: object with a mapping from strings to PfLine instances; most commonly a
         dictionary.
+
+    Notes
+    -----
+    If all children are flat, of the same kind, and share their index (e.g. when
+    ``data`` is a wide dataframe), their values may be stored together in a single
+    array; see ``stacked.Stack``. Aggregation and frequency changes are then done on
+    all children at once.
     """
 
     def __new__(cls, data):
@@ -38,9 +48,19 @@ class MultiPfLine(PfLine, Mapping):
     def __init__(self, data: Union[MultiPfLine, Mapping[str, PfLine], pd.DataFrame]):
         if self is data:
             return  # don't continue initialisation, it's already the correct object
-        self._children = {}
-        for name, child in multi_helper.make_mapping(data).items():
-            self[name] = child
+        # Verify all children at once, instead of adding them one by one.
+        children = multi_helper.make_mapping(data)
+        reserved = dir(self)
+        for name in children:
+            self._assert_valid_childname(name, reserved)
+        if isinstance(children, stacked.Stack):
+            self._children = children  # already verified and with common index
+        else:
+            children = {name: PfLine(child) for name, child in children.items()}
+            self._children = (
+                multi_helper.verify_and_trim_dict(children) if children else {}
+            )
+        self._children_changed()
 
     # Implementation of ABC methods.
 
@@ -53,45 +73,31 @@ class MultiPfLine(PfLine, Mapping):
         if self.kind is Kind.PRICE_ONLY:
             return pd.Series(np.nan, self.index, name="w", dtype="pint[MW]")
         else:
-            return pd.Series(self.q / self.index.duration, name="w").pint.to("MW")
+            return self._cached("w", self._calculate_w).copy()
 
     @property
     def q(self) -> pd.Series:
         # TODO: simply flatten and then return volume-part?
         if self.kind is Kind.PRICE_ONLY:
             return pd.Series(np.nan, self.index, name="q", dtype="pint[MWh]")
-        elif (qp_children := self._qp_children) is not None:
-            return qp_children[Kind.VOLUME_ONLY].q
-        else:  # all children have a sensible timeseries for .q
-            return sum(child.q for child in self._children.values()).rename("q")
+        return self._cached("q", self._calculate_q).copy()
 
     @property
     def p(self) -> pd.Series:
         # TODO: simply flatten and then return price-part?
         if self.kind is Kind.VOLUME_ONLY:
             return pd.Series(np.nan, self.index, name="p", dtype="pint[Eur/MWh]")
-        elif (qp_children := self._qp_children) is not None:
-            return qp_children[Kind.PRICE_ONLY].p
-        elif self.kind is Kind.ALL:  # all children have .kind == 'all'
-            return pd.Series(self.r / self.q, name="p").pint.to("Eur/MWh")
-        else:  # self.kind == 'p', all children have a sensible timeseries for .p
-            return sum(child.p for child in self._children.values()).rename("p")
+        return self._cached("p", self._calculate_p).copy()
 
     @property
     def r(self) -> pd.Series:
         if self.kind is not Kind.ALL:
             return pd.Series(np.nan, self.index, name="r", dtype="pint[Eur]")
-        elif (qp_children := self._qp_children) is not None:
-            q, p = qp_children[Kind.VOLUME_ONLY].q, qp_children[Kind.PRICE_ONLY].p
-            return pd.Series(q * p, name="r").pint.to("Eur")
-        else:  # all children have .kind == 'all'
-            return sum(child.r for child in self._children.values()).rename("r")
+        return self._cached("r", self._calculate_r).copy()
 
     @property
     def kind(self) -> Kind:
-        if self._heterogeneous_children:
-            return Kind.ALL
-        return next(iter(self._children.values())).kind
+        return self._cached("kind", self._calculate_kind)
 
     def df(
         self,
@@ -129,6 +135,8 @@ class MultiPfLine(PfLine, Mapping):
                 "This portfolio has its price and volume information stored in distinct child porfolios. The portfolio is flattened before changing its frequency."
             )
             return self.flatten().asfreq(freq)
+        if isinstance(self._children, stacked.Stack):
+            return MultiPfLine(self._children.asfreq(freq))
         return MultiPfLine(
             {label: child.asfreq(freq) for label, child in self._children.items()}
         )
@@ -140,22 +148,24 @@ class MultiPfLine(PfLine, Mapping):
     def __eq__(self, other) -> bool:
         if not isinstance(other, self.__class__):
             return False
-        return self._children == other._children
+        if self is other:
+            return True
+        c1, c2 = self._children, other._children
+        if isinstance(c1, stacked.Stack) and isinstance(c2, stacked.Stack):
+            if c1.names == c2.names and c1.cols == c2.cols:
+                if not compare.index_equal(c1.index, c2.index):
+                    return False
+                return compare.values_close(c1.block, c2.block)  # all children at once
+        return c1 == c2
 
     def __bool__(self) -> bool:
         # True if a) has children of which b) any are true
         return any(self._children.keys())
 
     def __setitem__(self, name: str, pfl: Union[PfLine, Any]):
-        if name in dir(self):  # cannot use hasattr(): runs the code in the properties
-            raise ValueError(
-                f"Cannot name child '{name}', this is a reserved attribute name."
-            )
-        if not isinstance(name, str):
-            raise TypeError(
-                f"Parameter ``name`` must be a string; got {name} ({type(name)})."
-            )
+        self._assert_valid_childname(name)
         self._children = multi_helper.verify_and_trim_dict({**self, name: PfLine(pfl)})
+        self._children_changed()
 
     def __getitem__(self, name: str):
         if name not in self._children:
@@ -167,7 +177,8 @@ class MultiPfLine(PfLine, Mapping):
             raise KeyError(f"Portfolio line does not have child with name '{name}'.")
         if len(self._children) == 1:
             raise RuntimeError("Cannot remove the last child of a portfolio line.")
-        del self._children[name]
+        self._children = {n: c for n, c in self._children.items() if n != name}
+        self._children_changed()
 
     # Additional methods, unique to this class.
 
@@ -204,8 +215,131 @@ class MultiPfLine(PfLine, Mapping):
             raise RuntimeError("Cannot remove the last child of a portfolio line.")
         return MultiPfLine({n: child for n, child in self.items() if n != name})
 
+    # . Hedge.
+
+    def hedge_children_with(
+        self, p: PfLine, how: str = "val", freq: str = "MS", po: bool = None
+    ) -> MultiPfLine:
+        """Hedge the volume in each child with the same price curve.
+
+        Parameters
+        ----------
+        p : PfLine
+            Portfolio line with prices to be used in the hedge.
+        how : str, optional (Default: 'val')
+            Hedge-constraint. 'vol' for volumetric hedge, 'val' for value hedge.
+        freq : {'D' (days), 'MS' (months, default), 'QS' (quarters), 'AS' (years)}
+            Frequency of hedging products. E.g. 'QS' to hedge with quarter products.
+        po : bool, optional
+            Type of hedging products. Set to True to split hedge into peak and offpeak.
+            (Default: split if volume timeseries has hourly values or shorter.)
+
+        Returns
+        -------
+        MultiPfLine
+            With same children names; each child with the hedged volume and prices of
+            the corresponding child in this portfolio line. All children are hedged at
+            once; the result is the same as calling ``.hedge_with()`` on each child.
+
+        See also
+        --------
+        PfLine.hedge_with
+        """
+        po = self._hedge_po(p, po)
+        w = pd.DataFrame({name: child.w.pint.m for name, child in self.items()})
+        wout, pout = hedge.hedge(w, p.p.pint.m, how, freq, po)  # standard units
+        df = pd.concat(
+            {name: pd.DataFrame({"w": wout[name], "p": pout}) for name in wout}, axis=1
+        )
+        return MultiPfLine(df)
+
     # . Other.
 
+    def _assert_valid_childname(self, name: str, reserved: Iterable[str] = None):
+        if reserved is None:
+            reserved = dir(self)
+        if name in reserved:  # cannot use hasattr(): runs the code in the properties
+            raise ValueError(
+                f"Cannot name child '{name}', this is a reserved attribute name."
+            )
+        if not isinstance(name, str):
+            raise TypeError(
+                f"Parameter ``name`` must be a string; got {name} ({type(name)})."
+            )
+
+    # (Aggregate values are cached; see ``PfLine._cached``. The cache is cleared when
+    # children are added or removed, here or in any descendent. Copies are returned, so
+    # that changing a returned timeseries does not change the cached one.)
+
+    def _calculate_w(self) -> pd.Series:
+        return pd.Series(self.q / self.index.duration, name="w").pint.to("MW")
+
+    def _calculate_q(self) -> pd.Series:
+        if (qp_children := self._qp_children) is not None:
+            return qp_children[Kind.VOLUME_ONLY].q
+        elif isinstance(self._children, stacked.Stack):
+            return self._stacked_total("q")
+        else:  # all children have a sensible timeseries for .q
+            return sum(child.q for child in self._children.values()).rename("q")
+
+    def _calculate_p(self) -> pd.Series:
+        if (qp_children := self._qp_children) is not None:
+            return qp_children[Kind.PRICE_ONLY].p
+        elif self.kind is Kind.ALL:  # all children have .kind == 'all'
+            return pd.Series(self.r / self.q, name="p").pint.to("Eur/MWh")
+        elif isinstance(self._children, stacked.Stack):
+            return self._stacked_total("p")
+        else:  # self.kind == 'p', all children have a sensible timeseries for .p
+            return sum(child.p for child in self._children.values()).rename("p")
+
+    def _calculate_r(self) -> pd.Series:
+        if (qp_children := self._qp_children) is not None:
+            q, p = qp_children[Kind.VOLUME_ONLY].q, qp_children[Kind.PRICE_ONLY].p
+            return pd.Series(q * p, name="r").pint.to("Eur")
+        elif isinstance(self._children, stacked.Stack):
+            return self._stacked_total("r")
+        else:  # all children have .kind == 'all'
+            return sum(child.r for child in self._children.values()).rename("r")
+
+    def _stacked_total(self, col: str) -> pd.Series:
+        dtype = nits.pintunit_remove(nits.NAMES_AND_UNITS[col])
+        return pd.Series(self._children.total(col), self.index, dtype, col)
+
+    def _calculate_fingerprint(self) -> str:
+        children = {name: child.fingerprint() for name, child in self._children.items()}
+        return compare.fingerprint(self.index, {}, children)
+
+    def _calculate_kind(self) -> Kind:
+        if isinstance(self._children, stacked.Stack):
+            return self._children.kind
+        if self._heterogeneous_children:
+            return Kind.ALL
+        return next(iter(self._children.values())).kind
+
+    def _children_changed(self) -> None:
+        """Register as parent of (multi) children, and clear cached aggregate values of
+        this instance and of all its ancestors."""
+        if isinstance(self._children, stacked.Stack):
+            self._clear_cache_upward()  # (no multi children)
+            return
+        for child in self._children.values():
+            if isinstance(child, MultiPfLine):
+                child._parents[id(self)] = self
+        # (Parents of removed children are not unregistered; this only causes an
+        # unneeded clearing of their cache.)
+        self._clear_cache_upward()
+
+    def _clear_cache_upward(self) -> None:
+        self.cache_clear()
+        for parent in list(self._parents.values()):
+            parent._clear_cache_upward()
+
+    @property
+    def _parents(self) -> weakref.WeakValueDictionary:
+        """Instances that have this instance as a child; by id."""
+        # Use __dict__ directly; __getattr__ looks up children.
+        return self.__dict__.setdefault("_parentrefs", weakref.WeakValueDictionary())
+
     @property
     def _heterogeneous_children(self) -> bool:
         """Return True if children are not all of same kind."""
@@ -214,6 +348,11 @@ class MultiPfLine(PfLine, Mapping):
     @property
     def _qp_children(self) -> Optional[Dict[Kind, PfLine]]:
         """Helper method that returns the child providing the volume and the one providing the price."""
+        return self._cached("qp_children", self._calculate_qp_children)
+
+    def _calculate_qp_children(self) -> Optional[Dict[Kind, PfLine]]:
+        if isinstance(self._children, stacked.Stack):
+            return None  # all children of same kind
         qp_children = {child.kind: child for child in self._children.values()}
         if Kind.VOLUME_ONLY in qp_children and Kind.PRICE_ONLY in qp_children:
             return qp_children
@@ -228,5 +367,9 @@ class _LocIndexer:
         self.mpfl = mpfl
 
     def __getitem__(self, arg) -> MultiPfLine:
+        children = self.mpfl._children
+        if isinstance(children, stacked.Stack):
+            if (positions := stamps.contiguous_slice(children.index, arg)) is not None:
+                return MultiPfLine(children.window(positions))
         new_dict = {name: child.loc[arg] for name, child in self.mpfl.items()}
         return MultiPfLine(new_dict)
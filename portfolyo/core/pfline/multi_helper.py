@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from . import compare, stacked
 from .base import PfLine, Kind
 from ...tools import stamps
 
@@ -16,6 +17,9 @@ def make_mapping(data: Any) -> Mapping[Any, Any]:
         return data
 
     elif isinstance(data, pd.DataFrame):
+        # Store values of all children together, if possible.
+        if (stack := stacked.Stack.from_dataframe(data)) is not None:
+            return stack
         children = {}
         # Get all sub-dataframes (or series) and turn into dictionary.
         for col in data.columns.get_level_values(0).unique():
@@ -90,5 +94,8 @@ def _intersect_indices(children: Dict[str, PfLine]) -> Dict[str, PfLine]:
     if len(idx) == 0:
         raise ValueError("PfLine indices describe non-overlapping periods.")
 
-    children = {name: child.loc[idx] for name, child in children.items()}
-    return children
+    # Only slice the children whose index is not already equal to the intersection.
+    return {
+        name: child if compare.index_equal(child.index, idx) else child.loc[idx]
+        for name, child in children.items()
+    }
@@ -5,16 +5,19 @@ Dataframe-like class to hold general energy-related timeseries; either volume ([
 
 from __future__ import annotations
 
-from . import single_helper
+from . import compare, single_helper
 from .base import PfLine, Kind
 from .. import changefreq
-from ...testing import testing
+from ...tools import nits, stamps
 
 from typing import Dict, Iterable, Union
 import pandas as pd
 import numpy as np
 
 
+_DTYPES = {col: nits.pintunit_remove(nits.NAMES_AND_UNITS[col]) for col in "wqpr"}
+
+
 class SinglePfLine(PfLine):
     """Flat portfolio line, i.e., without children. Has a single dataframe.
 
@@ -24,6 +27,11 @@ class SinglePfLine(PfLine):
         Generally: object with one or more attributes or items ``w``, ``q``, ``r``, ``p``;
         all timeseries. Most commonly a ``pandas.DataFrame`` or a dictionary of
         ``pandas.Series``, but may also be e.g. another PfLine object.
+    validate: bool, optional (default: True)
+        If False, ``data`` is trusted to be correct, and is not verified: it must be a
+        PfLine, ``pandas.DataFrame``, or dictionary of ``pandas.Series``; the
+        timeseries must share their (standardized) index, and their values must be
+        consistent. Much faster; e.g. for bulk loading of known-good data.
 
 
     Returns
@@ -36,19 +44,36 @@ class SinglePfLine(PfLine):
     standard units are assumed (MW, MWh, Eur, Eur/MWh).
     * If the timeseries or values in ``data`` do have a ``pint`` data type, they are
     converted into the standard units.
+    * Internally, the values are stored as floats in the standard units. The ``pint``
+    units are only added when a timeseries is requested.
     """
 
-    def __new__(cls, data):
+    def __new__(cls, data, validate: bool = True):
         # Catch case where data is already a valid class instance.
         if isinstance(data, SinglePfLine):
             return data
         # Otherwise, do normal thing.
         return super().__new__(cls, data)
 
-    def __init__(self, data: Union[PfLine, Dict, pd.DataFrame, pd.Series]):
+    def __init__(
+        self,
+        data: Union[PfLine, Dict, pd.DataFrame, pd.Series],
+        validate: bool = True,
+    ):
         if self is data:
             return  # don't continue initialisation, it's already the correct object
-        self._df = single_helper.make_dataframe(data)
+        if not validate:
+            self._df = single_helper.make_dataframe_trusted(data)
+        else:
+            self._df = single_helper.strip_units(single_helper.make_dataframe(data))
+
+    @classmethod
+    def _from_df(cls, df: pd.DataFrame) -> SinglePfLine:
+        """Create instance directly from dataframe with float columns ``q``, ``p``, or
+        ``q`` and ``r``, in the standard units. No data verification is done."""
+        pfl = object.__new__(cls)
+        pfl._df = df
+        return pfl
 
     # Implementation of ABC methods.
 
@@ -58,32 +83,19 @@ class SinglePfLine(PfLine):
 
     @property
     def w(self) -> pd.Series:
-        if self.kind is Kind.PRICE_ONLY:
-            return pd.Series(np.nan, self.index, name="w", dtype="pint[MW]")
-        else:
-            return pd.Series(self.q / self.index.duration, name="w").pint.to("MW")
+        return self._series("w")
 
     @property
     def q(self) -> pd.Series:
-        if self.kind is Kind.PRICE_ONLY:
-            return pd.Series(np.nan, self.index, name="q", dtype="pint[MWh]")
-        else:
-            return self._df["q"]
+        return self._series("q")
 
     @property
     def p(self) -> pd.Series:
-        if self.kind is Kind.VOLUME_ONLY:
-            return pd.Series(np.nan, self.index, name="p", dtype="pint[Eur/MWh]")
-        elif self.kind is Kind.ALL:
-            return pd.Series(self.r / self.q, name="p").pint.to("Eur/MWh")
-        else:  # self.kind is Kind.PRICE_ONLY
-            return self._df["p"]
+        return self._series("p")
 
     @property
     def r(self) -> pd.Series:
-        if self.kind is not Kind.ALL:
-            return pd.Series(np.nan, self.index, name="r", dtype="pint[Eur]")
-        return self._df["r"]
+        return self._series("r")
 
     @property
     def kind(self) -> Kind:
@@ -99,19 +111,17 @@ class SinglePfLine(PfLine):
         # *args, **kwargs needed because base class has this signature.
         if cols is None:
             cols = self.available
-        series = {col: getattr(self, col) for col in cols}
         if not has_units:
-            series = {col: s.pint.m for col, s in series.items()}
-        return pd.DataFrame(series)
+            return pd.DataFrame({col: self._values(col) for col in cols}, self.index)
+        return pd.DataFrame({col: self._series(col) for col in cols})
 
     def asfreq(self, freq: str = "MS") -> SinglePfLine:
+        # ._df contains the summable columns 'q' and/or 'r', or the averagable column 'p'.
         if self.kind is Kind.PRICE_ONLY:
-            df = changefreq.averagable(self.df("p"), freq)
-        elif self.kind is Kind.VOLUME_ONLY:
-            df = changefreq.summable(self.df("q"), freq)
-        else:  # self.kind is Kind.ALL
-            df = changefreq.summable(self.df("qr"), freq)
-        return SinglePfLine(df)
+            df = changefreq.averagable(self._df, freq)
+        else:
+            df = changefreq.summable(self._df, freq)
+        return SinglePfLine._from_df(df)
 
     @property
     def loc(self) -> _LocIndexer:
@@ -120,23 +130,26 @@ class SinglePfLine(PfLine):
     def __eq__(self, other):
         if not isinstance(other, self.__class__):
             return False
-        try:
-            testing.assert_frame_equal(self._df, other._df, rtol=1e-7)
+        if self is other:
             return True
-        except AssertionError:
+        if set(self._df.columns) != set(other._df.columns):
+            return False
+        if not compare.index_equal(self.index, other.index):
             return False
-        # return self._df.pint.to_base_units().equals(other._df.pint.to_base_units())
+        return all(
+            compare.values_close(self._df[col].to_numpy(), other._df[col].to_numpy())
+            for col in self._df.columns
+        )
 
     def __bool__(self) -> bool:
         # False if all relevant timeseries are 0.
         if self.kind is Kind.PRICE_ONLY:
-            return not np.allclose(self.p.pint.magnitude, 0)
+            return not np.allclose(self._values("p"), 0)
         elif self.kind is Kind.VOLUME_ONLY:
-            return not np.allclose(self.w.pint.magnitude, 0)
+            return not np.allclose(self._values("w"), 0)
         else:  # kind is Kind.ALL
             return not (
-                np.allclose(self.w.pint.magnitude, 0)
-                and np.allclose(self.r.pint.magnitude, 0)
+                np.allclose(self._values("w"), 0) and np.allclose(self._values("r"), 0)
             )
 
     def __setitem__(self, *args, **kwargs):
@@ -148,9 +161,40 @@ class SinglePfLine(PfLine):
     def __delitem__(self, name: str):
         raise TypeError("Flat portfolio line; cannot remove children.")
 
+    def _calculate_fingerprint(self) -> str:
+        values = {col: s.to_numpy() for col, s in self._df.items()}
+        return compare.fingerprint(self.index, values)
+
     # Additional methods, unique to this class.
 
-    # (no additional methods)
+    def _values(self, col: str) -> np.ndarray:
+        """Values of timeseries ``col`` as float array, in the standard unit of ``col``.
+        Array of nan if ``col`` is not available. Derived values (``w``, and ``p`` if
+        calculated from ``r`` and ``q``) are cached and read-only."""
+        if col in self._df:
+            return self._df[col].to_numpy()
+        kind = self.kind
+        if col == "w" and kind is not Kind.PRICE_ONLY:
+            return self._cached("w", self._calculate_w)
+        elif col == "p" and kind is Kind.ALL:
+            return self._cached("p", self._calculate_p)
+        return np.full(len(self._df), np.nan)
+
+    def _calculate_w(self) -> np.ndarray:
+        w = self._df["q"].to_numpy() / self.index.duration.pint.m.to_numpy()
+        w.flags.writeable = False
+        return w
+
+    def _calculate_p(self) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            p = self._df["r"].to_numpy() / self._df["q"].to_numpy()
+        p.flags.writeable = False
+        return p
+
+    def _series(self, col: str) -> pd.Series:
+        """Timeseries ``col`` with ``pint`` unit. Does not share memory with the
+        instance, so that it can be changed in place."""
+        return pd.Series(self._values(col).copy(), self.index, _DTYPES[col], col)
 
 
 class _LocIndexer:
@@ -160,5 +204,8 @@ class _LocIndexer:
         self.spfl = spfl
 
     def __getitem__(self, arg) -> SinglePfLine:
+        if (positions := stamps.contiguous_slice(self.spfl.index, arg)) is not None:
+            # Share values with original instance; no verification needed.
+            return SinglePfLine._from_df(self.spfl._df.iloc[positions])
         new_df = self.spfl.df().loc[arg]
         return SinglePfLine(new_df)
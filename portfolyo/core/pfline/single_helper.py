@@ -5,8 +5,9 @@ from __future__ import annotations
 from . import base
 from . import interop
 from .base import Kind
-from ...tools import frames
+from ...tools import frames, nits
 
+from typing import Mapping
 import pandas as pd
 import numpy as np
 
@@ -47,6 +48,54 @@ def make_dataframe(data) -> pd.DataFrame:
     return _dataframe_from_series(inop.w, inop.q, inop.p, inop.r)
 
 
+def make_dataframe_trusted(data) -> pd.DataFrame:
+    """From data, create a DataFrame with float column `q`, column `p`, or columns `q`
+    and `r`, in the standard units. Like ``make_dataframe`` followed by ``strip_units``,
+    but without data verification; only the units are converted and missing columns
+    are calculated."""
+    if isinstance(data, base.PfLine):
+        series = {col: getattr(data, col) for col in data.summable}
+    elif isinstance(data, (pd.DataFrame, Mapping)):
+        series = dict(data.items())
+    else:
+        raise TypeError(
+            "Parameter ``data`` must be PfLine, pandas.DataFrame, or dict (or other "
+            f"Mapping) of timeseries if it is not validated; got {type(data)}."
+        )
+    if len(series) == 0 or not set(series).issubset(set("wqpr")):
+        raise ValueError(f"Expected timeseries 'w', 'q', 'p', 'r'; got {list(series)}.")
+
+    index = next(iter(series.values())).index
+    values = {col: _float_values(s, col) for col, s in series.items()}
+    if "w" in values:
+        w = values.pop("w")
+        if "q" not in values:
+            values["q"] = w * index.duration.pint.m.to_numpy()
+    if "q" not in values and "r" in values and "p" in values:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values["q"] = values["r"] / values["p"]
+    if "q" in values and "r" not in values and "p" in values:
+        q, p = values["q"], values["p"]
+        values["r"] = np.where(q == 0, 0.0, q * p)  # r=0 if q==0, even if p==nan
+
+    if "q" in values:
+        cols = "qr" if "r" in values else "q"
+    elif "p" in values:
+        cols = "p"
+    else:
+        raise ValueError("Must supply (a) volume, (b) price, or (c) both.")
+    return pd.DataFrame({col: values[col] for col in cols}, index)
+
+
+def _float_values(s: pd.Series, col: str) -> np.ndarray:
+    """Values of (``pint``-) series as float array, in the standard unit of ``col``.
+    Values without unit are assumed to already be in the standard unit."""
+    if not hasattr(s.dtype, "units"):
+        return s.to_numpy(float)
+    factor = nits.Q_(1.0, s.dtype.units).to(nits.NAMES_AND_UNITS[col]).m
+    return s.pint.m.to_numpy(float) * factor
+
+
 def _dataframe_from_series(
     w: pd.Series = None, q: pd.Series = None, p: pd.Series = None, r: pd.Series = None
 ) -> pd.DataFrame:
@@ -88,3 +137,13 @@ def _dataframe_from_series(
             raise ValueError("Passed values for ``q``, ``p`` and ``r`` not consistent.")
     q, r = q.pint.to_base_units(), r.pint.to_base_units()
     return pd.DataFrame({"q": q, "r": r}).dropna()  # kind is ALL
+
+
+def strip_units(df: pd.DataFrame) -> pd.DataFrame:
+    """Float values of (``pint``-) dataframe, in the standard unit of each column."""
+    return pd.DataFrame(
+        {
+            col: s.pint.to(nits.NAMES_AND_UNITS[col]).pint.m.astype(float)
+            for col, s in df.items()
+        }
+    )
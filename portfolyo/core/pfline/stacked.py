@@ -0,0 +1,195 @@
+"""Children of a MultiPfLine that are flat, of the same kind and with the same index,
+stored together as a single block of values. Useful for wide portfolios, e.g. with one
+child per customer."""
+
+from __future__ import annotations
+
+from . import single
+from .base import Kind
+from .. import changefreq
+from ...tools import frames, nits
+
+from typing import Iterable, Mapping, Optional
+import pandas as pd
+import numpy as np
+import pint
+
+
+_KINDS = {"q": Kind.VOLUME_ONLY, "p": Kind.PRICE_ONLY, "qr": Kind.ALL}
+_ATTRS = ("w", "q", "p", "qr", "rw", "pq", "pw")  # (sorted) columns of each child
+
+
+class Stack(Mapping):
+    """Mapping of names to flat portfolio lines, which share their values' memory.
+
+    Parameters
+    ----------
+    block : np.ndarray
+        Float array with shape (len(cols), len(names), len(index)), i.e., for each
+        column, one contiguous (children x timestamps) block. Values in standard units.
+    cols : {'q', 'p', 'qr'}
+        Columns of each child.
+    names : Iterable[str]
+        Names of the children.
+    index : pd.DatetimeIndex
+        Index of each child.
+
+    Notes
+    -----
+    The children are created when first accessed, as ``SinglePfLine`` instances whose
+    values are views into ``block``.
+    """
+
+    def __init__(
+        self,
+        block: np.ndarray,
+        cols: str,
+        names: Iterable[str],
+        index: pd.DatetimeIndex,
+    ):
+        self.block = block
+        self.cols = cols
+        self.names = list(names)
+        self.index = index
+        self._positions = {name: n for n, name in enumerate(self.names)}
+        self._children = {}
+
+    @property
+    def kind(self) -> Kind:
+        return _KINDS[self.cols]
+
+    def total(self, col: str) -> np.ndarray:
+        """Sum over all children of column ``col``."""
+        return self.block[self.cols.index(col)].sum(axis=0)
+
+    def asfreq(self, freq: str = "MS") -> Stack:
+        """Resample all children at once."""
+        ncols, nnames, _ = self.block.shape
+        df = pd.DataFrame(self.block.reshape(ncols * nnames, -1).T, self.index)
+        if self.kind is Kind.PRICE_ONLY:
+            df2 = changefreq.averagable(df, freq)
+        else:
+            df2 = changefreq.summable(df, freq)
+        block = np.ascontiguousarray(df2.to_numpy(float).T).reshape(ncols, nnames, -1)
+        return Stack(block, self.cols, self.names, df2.index)
+
+    def window(self, positions: slice) -> Stack:
+        """Children on part of the index (given by the ``positions`` slice). Values are
+        views into this stack's block."""
+        block = self.block[:, :, positions]
+        return Stack(block, self.cols, self.names, self.index[positions])
+
+    def __getitem__(self, name: str) -> single.SinglePfLine:
+        if name not in self._children:
+            n = self._positions[name]  # raises KeyError if not found
+            df = pd.DataFrame(self.block[:, n, :].T, self.index, list(self.cols))
+            self._children[name] = single.SinglePfLine._from_df(df)
+        return self._children[name]
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name) -> bool:
+        return name in self._positions
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> Optional[Stack]:
+        """Create stack from wide dataframe, or return None if not possible.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Either (a) one column per child, all with a ``pint`` unit of the same
+            dimension (power, energy, or price); or (b) two column levels: child name
+            and ``w``, ``q``, ``p`` or ``r``. Each child must have the same columns:
+            one of 'w', 'q', 'p', 'qr', 'wr', 'qp', 'wp'. Values without unit are
+            assumed to be in the standard unit.
+
+        Returns
+        -------
+        Stack
+            None if the data cannot be stored as a stack, e.g. because it does not have
+            a standardized index, or because not all children have the same columns.
+        """
+        if not isinstance(df.index, pd.DatetimeIndex) or len(df.columns) == 0:
+            return None
+        try:
+            frames.assert_standardized(df)
+        except AssertionError:
+            return None
+
+        if df.columns.nlevels == 1:
+            names = list(df.columns)
+            if (attr := _common_attr(df)) is None:
+                return None
+            blocks = {attr: _floatblock(df, attr)}  # dimension already checked
+
+        elif df.columns.nlevels == 2:
+            names = list(df.columns.get_level_values(0).unique())
+            attrs = set(df.columns.get_level_values(1))
+            if "".join(sorted(attrs)) not in _ATTRS:
+                return None
+            blocks = {}
+            for attr in attrs:
+                sub = df.xs(attr, axis=1, level=1)
+                if list(sub.columns) != names:  # not all children have this column
+                    return None
+                if (block := _floatblock(sub, attr)) is None:
+                    return None
+                blocks[attr] = block
+
+        else:
+            return None
+
+        if not all(isinstance(name, str) for name in names):
+            return None
+
+        if "w" in blocks:
+            blocks["q"] = blocks.pop("w") * df.index.duration.pint.m.to_numpy()
+        if "q" in blocks and "p" in blocks:
+            blocks["r"] = blocks["q"] * blocks.pop("p")
+        cols = "".join(col for col in "qpr" if col in blocks)
+        block = np.stack([blocks[col] for col in cols])
+        if cols == "qr" and np.isnan(block).any():
+            return None  # children would need to be trimmed individually
+
+        return cls(block, cols, names, df.index)
+
+
+def _common_attr(df: pd.DataFrame) -> Optional[str]:
+    """Attribute ('w', 'q', or 'p') of dataframe, if all its columns have a unit of the
+    same dimension; None otherwise."""
+    attrs = set()
+    for dtype in df.dtypes.unique():
+        if not hasattr(dtype, "units"):
+            return None  # no pint unit
+        try:
+            attrs.add(nits.unit2name(dtype.units))
+        except pint.UndefinedUnitError:
+            return None
+    if len(attrs) != 1 or (attr := attrs.pop()) not in "wqp":
+        return None
+    return attr
+
+
+def _floatblock(df: pd.DataFrame, attr: str) -> Optional[np.ndarray]:
+    """Values of dataframe, as (columns x rows) float array in standard unit of
+    ``attr``. Values without unit are assumed to already be in the standard unit. None
+    if a unit does not fit with ``attr``."""
+    unit = nits.NAMES_AND_UNITS[attr]
+    factors = {}  # conversion factor for each distinct pint dtype
+    block = np.empty((len(df.columns), len(df.index)))
+    for n, (_, s) in enumerate(df.items()):
+        if hasattr(s.dtype, "units"):
+            if s.dtype not in factors:
+                try:
+                    factors[s.dtype] = nits.Q_(1.0, s.dtype.units).to(unit).m
+                except pint.DimensionalityError:
+                    return None
+            block[n] = s.pint.m.to_numpy(float) * factors[s.dtype]
+        else:
+            block[n] = s.to_numpy(float)
+    return block
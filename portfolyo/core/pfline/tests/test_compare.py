@@ -0,0 +1,28 @@
+from portfolyo.core.pfline import compare
+import numpy as np
+import pytest
+
+inf, nan = np.inf, np.nan
+
+
+@pytest.mark.parametrize(
+    ("values1", "values2", "expected"),
+    [
+        ([1.0, 2.0, 3.0], [1.0, 2.0, 3.0], True),
+        ([1.0, 2.0, 3.0], [1.0, 2.0 * (1 + 1e-9), 3.0], True),
+        ([1.0, 2.0, 3.0], [1.0, 2.0 * (1 + 1e-6), 3.0], False),
+        ([0.0, 2.0, 3.0], [1e-9, 2.0, 3.0], True),
+        ([1.0, nan, 3.0], [1.0, nan, 3.0 * (1 + 1e-9)], True),
+        ([1.0, inf, -inf], [1.0 * (1 + 1e-9), inf, -inf], True),
+        ([1.0, inf, 3.0], [1.0, -inf, 3.0], False),
+        ([1.0, nan, 3.0], [1.0, inf, 3.0], False),
+        ([1.0, nan, 3.0], [1.0 * (1 + 1e-9), -inf, 3.0], False),
+        ([1.0, nan, 3.0], [1.0, 2.0, 3.0], False),
+        ([1.0, 2.0, 3.0], [1.0, 2.0], False),
+    ],
+)
+def test_valuesclose(values1, values2, expected):
+    """Test if arrays are correctly found to be (not) close, also with nan and inf."""
+    a1, a2 = np.array(values1), np.array(values2)
+    assert compare.values_close(a1, a2) is expected
+    assert compare.values_close(a2, a1) is expected
@@ -158,3 +158,16 @@ def test_makemapping(input: Any, expected: Mapping):
             assert all(result_val == expected_val)
         else:
             assert result_val == expected_val
+
+
+@pytest.mark.parametrize("freq", ["15T", "D", "MS"])
+def test_verifydict_onlytrimwhenneeded(freq):
+    """Test if only children with a longer index are trimmed, and others kept as-is."""
+    i = dev.get_index(freq, "Europe/Berlin")
+    long = dev.get_singlepfline(i, Kind.VOLUME_ONLY)
+    short = dev.get_singlepfline(i[1:], Kind.VOLUME_ONLY)
+    short2 = dev.get_singlepfline(i[1:], Kind.VOLUME_ONLY)
+    result = multi_helper.verify_and_trim_dict({"a": long, "b": short, "c": short2})
+    assert result["b"] is short and result["c"] is short2
+    assert result["a"] is not long
+    testing.assert_index_equal(result["a"].index, short.index)
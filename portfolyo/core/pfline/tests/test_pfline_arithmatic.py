@@ -1619,3 +1619,92 @@ def test_pfl_muldiv_full(pfl_in, value, expected_mul, expected_div, operation):
         testing.assert_series_equal(result, expected, check_names=False)
     else:
         assert result == expected
+
+
+@pytest.mark.parametrize("operation", ["+", "-", "*"])
+@pytest.mark.parametrize("kind", [Kind.VOLUME_ONLY, Kind.PRICE_ONLY, Kind.ALL])
+@pytest.mark.parametrize("freq", ["15T", "D"])
+def test_pfl_arithmatic_sameindex(freq, kind, operation):
+    """Test if arithmatic with portfolio lines on identical index gives same result as
+    with portfolio lines whose indices only partly overlap."""
+    i = pd.date_range("2020", freq=freq, periods=500, tz="Europe/Berlin")
+    i_longer = pd.date_range("2020", freq=freq, periods=600, tz="Europe/Berlin")
+    pfl1 = dev.get_singlepfline(i, kind)
+    if operation == "*":
+        value_longer = pd.Series(range(600), i_longer).astype("pint[dimensionless]")
+        value = value_longer.iloc[:500]
+    else:
+        value_longer = dev.get_singlepfline(i_longer, kind)
+        value = SinglePfLine(value_longer.df().iloc[:500])
+
+    fn = {"+": lambda x: pfl1 + x, "-": lambda x: pfl1 - x, "*": lambda x: pfl1 * x}
+    result, expected = fn[operation](value), fn[operation](value_longer)
+    assert result.index.equals(i) and result.index.freq == freq
+    assert result == expected
+
+
+@pytest.mark.parametrize("flatten", [True, False])
+@pytest.mark.parametrize("single_or_multi", ["single", "multi"])
+@pytest.mark.parametrize("kind", [Kind.VOLUME_ONLY, Kind.PRICE_ONLY, Kind.ALL])
+@pytest.mark.parametrize("freq", ["15T", "D"])
+def test_pfl_sum(freq, kind, single_or_multi, flatten):
+    """Test if sum of several portfolio lines gives same result as adding them one by
+    one."""
+    pflines = {}
+    for n in range(5):
+        i = pd.date_range("2020", freq=freq, periods=100 - 5 * n, tz="Europe/Berlin")
+        if single_or_multi == "single" or n % 2:
+            pflines[f"pfl{n}"] = dev.get_singlepfline(i[n:], kind)
+        else:
+            pflines[f"pfl{n}"] = dev.get_multipfline(i[n:], kind)
+
+    result = PfLine.sum(pflines, flatten)
+    expected_sum = sum(pfl.flatten() for pfl in pflines.values())
+    assert result.index.equals(expected_sum.index) and result.index.freq == freq
+    assert result.kind is kind
+    if flatten:
+        assert isinstance(result, SinglePfLine)
+        assert result == expected_sum
+    else:
+        assert isinstance(result, MultiPfLine)
+        assert list(result) == list(pflines)
+        assert result.flatten() == expected_sum
+        assert result == MultiPfLine(pflines)
+    assert PfLine.sum(pflines.values()) == expected_sum  # also without names
+
+
+@pytest.mark.parametrize(
+    ("pflines", "error"),
+    [
+        ({}, ValueError),
+        ([dev.get_singlepfline(i, Kind.VOLUME_ONLY), 1.0], TypeError),
+        ([dev.get_singlepfline(i, Kind.VOLUME_ONLY)] * 2, TypeError),  # names needed
+        (
+            {
+                "a": dev.get_singlepfline(i, Kind.VOLUME_ONLY),
+                "b": dev.get_singlepfline(i, Kind.PRICE_ONLY),
+            },
+            ValueError,
+        ),
+        (
+            {
+                "a": dev.get_singlepfline(i, Kind.ALL),
+                "b": dev.get_singlepfline(
+                    pd.date_range("2020", freq="QS", periods=4, tz=tz), Kind.ALL
+                ),
+            },
+            ValueError,
+        ),
+        (
+            {
+                "a": dev.get_singlepfline(i[:2], Kind.ALL),
+                "b": dev.get_singlepfline(i[2:], Kind.ALL),
+            },
+            ValueError,
+        ),
+    ],
+)
+def test_pfl_sum_error(pflines, error):
+    """Test if incompatible portfolio lines cannot be summed."""
+    with pytest.raises(error):
+        PfLine.sum(pflines, flatten=False)
@@ -0,0 +1,82 @@
+from portfolyo import dev, testing, Kind, MultiPfLine
+import pandas as pd
+import pytest
+
+
+@pytest.mark.parametrize("kind", [Kind.ALL, Kind.VOLUME_ONLY, Kind.PRICE_ONLY])
+@pytest.mark.parametrize("getter", [dev.get_singlepfline, dev.get_multipfline])
+def test_derived_values_cached(getter, kind):
+    """Test if derived values are calculated once, and kept until cache is cleared."""
+    pfl = getter(dev.get_index("D", "Europe/Berlin"), kind)
+    assert pfl.cache_info() == {}
+
+    w, p = pfl.w, pfl.p
+    cached = pfl.cache_info()
+    if kind is not Kind.PRICE_ONLY:
+        assert "w" in cached and cached["w"] > 0
+    if kind is Kind.ALL:
+        assert "p" in cached and cached["p"] > 0
+
+    # Same values on second access, and from df().
+    testing.assert_series_equal(pfl.w, w)
+    testing.assert_series_equal(pfl.p, p)
+    testing.assert_frame_equal(pfl.df("wp"), pd.DataFrame({"w": w, "p": p}))
+    assert pfl.cache_info().keys() == cached.keys()
+
+    pfl.cache_clear()
+    assert pfl.cache_info() == {}
+    testing.assert_series_equal(pfl.w, w)
+
+
+@pytest.mark.parametrize("col", ["w", "q", "p", "r"])
+@pytest.mark.parametrize("getter", [dev.get_singlepfline, dev.get_multipfline])
+def test_returned_series_writeable(getter, col):
+    """Test if returned timeseries can be changed in place without changing the
+    portfolio line."""
+    pfl = getter(dev.get_index("D", "Europe/Berlin"), Kind.ALL)
+    expected = getattr(pfl, col).copy()
+
+    s = getattr(pfl, col)
+    s *= 2
+    testing.assert_series_equal(getattr(pfl, col), expected)
+
+
+def test_cache_cleared_when_children_change():
+    """Test if cached values of a MultiPfLine are removed when a child is changed."""
+    i = dev.get_index("D", "Europe/Berlin")
+    pfl = dev.get_multipfline(i, Kind.VOLUME_ONLY)
+    w_before = pfl.w
+    assert "w" in pfl.cache_info()
+
+    pfl["C"] = dev.get_singlepfline(i, Kind.VOLUME_ONLY)
+    assert pfl.cache_info() == {}
+    testing.assert_series_equal(pfl.w, w_before + pfl["C"].w)
+
+    del pfl["C"]
+    testing.assert_series_equal(pfl.w, w_before)
+
+
+def test_cache_cleared_in_affected_branch_only():
+    """Test if changing a descendent clears the cache of its ancestors, but not that of
+    other branches."""
+    i = dev.get_index("D", "Europe/Berlin")
+    pfl = MultiPfLine(
+        {
+            "A": MultiPfLine({"A1": dev.get_singlepfline(i, Kind.VOLUME_ONLY)}),
+            "B": MultiPfLine({"B1": dev.get_singlepfline(i, Kind.VOLUME_ONLY)}),
+        }
+    )
+    q_before = pfl.q
+    q_b = pfl["B"].q
+    assert "q" in pfl.cache_info() and "q" in pfl["A"].cache_info()
+
+    extra = dev.get_singlepfline(i, Kind.VOLUME_ONLY)
+    pfl["A"]["A2"] = extra
+    assert "q" not in pfl.cache_info()  # ancestor
+    assert "q" not in pfl["A"].cache_info()  # changed node
+    assert "q" in pfl["B"].cache_info()  # other branch
+    testing.assert_series_equal(pfl.q, q_before + extra.q)
+    testing.assert_series_equal(pfl["B"].q, q_b)
+
+    del pfl["A"]["A2"]
+    testing.assert_series_equal(pfl.q, q_before)
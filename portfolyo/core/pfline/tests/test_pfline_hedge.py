@@ -0,0 +1,35 @@
+from portfolyo import dev, Kind, MultiPfLine, PfState
+import pandas as pd
+import pytest
+
+
+@pytest.mark.parametrize("freq", ["H", "D"])
+@pytest.mark.parametrize("aggfreq", ["MS", "QS"])
+@pytest.mark.parametrize("how", ["vol", "val"])
+def test_hedge_children(freq, aggfreq, how):
+    """Test if hedging all children at once gives same result as hedging each."""
+    i = pd.date_range("2020", "2021", freq=freq, tz="Europe/Berlin", inclusive="left")
+    pfl = MultiPfLine({n: dev.get_singlepfline(i, Kind.VOLUME_ONLY) for n in "ABC"})
+    p = dev.get_singlepfline(i, Kind.PRICE_ONLY)
+
+    result = pfl.hedge_children_with(p, how, aggfreq)
+
+    assert isinstance(result, MultiPfLine)
+    assert list(result) == ["A", "B", "C"]
+    for name, child in pfl.items():
+        assert result[name] == child.hedge_with(p, how, aggfreq)
+
+
+def test_hedge_of_offtake():
+    """Test if offtake of portfolio state is hedged per child."""
+    i = pd.date_range("2020", "2021", freq="H", tz="Europe/Berlin", inclusive="left")
+    offtake = MultiPfLine({n: dev.get_singlepfline(i, Kind.VOLUME_ONLY) for n in "AB"})
+    p = dev.get_singlepfline(i, Kind.PRICE_ONLY)
+    pfs = PfState(offtake, p)
+
+    result = pfs.hedge_of_offtake()
+
+    assert isinstance(result, MultiPfLine)
+    for name, child in offtake.items():
+        assert result[name] == (-child).hedge_with(p)
+    assert pfs.hedge_of_unsourced() == result.flatten()
@@ -1,4 +1,5 @@
 from portfolyo import testing, dev, SinglePfLine, MultiPfLine, FREQUENCIES, Kind  # noqa
+from portfolyo.tools import nits
 import pandas as pd
 import numpy as np
 import pytest
@@ -64,6 +65,113 @@ def test_singlepfline_access(columns):
             assert result.df(col)[col].all()
 
 
+@pytest.mark.parametrize("columns", ["q", "p", "qr", "pq"])
+def test_singlepfline_floatstorage(columns):
+    """Test if values are stored without units, in the standard units."""
+    i = pd.date_range("2020", freq="D", periods=2)
+    data = {
+        "q": pd.Series([1.0, 2.0], i, dtype="pint[GWh]"),
+        "p": pd.Series([50.0, 100.0], i, dtype="pint[ctEur/kWh]"),
+        "r": pd.Series([1.0, 2.0], i, dtype="pint[MEur]"),
+    }
+    result = SinglePfLine({col: data[col] for col in columns})
+
+    assert (result._df.dtypes == float).all()
+    if "q" in columns:
+        np.testing.assert_allclose(result._df["q"], [1000, 2000])
+        assert result.q.pint.u == nits.ureg.Unit("MWh")
+        assert result.w.pint.u == nits.ureg.Unit("MW")
+    if "p" in result.available:
+        assert result.p.pint.u == nits.ureg.Unit("Eur/MWh")
+    if columns == "p":
+        np.testing.assert_allclose(result._df["p"], [500, 1000])
+    expected = result.df().pint.dequantify().droplevel(1, axis=1)
+    testing.assert_frame_equal(result.df(has_units=False), expected)
+
+
+@pytest.mark.parametrize("units", ["standard", "other", "none"])
+@pytest.mark.parametrize("columns", ["w", "q", "p", "pr", "qr", "pq", "wp", "wr"])
+def test_singlepfline_novalidation(columns, units):
+    """Test if instance created without validation is the same as with validation."""
+    df = dev.get_dataframe(columns=columns)
+    if units == "other":
+        other = {"w": "kW", "q": "GWh", "p": "ctEur/kWh", "r": "MEur"}
+        df = pd.DataFrame({col: s.pint.to(other[col]) for col, s in df.items()})
+    elif units == "none":
+        df = df.pint.dequantify().droplevel(1, axis=1)
+
+    result = SinglePfLine(df, validate=False)
+    expected = SinglePfLine(df)
+    assert (result._df.dtypes == float).all()
+    assert result == expected
+    testing.assert_frame_equal(result.df(), expected.df())
+    assert SinglePfLine(dict(df.items()), validate=False) == expected
+    assert SinglePfLine(expected, validate=False) is expected
+
+
+@pytest.mark.parametrize("kind", [Kind.VOLUME_ONLY, Kind.PRICE_ONLY, Kind.ALL])
+@pytest.mark.parametrize(
+    "change", ["none", "copy", "1e-9", "1e-6", "inf", "nan", "index", "columns"]
+)
+def test_singlepfline_eqfingerprint(kind, change):
+    """Test if equality is same as (slower) dataframe comparison, and if instances with
+    same fingerprint are equal."""
+    pfl1 = dev.get_singlepfline(kind=kind)
+    df = pfl1._df.copy()
+    if change == "index":
+        df = df.set_axis(df.index + pd.Timedelta(days=1))
+    elif change == "columns":
+        df = df.iloc[:, :1] if len(df.columns) == 2 else df.assign(r=0.0)
+    elif change in ["1e-9", "1e-6"]:
+        df.iloc[5, 0] *= 1 + float(change)
+    elif change in ["inf", "nan"]:
+        df.iloc[5, 0] = float(change)
+    pfl2 = pfl1 if change == "none" else SinglePfLine._from_df(df)
+
+    try:
+        testing.assert_frame_equal(pfl1._df, pfl2._df, rtol=1e-7)
+        expected = True
+    except AssertionError:
+        expected = False
+    assert (pfl1 == pfl2) is expected
+    assert (pfl2 == pfl1) is expected
+    if pfl1.fingerprint() == pfl2.fingerprint():
+        assert pfl1 == pfl2
+    if change in ["none", "copy"]:
+        assert pfl1.fingerprint() == pfl2.fingerprint()
+    else:
+        assert pfl1.fingerprint() != pfl2.fingerprint()
+
+
+@pytest.mark.parametrize("kind", [Kind.VOLUME_ONLY, Kind.PRICE_ONLY, Kind.ALL])
+@pytest.mark.parametrize(
+    ("arg", "isview"),
+    [
+        (slice("2020-02", "2020-03"), True),
+        (slice(None, "2020-01-10"), True),
+        (slice(pd.Timestamp("2020-03-15", tz="Europe/Berlin"), None), True),
+        ("index", True),
+        ("mask", False),
+    ],
+)
+def test_singlepfline_loc(kind, arg, isview):
+    """Test if part of portfolio line is correct, and shares memory with the original
+    if it is a contiguous part."""
+    i = pd.date_range("2020", "2020-05", freq="D", tz="Europe/Berlin")
+    pfl = dev.get_singlepfline(i, kind)
+    if arg == "index":
+        arg = i[10:20]
+    elif arg == "mask":
+        arg = i < "2020-02"  # boolean mask: not checked for contiguity
+
+    result = pfl.loc[arg]
+    expected = SinglePfLine(pfl.df().loc[arg])
+    assert result == expected
+    assert result.index.freq == "D"
+    values, original = result._df.iloc[:, 0].to_numpy(), pfl._df.iloc[:, 0].to_numpy()
+    assert np.shares_memory(values, original) is isview
+
+
 idx = [
     pd.date_range("2020", "2020-04", freq=freq, inclusive="left", tz="Europe/Berlin")
     for freq in ["MS", "D", "15T"]
@@ -0,0 +1,154 @@
+from portfolyo import testing, dev, Kind, MultiPfLine, SinglePfLine
+from portfolyo.core.pfline import stacked
+import pandas as pd
+import numpy as np
+import pytest
+
+
+def wide_dataframe(i: pd.DatetimeIndex, cols: str, has_units: bool) -> pd.DataFrame:
+    """Dataframe with 2 column levels: child name and ``cols``."""
+    units = {"w": "MW", "q": "GWh", "p": "ctEur/kWh", "r": "kEur"}
+    dfs = {}
+    for name in ["A", "B", "C"]:
+        data = {col: np.random.rand(len(i)) * 100 for col in cols}
+        if has_units:
+            data = {c: pd.Series(v, i, f"pint[{units[c]}]") for c, v in data.items()}
+        dfs[name] = pd.DataFrame(data, i)
+    return pd.concat(dfs, axis=1)
+
+
+@pytest.mark.parametrize("freq", ["H", "D"])
+@pytest.mark.parametrize("cols", ["w", "q", "p", "qr", "wr", "qp", "wp"])
+@pytest.mark.parametrize("has_units", [True, False])
+def test_stacked_sameasdict(freq, cols, has_units):
+    """Test if MultiPfLine created from wide dataframe is stored as stack, and is the
+    same as one created from the individual children."""
+    i = dev.get_index(freq, "Europe/Berlin")
+    df = wide_dataframe(i, cols, has_units)
+
+    result = MultiPfLine(df)
+    expected = MultiPfLine({name: SinglePfLine(df[name]) for name in "ABC"})
+
+    assert isinstance(result._children, stacked.Stack)
+    assert result.kind is expected.kind
+    assert result == expected
+    for col in result.available:
+        testing.assert_series_equal(getattr(result, col), getattr(expected, col))
+
+
+@pytest.mark.parametrize("change", [None, "value", "name", "order"])
+def test_stacked_eqfingerprint(change):
+    """Test if MultiPfLines stored as stack are compared correctly, also with
+    MultiPfLines stored as dictionary, and if equal content gives equal fingerprint."""
+    i = dev.get_index("H", "Europe/Berlin")
+    df = wide_dataframe(i, "qr", False)
+    df2 = df.copy()
+    if change == "value":
+        df2.iloc[5, 0] += 1.0
+    elif change == "name":
+        df2 = df2.rename(columns={"A": "D"}, level=0)
+    elif change == "order":
+        df2 = df2[["B", "A", "C"]]
+
+    pfl1, pfl2 = MultiPfLine(df), MultiPfLine(df2)
+    pfl2_dict = MultiPfLine({name: SinglePfLine(df2[name]) for name in pfl2})
+    assert isinstance(pfl1._children, stacked.Stack)
+    assert isinstance(pfl2._children, stacked.Stack)
+
+    expected = change in [None, "order"]
+    assert (pfl1 == pfl2) is expected
+    assert (pfl1 == pfl2_dict) is expected
+    assert (pfl1.fingerprint() == pfl2.fingerprint()) is expected
+    assert pfl2.fingerprint() == pfl2_dict.fingerprint()
+
+
+@pytest.mark.parametrize("cols", ["w", "p"])
+def test_stacked_singlelevel(cols):
+    """Test if MultiPfLine is created from wide dataframe with one column per child."""
+    i = dev.get_index("D", "Europe/Berlin")
+    df = wide_dataframe(i, cols, True).droplevel(1, axis=1)
+
+    result = MultiPfLine(df)
+    expected = MultiPfLine({name: SinglePfLine({cols: s}) for name, s in df.items()})
+
+    assert isinstance(result._children, stacked.Stack)
+    assert result == expected
+
+
+@pytest.mark.parametrize("cols", ["q", "p", "qr"])
+@pytest.mark.parametrize("newfreq", ["D", "MS", "QS"])
+def test_stacked_asfreq(cols, newfreq):
+    """Test if frequency of all children is changed at once, with correct result."""
+    i = pd.date_range("2020", "2022", freq="H", tz="Europe/Berlin", inclusive="left")
+    df = wide_dataframe(i, cols, False)
+
+    result = MultiPfLine(df).asfreq(newfreq)
+    expected = MultiPfLine({name: SinglePfLine(df[name]) for name in "ABC"})
+    expected = expected.asfreq(newfreq)
+
+    assert isinstance(result._children, stacked.Stack)
+    assert result == expected
+
+
+def test_stacked_childrenareviews():
+    """Test if children share memory with the stack, and are converted to dictionary
+    when changed."""
+    i = dev.get_index("D", "Europe/Berlin")
+    pfl = MultiPfLine(wide_dataframe(i, "qr", True))
+    block = pfl._children.block
+
+    assert np.shares_memory(pfl["B"]._df["q"].to_numpy(), block)
+    assert pfl["B"] is pfl.B
+
+    pfl["D"] = dev.get_singlepfline(i, Kind.ALL)
+    assert not isinstance(pfl._children, stacked.Stack)
+    assert list(pfl) == ["A", "B", "C", "D"]
+    del pfl["A"]
+    assert list(pfl) == ["B", "C", "D"]
+
+
+@pytest.mark.parametrize("arg", [slice("2020-02", "2020-03"), "index", "mask"])
+def test_stacked_loc(arg):
+    """Test if part of MultiPfLine stored as stack is correct, and is again a stack
+    that shares memory with the original if it is a contiguous part."""
+    i = pd.date_range("2020", "2020-05", freq="D", tz="Europe/Berlin")
+    pfl = MultiPfLine(wide_dataframe(i, "qr", True))
+    if arg == "index":
+        arg = i[10:20]
+    elif arg == "mask":
+        arg = i < "2020-02"
+
+    result = pfl.loc[arg]
+    expected = MultiPfLine({name: child.loc[arg] for name, child in pfl.items()})
+    assert result == expected
+    assert list(result) == list(pfl)
+    if isinstance(arg, np.ndarray):
+        assert not isinstance(result._children, stacked.Stack)
+    else:
+        assert isinstance(result._children, stacked.Stack)
+        assert np.shares_memory(result._children.block, pfl._children.block)
+
+
+@pytest.mark.parametrize(
+    "columns",
+    [
+        pd.MultiIndex.from_tuples([("A", "q"), ("B", "p")]),  # different columns
+        pd.MultiIndex.from_tuples([("A", "q"), ("A", "w")]),  # unsupported columns
+        pd.MultiIndex.from_tuples([("A", "q"), (1, "q")]),  # non-string name
+        pd.Index(["A", "B"]),  # no units
+    ],
+)
+def test_stacked_notpossible(columns):
+    """Test if None is returned for dataframes that cannot be stored as stack."""
+    i = dev.get_index("D", "Europe/Berlin")
+    df = pd.DataFrame(np.random.rand(len(i), 2), i, columns)
+    assert stacked.Stack.from_dataframe(df) is None
+
+
+def test_stacked_notpossible_nan():
+    """Test if None is returned if children with volume and revenue have missing values,
+    as they must each be trimmed."""
+    i = dev.get_index("D", "Europe/Berlin")
+    df = wide_dataframe(i, "qr", False)
+    df.iloc[:2, 0] = np.nan
+    assert stacked.Stack.from_dataframe(df) is None
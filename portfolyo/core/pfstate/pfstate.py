@@ -7,17 +7,19 @@ from __future__ import annotations
 
 
 from .pfstate_helper import make_pflines
+from .. import changefreq
 from ..ndframelike import NDFrameLike
-from ..pfline import PfLine, MultiPfLine
-from ..mixins import PfStateText, PfStatePlot, OtherOutput
+from ..pfline import PfLine, MultiPfLine, SinglePfLine, compare
+from ..mixins import PfStateText, PfStatePlot, OtherOutput, Cached
 from ...tools import frames
 
 from typing import Iterable, Optional, Union
 import pandas as pd
+import numpy as np
 import warnings
 
 
-class PfState(NDFrameLike, PfStateText, PfStatePlot, OtherOutput):
+class PfState(NDFrameLike, PfStateText, PfStatePlot, OtherOutput, Cached):
     """Class to hold timeseries information of an energy portfolio, at a specific moment.
 
     Parameters
@@ -113,6 +115,21 @@ class PfState(NDFrameLike, PfStateText, PfStatePlot, OtherOutput):
         self._offtakevolume, self._unsourcedprice, self._sourced = make_pflines(
             offtakevolume, unsourcedprice, sourced
         )
+        # Derived values are cached; clear them if children of a component change.
+        for pfl in (self._offtakevolume, self._unsourcedprice, self._sourced):
+            if isinstance(pfl, MultiPfLine):
+                pfl._parents[id(self)] = self
+
+    @classmethod
+    def _from_pflines(
+        cls, offtakevolume: PfLine, unsourcedprice: PfLine, sourced: Optional[PfLine]
+    ) -> PfState:
+        """Create instance directly from portfolio lines of the correct kind, with
+        offtake and sourced on the same index. No data verification is done."""
+        pfs = object.__new__(cls)
+        pfs._offtakevolume, pfs._unsourcedprice = offtakevolume, unsourcedprice
+        pfs._sourced = sourced
+        return pfs
 
     @property
     def index(self) -> pd.DatetimeIndex:  # from ABC
@@ -129,7 +146,7 @@ class PfState(NDFrameLike, PfStateText, PfStatePlot, OtherOutput):
     @property
     def sourced(self) -> PfLine:
         if self._sourced is None:
-            return PfLine(pd.DataFrame({"q": 0, "r": 0}, self.index))
+            return self._cached("sourced", self._calculate_sourced)
         else:
             return self._sourced
 
@@ -140,24 +157,73 @@ class PfState(NDFrameLike, PfStateText, PfStatePlot, OtherOutput):
 
     @property
     def unsourced(self) -> PfLine:
-        return -(self.offtake.volume + self.sourced.volume) * self.unsourcedprice
+        return self._cached("unsourced", self._calculate_unsourced)
 
     @property
     def netposition(self) -> PfLine:
-        return -self.unsourced
+        return self._cached("netposition", self._calculate_netposition)
 
     @property
-    def pnl_cost(self):
+    def pnl_cost(self) -> MultiPfLine:
+        # Not cached, as a MultiPfLine can be changed in place. (Its children are.)
         return MultiPfLine({"sourced": self.sourced, "unsourced": self.unsourced})
 
     @property
     def sourcedfraction(self) -> pd.Series:
-        return self.sourced.volume / -self.offtake.volume
+        return self._cached("sourcedfraction", self._calculate_sourcedfraction).copy()
 
     @property
     def unsourcedfraction(self) -> pd.Series:
+        return self._cached(
+            "unsourcedfraction", self._calculate_unsourcedfraction
+        ).copy()
+
+    # (Derived values are cached; see ``Cached._cached``. For each, the components it
+    # depends on. Methods that change a component keep the values that remain valid.)
+
+    _DEPENDENCIES = {
+        "sourced": {"offtakevolume", "sourced"},  # (only if none was specified)
+        "unsourcedvolume": {"offtakevolume", "sourced"},
+        "unsourced": {"offtakevolume", "sourced", "unsourcedprice"},
+        "netposition": {"offtakevolume", "sourced", "unsourcedprice"},
+        "sourcedfraction": {"offtakevolume", "sourced"},
+        "unsourcedfraction": {"offtakevolume", "sourced"},
+    }
+
+    def _calculate_sourced(self) -> PfLine:
+        return PfLine(pd.DataFrame({"q": 0, "r": 0}, self.index))
+
+    def _calculate_unsourcedvolume(self) -> PfLine:
+        return -(self.offtake.volume + self.sourced.volume)
+
+    def _calculate_unsourced(self) -> PfLine:
+        unsourcedvolume = self._cached(
+            "unsourcedvolume", self._calculate_unsourcedvolume
+        )
+        return unsourcedvolume * self.unsourcedprice
+
+    def _calculate_netposition(self) -> PfLine:
+        return -self.unsourced
+
+    def _calculate_sourcedfraction(self) -> pd.Series:
+        return self.sourced.volume / -self.offtake.volume
+
+    def _calculate_unsourcedfraction(self) -> pd.Series:
         return 1 - self.sourcedfraction
 
+    def _keep_cached(self, pfs: PfState, changed: str) -> PfState:
+        """Take over those derived values of ``pfs`` that do not depend on component
+        ``changed``; ``pfs`` must have the same other components as this instance."""
+        cache = self.__dict__.setdefault("_cache", {})
+        for key, value in pfs.__dict__.get("_cache", {}).items():
+            if changed not in self._DEPENDENCIES[key]:
+                cache[key] = value
+        return self
+
+    def _clear_cache_upward(self) -> None:
+        # Called by MultiPfLine components when their children change.
+        self.cache_clear()
+
     def df(
         self,
         cols: Iterable[str] = None,
@@ -200,17 +266,20 @@ class PfState(NDFrameLike, PfStateText, PfStatePlot, OtherOutput):
             "This operation changes the unsourced volume. This causes inaccuracies in its price"
             " if the portfolio state has a frequency that is longer than the spot market."
         )
-        return PfState(offtakevolume, self.unsourcedprice, self._sourced)
+        pfs = PfState(offtakevolume, self.unsourcedprice, self._sourced)
+        return pfs._keep_cached(self, "offtakevolume")
 
     def set_unsourcedprice(self, unsourcedprice: PfLine) -> PfState:
-        return PfState(self.offtake.volume, unsourcedprice, self._sourced)
+        pfs = PfState(self.offtake.volume, unsourcedprice, self._sourced)
+        return pfs._keep_cached(self, "unsourcedprice")
 
     def set_sourced(self, sourced: PfLine) -> PfState:
         warnings.warn(
             "This operation changes the unsourced volume. This causes inaccuracies in its price"
             " if the portfolio state has a frequency that is longer than the spot market."
         )
-        return PfState(self._offtakevolume, self._unsourcedprice, sourced)
+        pfs = PfState(self._offtakevolume, self._unsourcedprice, sourced)
+        return pfs._keep_cached(self, "sourced")
 
     def add_sourced(self, add_sourced: PfLine) -> PfState:
         return self.set_sourced(self.sourced + add_sourced)  # warns
@@ -230,10 +299,36 @@ class PfState(NDFrameLike, PfStateText, PfStatePlot, OtherOutput):
             Resampled at wanted frequency.
         """
         # pu resampling is most important, so that prices are correctly weighted.
-        offtakevolume = self.offtakevolume.asfreq(freq)
-        unsourcedprice = self.unsourced.asfreq(freq).price  # ensures weighted avg
-        sourced = self.sourced.asfreq(freq)
-        return PfState(offtakevolume, unsourcedprice, sourced)
+        parts = (self._offtakevolume, self._unsourcedprice, self._sourced)
+        if not all(isinstance(pfl, (SinglePfLine, type(None))) for pfl in parts):
+            # Keep children: resample each component.
+            offtakevolume = self.offtakevolume.asfreq(freq)
+            unsourcedprice = self.unsourced.asfreq(freq).price  # ensures weighted avg
+            sourced = self.sourced.asfreq(freq)
+            return PfState(offtakevolume, unsourcedprice, sourced)
+
+        # All components are flat: resample the float values in one go, without
+        # creating the (pint-) unsourced portfolio line.
+        offtakevolume, unsourcedprice, sourced = parts
+        if not compare.index_equal(unsourcedprice.index, self.index):
+            unsourcedprice = unsourcedprice.loc[self.index]  # may be longer than offtake
+        values = {"qo": offtakevolume._values("q")}
+        if sourced is not None:
+            values.update({"qs": sourced._values("q"), "rs": sourced._values("r")})
+        qu = -(values["qo"] + values.get("qs", 0.0))
+        values.update({"qu": qu, "ru": qu * unsourcedprice._values("p")})
+        df = changefreq.summable(pd.DataFrame(values, self.index), freq)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pu = df["ru"].to_numpy() / df["qu"].to_numpy()  # ensures weighted avg
+        if sourced is not None:
+            sourced = SinglePfLine._from_df(
+                df[["qs", "rs"]].set_axis(["q", "r"], axis=1)
+            )
+        return PfState._from_pflines(
+            SinglePfLine._from_df(df[["qo"]].set_axis(["q"], axis=1)),
+            SinglePfLine._from_df(pd.DataFrame({"p": pu}, df.index)),
+            sourced,
+        )
 
     def hedge_of_unsourced(
         self: PfState, how: str = "val", freq: str = "MS", po: bool = None
@@ -251,6 +346,29 @@ class PfState(NDFrameLike, PfStateText, PfStatePlot, OtherOutput):
         """
         return self.unsourced.volume.hedge_with(self.unsourcedprice, how, freq, po)
 
+    def hedge_of_offtake(
+        self: PfState, how: str = "val", freq: str = "MS", po: bool = None
+    ) -> PfLine:
+        """Hedge the offtake volume, at unsourced prices in the portfolio.
+
+        See also
+        --------
+        PfLine.hedge
+        MultiPfLine.hedge_children_with
+
+        Returns
+        -------
+        PfLine
+            Hedge (volumes and prices) of the volume needed to source the offtake (i.e.,
+            of the offtake volume with opposite sign). If the offtake volume has
+            children, each child is hedged (all at once), and a MultiPfLine with the
+            same child names is returned.
+        """
+        tohedge = -self.offtakevolume  # keeps children, if any
+        if isinstance(tohedge, MultiPfLine):
+            return tohedge.hedge_children_with(self.unsourcedprice, how, freq, po)
+        return tohedge.hedge_with(self.unsourcedprice, how, freq, po)
+
     def source_unsourced(
         self: PfState, how: str = "val", freq: str = "MS", po: bool = None
     ) -> PfState:
@@ -302,9 +420,10 @@ class _LocIndexer:
         self.pfs = pfs
 
     def __getitem__(self, arg) -> PfState:
-        offtakevolume = self.pfs.offtake.volume.loc[arg]
+        # (Contiguous parts of the components share their values with the original.)
+        offtakevolume = self.pfs.offtakevolume.loc[arg]
         unsourcedprice = self.pfs.unsourcedprice.loc[arg]
-        sourced = self.pfs.sourced.loc[arg]
+        sourced = None if self.pfs._sourced is None else self.pfs._sourced.loc[arg]
         return PfState(offtakevolume, unsourcedprice, sourced)
 
 
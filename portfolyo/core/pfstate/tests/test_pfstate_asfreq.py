@@ -0,0 +1,60 @@
+from portfolyo import dev, testing, Kind, MultiPfLine, PfState, SinglePfLine
+import pandas as pd
+import pytest
+
+
+def asfreq_by_component(pfs: PfState, freq: str) -> PfState:
+    """Resample each component separately (reference implementation)."""
+    offtakevolume = pfs.offtakevolume.asfreq(freq)
+    unsourcedprice = pfs.unsourced.asfreq(freq).price
+    sourced = pfs.sourced.asfreq(freq)
+    return PfState(offtakevolume, unsourcedprice, sourced)
+
+
+@pytest.mark.parametrize("multi", [False, True])
+@pytest.mark.parametrize("with_sourced", [True, False])
+@pytest.mark.parametrize("newfreq", ["H", "D", "MS", "QS", "AS"])
+def test_pfstate_asfreq(newfreq, with_sourced, multi):
+    """Test if resampling a portfolio state gives the same result as resampling its
+    components one at a time, also if some unsourced volume is zero."""
+    i = pd.date_range("2020", "2022", freq="15T", tz="Europe/Berlin", inclusive="left")
+    offtakevolume = -dev.get_singlepfline(i, Kind.VOLUME_ONLY)
+    if multi:
+        offtakevolume = MultiPfLine({"A": offtakevolume, "B": offtakevolume})
+    unsourcedprice = dev.get_singlepfline(i, Kind.PRICE_ONLY)
+    if with_sourced:
+        unsourced = PfState(offtakevolume, unsourcedprice).unsourced
+        firstyear = i < "2021"  # fully sourced in first year; nothing in second
+        sourced = SinglePfLine(
+            {col: getattr(unsourced, col).pint.m.where(firstyear, 0.0) for col in "qr"}
+        )
+    else:
+        sourced = None
+    pfs = PfState(offtakevolume, unsourcedprice, sourced)
+
+    result = pfs.asfreq(newfreq)
+    expected = asfreq_by_component(pfs, newfreq)
+    assert result == expected
+    assert result.index.freq == expected.index.freq
+    testing.assert_series_equal(result.unsourcedprice.p, expected.unsourcedprice.p)
+    if multi:
+        assert isinstance(result.offtakevolume, MultiPfLine)
+
+
+@pytest.mark.parametrize("newfreq", ["D", "MS", "AS"])
+def test_pfstate_asfreq_longerprice(newfreq):
+    """Test if resampling works if the unsourced prices cover a longer period than the
+    offtake."""
+    i = pd.date_range("2020", "2021", freq="H", tz="Europe/Berlin", inclusive="left")
+    i_price = pd.date_range(
+        "2020", "2022", freq="H", tz="Europe/Berlin", inclusive="left"
+    )
+    offtakevolume = -dev.get_singlepfline(i, Kind.VOLUME_ONLY)
+    unsourcedprice = dev.get_singlepfline(i_price, Kind.PRICE_ONLY)
+    sourced = dev.get_singlepfline(i, Kind.ALL) * 0.5
+    pfs = PfState(offtakevolume, unsourcedprice, sourced)
+
+    result = pfs.asfreq(newfreq)
+    expected = asfreq_by_component(pfs, newfreq)
+    assert result == expected
+    assert result.index.equals(expected.offtakevolume.index)
@@ -0,0 +1,127 @@
+from portfolyo import dev, testing, Kind, MultiPfLine, PfState
+from unittest import mock
+import pandas as pd
+import pytest
+import warnings
+
+DERIVED = ["unsourced", "netposition", "sourcedfraction", "unsourcedfraction"]
+
+
+def assert_equal(value1, value2):
+    if isinstance(value1, pd.Series):
+        testing.assert_series_equal(value1, value2)
+    else:
+        assert value1 == value2
+
+
+@pytest.mark.parametrize("attr", DERIVED)
+def test_derived_values_cached(attr):
+    """Test if derived values are calculated once, and kept until cache is cleared."""
+    pfs = dev.get_pfstate(dev.get_index("D", "Europe/Berlin"))
+    assert pfs.cache_info() == {}
+
+    calculate = getattr(PfState, f"_calculate_{attr}")
+    with mock.patch.object(
+        PfState, f"_calculate_{attr}", autospec=True, side_effect=calculate
+    ) as mocked:
+        value = getattr(pfs, attr)
+        assert attr in pfs.cache_info()
+        assert_equal(getattr(pfs, attr), value)
+        assert mocked.call_count == 1
+
+        pfs.cache_clear()
+        assert pfs.cache_info() == {}
+        assert_equal(getattr(pfs, attr), value)
+        assert mocked.call_count == 2
+
+
+@pytest.mark.parametrize("attr", ["sourcedfraction", "unsourcedfraction"])
+def test_returned_series_writeable(attr):
+    """Test if returned timeseries can be changed in place without changing the
+    portfolio state."""
+    pfs = dev.get_pfstate(dev.get_index("D", "Europe/Berlin"))
+    expected = getattr(pfs, attr).copy()
+
+    s = getattr(pfs, attr)
+    s *= 2
+    testing.assert_series_equal(getattr(pfs, attr), expected)
+
+
+def test_pnl_cost_changeable():
+    """Test if adding a child to the returned pnl_cost does not change the portfolio
+    state."""
+    i = dev.get_index("D", "Europe/Berlin")
+    pfs = dev.get_pfstate(i)
+    expected = pfs.pnl_cost
+
+    pnl_cost = pfs.pnl_cost
+    pnl_cost["extra"] = dev.get_singlepfline(i, Kind.ALL)
+    assert "extra" not in pfs.pnl_cost
+    assert pfs.pnl_cost == expected
+
+
+def test_unsourced_calculated_once():
+    """Test if the unsourced line is calculated only once when printing and getting the
+    dataframe of a portfolio state."""
+    pfs = dev.get_pfstate(dev.get_index("D", "Europe/Berlin"))
+    calculate = PfState._calculate_unsourced
+    with mock.patch.object(
+        PfState, "_calculate_unsourced", autospec=True, side_effect=calculate
+    ) as mocked:
+        _ = repr(pfs)
+        _ = pfs.df()
+        _ = pfs.netposition
+        _ = pfs.pnl_cost
+        _ = pfs == pfs
+    assert mocked.call_count == 1
+
+
+@pytest.mark.parametrize(
+    ("method", "kept"),
+    [
+        (
+            "set_unsourcedprice",
+            {"unsourcedvolume", "sourcedfraction", "unsourcedfraction"},
+        ),
+        ("set_offtakevolume", set()),
+        ("set_sourced", set()),
+    ],
+)
+def test_cache_kept_after_set(method, kept):
+    """Test if derived values are kept when a component is changed, if they do not
+    depend on it, and if all derived values are correct."""
+    i = dev.get_index("D", "Europe/Berlin")
+    pfs = dev.get_pfstate(i)
+    for attr in DERIVED:
+        getattr(pfs, attr)
+
+    if method == "set_unsourcedprice":
+        arg = dev.get_singlepfline(i, Kind.PRICE_ONLY)
+    elif method == "set_offtakevolume":
+        arg = -dev.get_singlepfline(i, Kind.VOLUME_ONLY)
+    else:
+        arg = dev.get_singlepfline(i, Kind.ALL)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        result = getattr(pfs, method)(arg)
+
+    assert set(result.cache_info()) == kept
+    expected = PfState(result.offtakevolume, result.unsourcedprice, result.sourced)
+    assert result.unsourced == expected.unsourced
+    testing.assert_series_equal(result.sourcedfraction, expected.sourcedfraction)
+
+
+def test_cache_cleared_when_children_change():
+    """Test if cached values of a PfState are removed when a child of one of its
+    components is changed."""
+    i = dev.get_index("D", "Europe/Berlin")
+    offtakevolume = MultiPfLine({"A": -dev.get_singlepfline(i, Kind.VOLUME_ONLY)})
+    pfs = PfState(offtakevolume, dev.get_singlepfline(i, Kind.PRICE_ONLY))
+    unsourced_before = pfs.unsourced
+    assert "unsourced" in pfs.cache_info()
+
+    offtakevolume["B"] = -dev.get_singlepfline(i, Kind.VOLUME_ONLY)
+    assert pfs.cache_info() == {}
+    testing.assert_series_equal(
+        pfs.unsourced.q, unsourced_before.q - offtakevolume["B"].q
+    )
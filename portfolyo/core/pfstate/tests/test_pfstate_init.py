@@ -527,3 +527,24 @@ def test_pfstate_consistency_nosourcing():
         pd.Series(1.0, i_ref, "pint[dimensionless]"),
         check_names=False,
     )
+
+
+@pytest.mark.parametrize("with_sourced", [True, False])
+def test_pfstate_loc(with_sourced):
+    """Test if part of portfolio state is correct, and shares memory with the original
+    if it is a contiguous part."""
+    i = pd.date_range("2020", "2020-05", freq="D", tz="Europe/Berlin")
+    pfs = dev.get_pfstate(i)
+    if not with_sourced:
+        pfs = PfState(pfs.offtakevolume, pfs.unsourcedprice)
+    arg = slice("2020-02", "2020-03")
+
+    result = pfs.loc[arg]
+    expected = PfState(
+        pfs.offtakevolume.flatten().df().loc[arg],
+        pfs.unsourcedprice.df().loc[arg],
+        pfs.sourced.df().loc[arg] if with_sourced else None,
+    )
+    assert result == expected
+    values = result.unsourcedprice._df["p"].to_numpy()
+    assert np.shares_memory(values, pfs.unsourcedprice._df["p"].to_numpy())
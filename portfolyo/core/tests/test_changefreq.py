@@ -1,9 +1,10 @@
 from pathlib import Path
 from typing import Tuple, Union
-from portfolyo import testing
+from portfolyo import dev, testing, Kind
 from portfolyo.core import changefreq
 from portfolyo.tools import stamps
 import pandas as pd
+import numpy as np
 import pytest
 import functools
 
@@ -326,3 +327,107 @@ def test_changefreq_fullonly(
         testing.assert_series_equal(result, expected, check_dtype=False)
     else:
         testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize(
+    ("day", "source_freq", "target_freq", "periods"),
+    [
+        ("2020-03-29", "15T", "H", 23),
+        ("2020-10-25", "15T", "H", 25),
+        ("2020-03-29", "H", "D", 1),
+        ("2020-10-25", "15T", "D", 1),
+    ],
+)
+@pytest.mark.parametrize("avg_or_sum", ["avg", "sum"])
+def test_changefreq_dst(day, source_freq, target_freq, periods, avg_or_sum):
+    """Test if frequency is correctly changed on days with a DST-transition."""
+    testfn = changefreq.averagable if avg_or_sum == "avg" else changefreq.summable
+    i = pd.date_range(day, freq=target_freq, periods=periods, tz="Europe/Berlin")
+    expected = pd.Series(np.arange(periods) * 4.0, i)
+    i_source = pd.date_range(i[0], i.ts_right[-1], freq=source_freq, inclusive="left")
+
+    # Up and down again.
+    source = testfn(expected, source_freq)
+    testing.assert_index_equal(source.index, i_source)
+    assert source.index.freq == source_freq
+    result = testfn(source, target_freq)
+    testing.assert_series_equal(result, expected)
+
+
+@pytest.mark.parametrize("avg_or_sum", ["avg", "sum"])
+@pytest.mark.parametrize("target_freq", ["15T", "D", "QS"])
+def test_changefreq_dataframe(avg_or_sum, target_freq):
+    """Test if all columns of a dataframe are changed at once, with same result as for
+    each individual column."""
+    testfn = changefreq.averagable if avg_or_sum == "avg" else changefreq.summable
+    i = pd.date_range("2020", "2022", freq="H", tz="Europe/Berlin", inclusive="left")
+    source = pd.DataFrame(
+        {
+            "a": pd.Series(np.random.rand(len(i)), i).astype("pint[MWh]"),
+            "b": np.random.rand(len(i)),
+            "c": np.arange(len(i)),
+        }
+    )
+
+    result = testfn(source, target_freq)
+
+    for col, s in source.items():
+        testing.assert_series_equal(result[col], testfn(s, target_freq))
+
+
+@pytest.mark.parametrize("target_freq", ["15T", "D", "MS"])
+def test_changefreq_planreused(target_freq):
+    """Test if resampling plan is reused for equal (but not identical) indices."""
+    changefreq.plan_cache_clear()
+    i = pd.date_range("2020", "2021", freq="H", tz="Europe/Berlin", inclusive="left")
+    i2 = pd.date_range("2020", "2021", freq="H", tz="Europe/Berlin", inclusive="left")
+    pfl1 = dev.get_singlepfline(i, Kind.VOLUME_ONLY)
+    pfl2 = dev.get_singlepfline(i2, Kind.PRICE_ONLY)
+
+    pfl1.asfreq(target_freq)
+    pfl2.asfreq(target_freq)
+    changefreq.summable(pd.Series(np.random.rand(len(i)), i), target_freq)
+
+    assert changefreq.plan_cache_info() == (2, 1, 32, 1)
+    assert changefreq.get_plan(i2, target_freq) is changefreq.get_plan(i, target_freq)
+
+
+def test_changefreq_plancache_maxsize():
+    """Test if least recently used plans are discarded."""
+    changefreq.plan_cache_clear()
+    changefreq.set_plan_cache_maxsize(2)
+    try:
+        i = pd.date_range("2020", freq="H", periods=24 * 366)
+        plans = [changefreq.get_plan(i, freq) for freq in ["D", "MS", "D", "QS"]]
+        assert plans[0] is plans[2]
+        assert changefreq.plan_cache_info() == (1, 3, 2, 2)
+        assert changefreq.get_plan(i, "MS") is not plans[1]  # evicted
+        assert changefreq.get_plan(i, "QS") is plans[3]
+    finally:
+        changefreq.set_plan_cache_maxsize(32)
+        changefreq.plan_cache_clear()
+    with pytest.raises(ValueError):
+        changefreq.set_plan_cache_maxsize(-1)
+
+
+@pytest.mark.parametrize("freq", ["15T", "D", "MS"])
+def test_changefreq_plan(freq):
+    """Test if mapping, weights and mask of a plan are consistent with the result."""
+    i = pd.date_range("2020-01-15", "2020-04-10", freq="H", tz="Europe/Berlin")
+    plan = changefreq.ResamplePlan(i, freq)
+    values = np.random.rand(len(i), 2)
+    dur = stamps.duration(i).pint.m.to_numpy()
+
+    result = plan.apply(values, True)
+
+    if freq == "15T":
+        assert plan.mask.all()
+        np.testing.assert_allclose(result, values[plan.mapping] / 4)
+        np.testing.assert_allclose(plan.weights, 0.25)
+    else:
+        assert (plan.mapping[~plan.mask] == -1).all()
+        np.testing.assert_allclose(plan.weights, dur)
+        for n in range(len(plan.index)):
+            expected = values[plan.mapping == n].sum(axis=0)
+            np.testing.assert_allclose(result[n], expected)
+        assert not plan.mapping.flags.writeable
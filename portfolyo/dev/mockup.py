@@ -3,7 +3,7 @@ from typing import Tuple
 import pandas as pd
 import numpy as np
 from ..tools import nits
-from ..prices.utils import is_peak_hour
+from ..prices.utils import peak_mask
 
 
 def w_offtake(
@@ -104,7 +104,7 @@ def p_marketprices(
         if i.freq == "15T":  # repeat every value 4 times
             b = np.array([[bb, bb, bb, bb] for bb in b]).flatten()
         b = b[: len(i)]  # slice in case i is very short
-        pa = np.convolve(-1 + 2 * i.map(is_peak_hour), b / sum(b), mode="same")
+        pa = np.convolve(-1 + 2 * peak_mask(i), b / sum(b), mode="same")
     else:
         pa = np.zeros(len(i))
     # Values
@@ -162,7 +162,8 @@ def wp_sourced(
         return pd.DataFrame({"p": pval, "w": wval}, sub_s.index)
 
     if sin.index.freq in ["15T", "H"]:
-        df = sin.groupby(is_peak_hour).apply(lambda s: s.resample(freq).apply(fn))
+        ispeak = peak_mask(sin.index)
+        df = sin.groupby(ispeak).apply(lambda s: s.resample(freq).apply(fn))
     else:
         df = sin.resample(freq).apply(fn)
     w, p = df.w, df.p
@@ -10,7 +10,7 @@ Convert volume [MW] and price [Eur/MWh] timeseries using base, peak, offpeak tim
 .. Hourly varying values --> Peak and offpeak values.
 """
 
-from typing import Union, Iterable
+from typing import List, Union, Iterable
 from . import utils
 from ..core import changefreq
 from ..tools.types import Value, Stamp
@@ -25,27 +25,25 @@ import warnings
 BPO = ("base", "peak", "offpeak")
 
 
-def group_function(freq: str, po: bool = False):
-    """Function to group all rows that belong to same 'product'."""
-    if freq == "MS":
-        if po:
-            return lambda ts: (ts.year, ts.month, utils.is_peak_hour(ts))
-        else:
-            return lambda ts: (ts.year, ts.month)
+def group_keys(i: pd.DatetimeIndex, freq: str, po: bool = False) -> List[np.ndarray]:
+    """Arrays to group all rows that belong to same 'product'; can be passed to
+    ``.groupby()``."""
+    if freq == "D":
+        keys = [i.year, i.month, i.day]
+    elif freq == "MS":
+        keys = [i.year, i.month]
     elif freq == "QS":
-        if po:
-            return lambda ts: (ts.year, ts.quarter, utils.is_peak_hour(ts))
-        else:
-            return lambda ts: (ts.year, ts.quarter)
+        keys = [i.year, i.quarter]
     elif freq == "AS":
-        if po:
-            return lambda ts: (ts.year, utils.is_peak_hour(ts))
-        else:
-            return lambda ts: (ts.year,)
-
-    raise ValueError(
-        f"Parameter ``freq`` must be one of 'MS', 'QS', 'AS'; got '{freq}'."
-    )
+        keys = [i.year]
+    else:
+        raise ValueError(
+            f"Parameter ``freq`` must be one of 'D', 'MS', 'QS', 'AS'; got '{freq}'."
+        )
+    keys = [np.asarray(key) for key in keys]
+    if po:
+        keys.append(utils.peak_mask(i))
+    return keys
 
 
 def offpeak(
@@ -220,7 +218,7 @@ def tseries2singlebpo(s: pd.Series, prefix: str = "") -> pd.Series:
     sin, units = (s.pint.magnitude, s.pint.units) if hasattr(s, "pint") else (s, None)
 
     # Do calculations. Use normal mean, because all rows have same duration.
-    grouped = sin.groupby(utils.is_peak_hour).mean()
+    grouped = sin.groupby(utils.peak_mask(sin.index)).mean()
     sout = pd.Series(
         {
             f"{prefix}base": sin.mean(),
@@ -295,12 +293,20 @@ def tseries2bpoframe(s: pd.Series, freq: str = "MS", prefix: str = "") -> pd.Dat
     sin, units = (s.pint.magnitude, s.pint.units) if hasattr(s, "pint") else (s, None)
 
     # Do calculations. Use normal mean, because all rows have same duration.
-    sout = sin.resample(freq).apply(lambda s: tseries2singlebpo(s, prefix))
+    ispeak = utils.peak_mask(sin.index)
+    base = sin.resample(freq).mean()
+    sout = pd.DataFrame(
+        {
+            f"{prefix}base": base,
+            f"{prefix}peak": sin[ispeak].resample(freq).mean().reindex(base.index),
+            f"{prefix}offpeak": sin[~ispeak].resample(freq).mean().reindex(base.index),
+        }
+    )
 
     # Handle possible units.
     if units is not None:
         sout = sout.astype(nits.pintunit_remove(units))
-    return sout.unstack()
+    return sout
 
 
 def bpoframe2tseries(
@@ -359,7 +365,7 @@ def bpoframe2tseries(
     df = bpoframe.rename({f"{prefix}{bpo}": bpo for bpo in BPO}, axis=1)  # remove prefx
     df = complete_bpoframe(df)  # make sure we have peak and offpeak columns
     df = changefreq.averagable(df[["peak", "offpeak"]], freq)
-    df["ispeak"] = df.index.map(utils.is_peak_hour)
+    df["ispeak"] = utils.is_peak_hour(df.index)
 
     return df["offpeak"].where(df["ispeak"], df["peak"])
 
@@ -420,7 +426,7 @@ def tseries2tseries(s: pd.Series, freq: str = "MS") -> pd.Series:
     sin, units = (s.pint.magnitude, s.pint.units) if hasattr(s, "pint") else (s, None)
 
     # Return normal mean, because all rows have same duration.
-    sout = sin.groupby(group_function(freq, True)).transform(np.mean)
+    sout = sin.groupby(group_keys(sin.index, freq, True)).transform(np.mean)
 
     # Handle possible units.
     if units is not None:
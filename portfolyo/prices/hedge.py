@@ -1,77 +1,85 @@
 """Functionality to hedge an offtake profile with a price profile."""
 
-from .utils import is_peak_hour
-from . import convert
-from ..tools import frames, nits
-from typing import Tuple
+from .utils import peak_mask
+from ..tools import frames, nits, stamps
+from typing import Tuple, Union
 import pandas as pd
+import numpy as np
 
 
-def _hedge(df: pd.DataFrame, how: str, po: bool) -> pd.Series:
+def _product_codes(i: pd.DatetimeIndex, freq: str, po: bool) -> np.ndarray:
+    """Integer code for each timestamp, identifying the hedge product it belongs to."""
+    codes = np.asarray(stamps.group_codes(i, freq))
+    if po:
+        codes = codes * 2 + peak_mask(i)  # offpeak: even, peak: odd
+    return codes
+
+
+def _hedge_products(
+    w: np.ndarray, p: np.ndarray, dur: np.ndarray, codes: np.ndarray, how: str
+) -> Tuple[np.ndarray]:
     """
-    Hedge a power timeseries, for given price timeseries.
+    Hedge a power timeseries, for given price timeseries, for each product at once.
 
     Parameters
     ----------
-    df : pd.DataFrame
-        with 'w' [MW] and 'p' [Eur/MWh] columns.
+    w : np.ndarray
+        Power [MW] of each timestamp. 1D, or 2D with a column for each of several
+        power timeseries, which are then all hedged at once.
+    p, dur : np.ndarray
+        Price [Eur/MWh] and duration [h] of each timestamp.
+    codes : np.ndarray
+        Product code of each timestamp (see ``_product_codes``).
     how : str. One of {'vol', 'val'}
         Hedge-constraint. 'vol' for volumetric hedge, 'val' for value hedge.
-    po : bool
-        Set to True to split hedge into peak and offpeak values. (Only sensible
-        for timeseries with freq=='H' or shorter.)
 
     Returns
     -------
-    pd.Series
-        With float values or quantities.
-        If po==False, Series with index ['w', 'p'] (power and price in entire period).
-        If po==True, Series with multiindex ['peak', 'offpeak'] x ['w', 'p'] (power and
-        price, split between peak and offpeak intervals in the period.)
-
-    Notes
-    -----
-    If the index of `df` doesn't have a .duration attribute, all rows are assumed to be
-    of equal duration.
+    Tuple[np.ndarray]
+        Power and price of each product, indexed by product code (along axis 0).
+        (Missing values are skipped in the sums.)
     """
+    if w.ndim == 2:  # broadcast timestamp values to all columns
+        p, dur = p[:, np.newaxis], dur[:, np.newaxis]
 
-    if not po:
-        try:
-            # Use magnitude only, so that, if w and p are float series, their return
-            # series are also floats (instead of dimensionless Quantities).
-            df["dur"] = df.index.duration.pint.m
-        except (AttributeError, ValueError):
-            df["dur"] = 1
-
-        # Get single power and price values.
-        p_hedge = (df.p * df.dur).sum() / df.dur.sum()
+    with np.errstate(divide="ignore", invalid="ignore"):  # codes without timestamps
+        p_hedge = _productsum(p * dur, codes) / _productsum(dur, codes)
         if how.lower().startswith("vol"):  # volume hedge
-            # solve for w_hedge: sum (w * duration) == w_hedge * sum (duration)
-            w_hedge = (df.w * df.dur).sum() / df.dur.sum()
+            w_hedge = _productsum(w * dur, codes) / _productsum(dur, codes)
         else:  # value hedge
-            # solve for w_hedge: sum (w * duration * p) == w_hedge * sum (duration * p)
-            w_hedge = (df.w * df.dur * df.p).sum() / (df.dur * df.p).sum()
-        return pd.Series({"w": w_hedge, "p": p_hedge})
-    else:
-        apply_f = lambda df: _hedge(df, how, po=False)  # noqa
-        s = df.groupby(is_peak_hour).apply(apply_f)
-        return s.rename(index={True: "peak", False: "offpeak"}).stack()
+            w_hedge = _productsum(w * dur * p, codes) / _productsum(dur * p, codes)
+    return w_hedge, p_hedge[:, 0] if p_hedge.ndim == 2 else p_hedge
+
+
+def _productsum(values: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """Sum of values (along axis 0) for each product code, skipping missing values."""
+    values = np.where(np.isnan(values), 0.0, values)
+    if values.ndim == 1:
+        return np.bincount(codes, values)
+    # Sum each column with its timestamps grouped by product.
+    order = np.argsort(codes, kind="stable")
+    sortedcodes = codes[order]
+    starts = np.flatnonzero(np.diff(sortedcodes, prepend=-1))
+    sums = np.zeros((sortedcodes[-1] + 1, values.shape[1]))
+    sums[sortedcodes[starts]] = np.add.reduceat(values[order], starts, axis=0)
+    return sums
 
 
 def hedge(
-    w: pd.Series,
+    w: Union[pd.Series, pd.DataFrame],
     p: pd.Series,
     how: str = "val",
     freq: str = "MS",
     po: bool = None,
-) -> Tuple[pd.Series]:
+) -> Tuple[Union[pd.Series, pd.DataFrame], pd.Series]:
     """
     Make hedge of power timeseries, for given price timeseries.
 
     Parameters
     ----------
-    w : Series
-        Power timeseries with hourly or quarterhourly frequency.
+    w : Series or DataFrame
+        Power timeseries with hourly or quarterhourly frequency. If DataFrame: one
+        column for each of several power timeseries, which are all hedged at once.
     p: Series
         Price timeseries with same frequency.
     how : str, optional (Default: 'val')
@@ -85,8 +93,11 @@ def hedge(
 
     Returns
     -------
-    Tuple[pd.Series]
-        Power timeseries and price timeseries with hedge of `w` (with same index).
+    Tuple[Union[pd.Series, pd.DataFrame], pd.Series]
+        Power timeseries and price timeseries with hedge of `w` (with same index). If
+        `w` is a DataFrame, the power timeseries are also returned as a DataFrame, with
+        the same columns. (The hedge price does not depend on the power, and is
+        therefore the same for each column.)
     """
     if w.index.freq is None or p.index.freq is None:
         raise ValueError(
@@ -109,6 +120,9 @@ def hedge(
             "Split into peak and offpeak only possible when (a) hedging with monthly (or longer) products, and (b) if timeseries have hourly (or shorter) values."
         )
 
+    if isinstance(w, pd.DataFrame):
+        return _hedge_frame(w, p, how, freq, po)
+
     # Handle possible units.
     win, wunits = (w.pint.magnitude, w.pint.units) if hasattr(w, "pint") else (w, None)
     pin, punits = (p.pint.magnitude, p.pint.units) if hasattr(p, "pint") else (p, None)
@@ -119,17 +133,60 @@ def hedge(
     if len(df) == 0:
         return df["w"], df["p"]  # No full periods; don't do hedge; return empty series
 
-    # Do actual hedge.
-    group_f = convert.group_function(freq, po)
-    vals = df.groupby(group_f).apply(lambda df: _hedge(df, how, False))
-    vals.index = pd.MultiIndex.from_tuples(vals.index)
-    for c in ["w", "p"]:
-        df[c] = df[c].groupby(group_f).transform(lambda gr: vals.loc[gr.name, c])
+    # Do actual hedge: calculate value of each product, and put back at its timestamps.
+    dur, codes = _durations_and_codes(df.index, freq, po)
+    wp = df["w"].to_numpy(float), df["p"].to_numpy(float)
+    w_hedge, p_hedge = _hedge_products(*wp, dur, codes, how)
+    df["w"], df["p"] = w_hedge[codes], p_hedge[codes]
 
     # Handle possible units.
-    if wunits or punits:
-        df = df.astype(
-            {"w": nits.pintunit_remove(wunits), "p": nits.pintunit_remove(punits)}
-        )
+    units = {"w": wunits, "p": punits}
+    df = df.astype({c: nits.pintunit_remove(u) for c, u in units.items() if u})
 
     return df["w"], df["p"]
+
+
+def _hedge_frame(
+    w: pd.DataFrame, p: pd.Series, how: str, freq: str, po: bool
+) -> Tuple[pd.DataFrame, pd.Series]:
+    """Hedge each column of ``w``; see ``hedge``. Arguments already checked."""
+    # Handle possible units (columns may have distinct units).
+    wunits = {c: getattr(dtype, "units", None) for c, dtype in w.dtypes.items()}
+    win = pd.DataFrame({c: s.pint.m if wunits[c] else s for c, s in w.items()})
+    pin, punits = (p.pint.magnitude, p.pint.units) if hasattr(p, "pint") else (p, None)
+
+    # Only keep full periods of overlapping timestamps.
+    i = win.index.intersection(pin.index)
+    pin = frames.trim_frame(pin.loc[i], freq).rename("p")
+    i = pin.index
+    win = win.loc[i]
+    if len(i) == 0:
+        return win, pin  # No full periods; don't do hedge; return empty frames
+
+    # Do actual hedge: calculate values of each product, and put back at its timestamps.
+    dur, codes = _durations_and_codes(i, freq, po)
+    w_hedge, p_hedge = _hedge_products(
+        win.to_numpy(float), pin.to_numpy(float), dur, codes, how
+    )
+    wout = pd.DataFrame(w_hedge[codes], i, win.columns)
+    pout = pd.Series(p_hedge[codes], i, name="p")
+
+    # Handle possible units.
+    for c, u in wunits.items():
+        if u:
+            wout[c] = wout[c].astype(nits.pintunit_remove(u))
+    if punits:
+        pout = pout.astype(nits.pintunit_remove(punits))
+
+    return wout, pout
+
+
+def _durations_and_codes(
+    i: pd.DatetimeIndex, freq: str, po: bool
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Duration [h] and product code of each timestamp."""
+    try:
+        dur = i.duration.pint.m.to_numpy()
+    except (AttributeError, ValueError):
+        dur = np.ones(len(i))
+    return dur, _product_codes(i, freq, po)
@@ -0,0 +1,154 @@
+"""Vectorized calculation of peak and offpeak periods, for pluggable peak definitions."""
+
+from __future__ import annotations
+
+from ..tools import indexcache, stamps
+from dataclasses import dataclass
+from typing import Tuple
+import datetime as dt
+import pandas as pd
+import numpy as np
+
+
+@dataclass(frozen=True)
+class PeakCalendar:
+    """Definition of the peak periods in a market.
+
+    Parameters
+    ----------
+    start : int, optional (default: 8)
+        Hour (local time) at which the peak period starts on a peak day.
+    end : int, optional (default: 20)
+        Hour (local time) at which the peak period ends on a peak day (exclusive).
+    weekdays : Tuple[int], optional (default: Monday-Friday)
+        Days of the week that have a peak period; 0 = Monday, 6 = Sunday.
+    holidays : Iterable[dt.date], optional (default: no holidays)
+        Dates that do not have a peak period, even if they fall on one of ``weekdays``.
+
+    Notes
+    -----
+    Instances are immutable and hashable, so that they can be used as cache keys.
+    """
+
+    start: int = 8
+    end: int = 20
+    weekdays: Tuple[int, ...] = (0, 1, 2, 3, 4)
+    holidays: Tuple[dt.date, ...] = ()
+
+    def __post_init__(self):
+        if not 0 <= self.start < self.end <= 24:
+            raise ValueError(
+                f"Must have 0 <= ``start`` < ``end`` <= 24; got {self.start} and {self.end}."
+            )
+        if not set(self.weekdays) <= set(range(7)):
+            raise ValueError(
+                f"Values in ``weekdays`` must be 0..6; got {self.weekdays}."
+            )
+        # Store as sorted tuples, so that equal definitions are equal (and hash equal).
+        object.__setattr__(self, "weekdays", tuple(sorted(set(self.weekdays))))
+        holidays = (pd.Timestamp(h).date() for h in self.holidays)
+        object.__setattr__(self, "holidays", tuple(sorted(set(holidays))))
+
+    @property
+    def hours_per_day(self) -> int:
+        """Number of peak hours on a peak day."""
+        return self.end - self.start
+
+    @property
+    def weekmask(self) -> np.ndarray:
+        """Boolean array (Monday..Sunday) indicating which weekdays have a peak period."""
+        return np.isin(np.arange(7), self.weekdays)
+
+    def _holiday_array(self) -> np.ndarray:
+        return np.array(self.holidays, dtype="datetime64[D]")
+
+    def is_peak_day(self, days: np.ndarray) -> np.ndarray:
+        """Boolean array indicating which days (array of datetime64[D]) have a peak period."""
+        # 1970-01-01 was a Thursday (weekday 3).
+        weekday = (days.astype("int64") + 3) % 7
+        mask = self.weekmask[weekday]
+        if self.holidays:
+            mask &= ~np.isin(days, self._holiday_array())
+        return mask
+
+    def peak_days_between(self, left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Number of peak days between (arrays of datetime64[D]) ``left`` (inclusive)
+        and ``right`` (exclusive)."""
+        weekmask = self.weekmask.astype(int)  # bool array not accepted by numpy
+        return np.busday_count(
+            left, right, weekmask=weekmask, holidays=self._holiday_array()
+        )
+
+
+DEFAULT_CALENDAR = PeakCalendar()
+
+
+def _local_days_and_hours(i: pd.DatetimeIndex) -> Tuple[np.ndarray, np.ndarray]:
+    """Local date (as datetime64[D]) and local hour of each timestamp in index."""
+    local = i.tz_localize(None) if i.tz is not None else i
+    values = local.values
+    days = values.astype("datetime64[D]")
+    hours = (values - days).astype("timedelta64[h]").astype("int64")
+    return days, hours
+
+
+def _compute_mask(i: pd.DatetimeIndex, calendar: PeakCalendar) -> np.ndarray:
+    days, hours = _local_days_and_hours(i)
+    mask = (hours >= calendar.start) & (hours < calendar.end)
+    mask &= calendar.is_peak_day(days)
+    mask.flags.writeable = False
+    return mask
+
+
+def peak_mask(
+    i: pd.DatetimeIndex, calendar: PeakCalendar = DEFAULT_CALENDAR
+) -> np.ndarray:
+    """Boolean array indicating, for each timestamp in index, if it is in a peak period.
+
+    Parameters
+    ----------
+    i : pd.DatetimeIndex
+        Left-bound timestamps.
+    calendar : PeakCalendar, optional (default: Monday-Friday 08:00-20:00)
+        Definition of the peak periods.
+
+    Returns
+    -------
+    np.ndarray
+        Read-only boolean array with same length as ``i``.
+    """
+    return indexcache.get(i, ("peak", calendar), lambda: _compute_mask(i, calendar))
+
+
+def peak_duration(
+    i: pd.DatetimeIndex, freq: str, calendar: PeakCalendar = DEFAULT_CALENDAR
+) -> np.ndarray:
+    """Duration (in hours) of the peak periods, for each timestamp in index.
+
+    Parameters
+    ----------
+    i : pd.DatetimeIndex
+        Left-bound timestamps.
+    freq : {'15T' (quarter-hour), 'H' (hour), 'D' (day), 'MS' (month), 'QS' (quarter),
+        'AS' (year)}
+        Frequency of the timestamps.
+    calendar : PeakCalendar, optional (default: Monday-Friday 08:00-20:00)
+        Definition of the peak periods.
+
+    Returns
+    -------
+    np.ndarray
+        Float array with same length as ``i``.
+    """
+    if freq in ["15T", "H"]:
+        hours = 1.0 if freq == "H" else 0.25
+        return peak_mask(i, calendar) * hours
+
+    # Peak periods do not span midnight, and therefore never include a DST-transition.
+    days, _ = _local_days_and_hours(i)
+    if freq == "D":
+        return calendar.is_peak_day(days) * float(calendar.hours_per_day)
+    right = stamps.floor_ts(i, freq, 1)
+    right_days, _ = _local_days_and_hours(right)
+    count = calendar.peak_days_between(days, right_days)
+    return count * float(calendar.hours_per_day)
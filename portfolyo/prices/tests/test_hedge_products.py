@@ -0,0 +1,127 @@
+from portfolyo import testing
+from portfolyo.prices import hedge, convert
+from portfolyo.prices.utils import peak_mask
+import pandas as pd
+import numpy as np
+import pytest
+
+
+def hedge_product(df: pd.DataFrame, how: str, po: bool) -> pd.Series:
+    """
+    Hedge a power timeseries, for given price timeseries, in a single product.
+    (Reference implementation.)
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        with 'w' [MW] and 'p' [Eur/MWh] columns.
+    how : str. One of {'vol', 'val'}
+        Hedge-constraint. 'vol' for volumetric hedge, 'val' for value hedge.
+    po : bool
+        Set to True to split hedge into peak and offpeak values. (Only sensible
+        for timeseries with freq=='H' or shorter.)
+
+    Returns
+    -------
+    pd.Series
+        With float values or quantities.
+        If po==False, Series with index ['w', 'p'] (power and price in entire period).
+        If po==True, Series with multiindex ['peak', 'offpeak'] x ['w', 'p'] (power and
+        price, split between peak and offpeak intervals in the period.)
+
+    Notes
+    -----
+    If the index of `df` doesn't have a .duration attribute, all rows are assumed to be
+    of equal duration.
+    """
+
+    if not po:
+        try:
+            # Use magnitude only, so that, if w and p are float series, their return
+            # series are also floats (instead of dimensionless Quantities).
+            df["dur"] = df.index.duration.pint.m
+        except (AttributeError, ValueError):
+            df["dur"] = 1
+
+        # Get single power and price values.
+        p_hedge = (df.p * df.dur).sum() / df.dur.sum()
+        if how.lower().startswith("vol"):  # volume hedge
+            # solve for w_hedge: sum (w * duration) == w_hedge * sum (duration)
+            w_hedge = (df.w * df.dur).sum() / df.dur.sum()
+        else:  # value hedge
+            # solve for w_hedge: sum (w * duration * p) == w_hedge * sum (duration * p)
+            w_hedge = (df.w * df.dur * df.p).sum() / (df.dur * df.p).sum()
+        return pd.Series({"w": w_hedge, "p": p_hedge})
+    else:
+        apply_f = lambda df: hedge_product(df, how, po=False)  # noqa
+        s = df.groupby(peak_mask(df.index)).apply(apply_f)
+        return s.rename(index={True: "peak", False: "offpeak"}).stack()
+
+
+@pytest.mark.parametrize("tz", [None, "Europe/Berlin"])
+@pytest.mark.parametrize("freq", ["15T", "H", "D"])
+@pytest.mark.parametrize("aggfreq", ["D", "MS", "QS", "AS"])
+@pytest.mark.parametrize("how", ["vol", "val"])
+@pytest.mark.parametrize("po", [True, False])
+def test_hedge_sameasgroupby(tz, freq, aggfreq, how, po):
+    """Test if hedge gives same result as hedging each product individually."""
+    if po and (freq == "D" or aggfreq == "D"):
+        return  # Only decompose in peak and offpeak if hourly values and long products
+
+    i = pd.date_range("2020-01-01", "2021-07-01", freq=freq, tz=tz, inclusive="left")
+    w = pd.Series(np.random.rand(len(i)) * 10, i)
+    p = pd.Series(np.random.rand(len(i)) * 100 + 50, i)
+
+    result_w, result_p = hedge.hedge(w, p, how, aggfreq, po)
+
+    df = pd.DataFrame({"w": w, "p": p}).loc[result_w.index]  # only full products
+    keys = convert.group_keys(df.index, aggfreq, False)
+    expected = {"w": [], "p": []}
+    for _, df_product in df.groupby(keys):
+        vals = hedge_product(df_product.copy(), how, po)
+        if po:
+            ispeak = pd.Series(peak_mask(df_product.index), df_product.index)
+            for c in ["w", "p"]:
+                mapping = {True: vals.get(("peak", c)), False: vals.get(("offpeak", c))}
+                expected[c].append(ispeak.map(mapping).astype(float))
+        else:
+            for c in ["w", "p"]:
+                expected[c].append(pd.Series(vals[c], df_product.index))
+
+    for c, result in [("w", result_w), ("p", result_p)]:
+        expected_c = pd.concat(expected[c]).rename(c)
+        testing.assert_series_equal(result, expected_c, check_freq=False)
+
+
+@pytest.mark.parametrize("how", ["vol", "val"])
+def test_hedge_units(how):
+    """Test if hedge keeps units, and gives same values as without units."""
+    i = pd.date_range("2020", "2021", freq="H", tz="Europe/Berlin", inclusive="left")
+    w = pd.Series(np.random.rand(len(i)) * 10, i)
+    p = pd.Series(np.random.rand(len(i)) * 100 + 50, i)
+
+    expected_w, expected_p = hedge.hedge(w, p, how)
+    w, p = w.astype("pint[MW]"), p.astype("pint[Eur/MWh]")
+    result_w, result_p = hedge.hedge(w, p, how)
+
+    testing.assert_series_equal(result_w, expected_w.astype("pint[MW]"))
+    testing.assert_series_equal(result_p, expected_p.astype("pint[Eur/MWh]"))
+
+
+@pytest.mark.parametrize("freq", ["15T", "H", "D"])
+@pytest.mark.parametrize("aggfreq", ["D", "MS", "QS", "AS"])
+@pytest.mark.parametrize("how", ["vol", "val"])
+def test_hedge_dataframe(freq, aggfreq, how):
+    """Test if hedging all columns of a dataframe at once gives same result as hedging
+    each individually."""
+    i = pd.date_range("2020-01-01", "2021-07-01", freq=freq, tz="Europe/Berlin")
+    w = pd.DataFrame(np.random.rand(len(i), 3) * 10, i, ["A", "B", "C"])
+    w["B"] = w["B"].astype("pint[kW]")
+    p = pd.Series(np.random.rand(len(i)) * 100 + 50, i).astype("pint[Eur/MWh]")
+
+    result_w, result_p = hedge.hedge(w, p, how, aggfreq)
+
+    for name in w.columns:
+        expected_w, expected_p = hedge.hedge(w[name], p, how, aggfreq)
+        testing.assert_series_equal(result_w[name], expected_w.rename(name))
+        testing.assert_series_equal(result_p, expected_p)
@@ -1,7 +1,9 @@
 import datetime as dt
 from portfolyo.tools import nits
 from portfolyo.prices import utils
+from portfolyo.prices.peakcalendar import PeakCalendar
 import pandas as pd
+import numpy as np
 import pytest
 
 # TODO: where are the hedge and conversion tests?? --> check git history
@@ -41,6 +43,47 @@ def test_is_peak_hour(value, tz, ispeak):
     assert utils.is_peak_hour(ts) == ispeak
 
 
+@pytest.mark.parametrize("tz", [None, "Europe/Berlin"])
+@pytest.mark.parametrize("freq", ["15T", "H", "D"])
+def test_is_peak_hour_index(tz, freq):
+    """Test if vectorized calculation gives same result as calculation per timestamp."""
+    i = pd.date_range("2020-03-20", "2020-11-10", freq=freq, tz=tz, inclusive="left")
+    result = utils.is_peak_hour(i)
+    expected = pd.Series([utils.is_peak_hour(ts) for ts in i], i)
+    pd.testing.assert_series_equal(result, expected, check_names=False)
+
+
+@pytest.mark.parametrize("tz", [None, "Europe/Berlin"])
+def test_is_peak_hour_calendar(tz):
+    """Test if custom peak definitions are respected."""
+    calendar = PeakCalendar(9, 17, weekdays=(0, 1, 2, 3, 4, 5), holidays=["2020-01-06"])
+    i = pd.date_range("2020-01-04", "2020-01-08", freq="H", tz=tz, inclusive="left")
+    result = utils.is_peak_hour(i, calendar)
+    expected = (i.hour >= 9) & (i.hour < 17) & (i.day != 5) & (i.day != 6)
+    np.testing.assert_array_equal(result.values, expected)
+    for ts, ispeak in result.items():
+        assert utils.is_peak_hour(ts, calendar) == ispeak
+
+
+def test_is_peak_hour_writeable():
+    """Test if the returned series can be changed without affecting later results."""
+    i = pd.date_range("2020-01-06", freq="H", periods=48)
+    result = utils.is_peak_hour(i)
+    result.iloc[10] = False
+    assert utils.is_peak_hour(i).iloc[10]
+
+
+@pytest.mark.parametrize("freq", ["D", "MS", "QS", "AS"])
+def test_duration_peak_calendar(freq):
+    """Test if holidays are excluded from the peak duration."""
+    calendar = PeakCalendar(holidays=["2020-01-01", "2020-12-25", "2020-12-26"])
+    i = pd.date_range("2020", freq=freq, periods=3, tz="Europe/Berlin")
+    result = utils.duration_peak(i, freq, calendar).pint.m
+    expected = utils.duration_peak(i, freq).pint.m
+    expected.iloc[0] -= 24 if freq == "AS" else 12  # 2020-12-26 is a saturday
+    pd.testing.assert_series_equal(result, expected)
+
+
 @pytest.mark.parametrize(("tz", "mar_b_corr"), [(None, 0), ("Europe/Berlin", -1)])
 @pytest.mark.parametrize("month", [1, 2, 3])
 @pytest.mark.parametrize("freq", ["D", "MS", "QS", "AS"])
@@ -2,12 +2,14 @@
 
 from ..tools import stamps
 from ..tools.nits import Q_
+from .peakcalendar import PeakCalendar, DEFAULT_CALENDAR, peak_mask, peak_duration
 from typing import Tuple, Union
 import pandas as pd
 
 
 def is_peak_hour(
-    ts_left: Union[pd.Timestamp, pd.DatetimeIndex]
+    ts_left: Union[pd.Timestamp, pd.DatetimeIndex],
+    calendar: PeakCalendar = DEFAULT_CALENDAR,
 ) -> Union[bool, pd.Series]:
     """
     Boolean value indicating if a timestamp is in a peak period or not.
@@ -16,6 +18,8 @@ def is_peak_hour(
     ----------
     ts_left : Union[pd.Timestamp, pd.DatetimeIndex]
         Timestamp(s) for which to calculate if it falls in a peak period.
+    calendar : PeakCalendar, optional (default: Monday-Friday 08:00-20:00)
+        Definition of the peak periods.
 
     More precisely: if timestamp lies in one of the (left-closed) time intervals that
     define the peak hour periods.
@@ -25,18 +29,24 @@ def is_peak_hour(
     bool (if ts_left is Timestamp) or Series (if ts_left is DatetimeIndex).
     """
     if isinstance(ts_left, pd.DatetimeIndex):
-        ispeak = [is_peak_hour(ts) for ts in ts_left]
-        return pd.Series(ispeak, ts_left).rename("is_peak_hour")
+        mask = peak_mask(ts_left, calendar).copy()  # cached mask is read-only
+        return pd.Series(mask, ts_left, name="is_peak_hour")
 
     # Assume it's a single timestamp.
-    return ts_left.hour >= 8 and ts_left.hour < 20 and ts_left.isoweekday() < 6
+    return (
+        calendar.start <= ts_left.hour < calendar.end
+        and ts_left.weekday() in calendar.weekdays
+        and ts_left.date() not in calendar.holidays
+    )
 
 
 duration_base = stamps.duration
 
 
 def duration_peak(
-    ts_left: Union[pd.Timestamp, pd.DatetimeIndex], freq: str = None
+    ts_left: Union[pd.Timestamp, pd.DatetimeIndex],
+    freq: str = None,
+    calendar: PeakCalendar = DEFAULT_CALENDAR,
 ) -> Union[Q_, pd.Series]:
     """
     Total duration of peak periods in a timestamp.
@@ -54,29 +64,18 @@ def duration_peak(
         )
 
     if isinstance(ts_left, pd.DatetimeIndex):
-        if freq in ["15T", "H"]:
-            return stamps.duration(ts_left, freq) * is_peak_hour(ts_left)
-        elif freq == "D":
-            hours = ts_left.map(lambda ts: ts.isoweekday() < 6) * 12  # no unit
-            return pd.Series(hours, ts_left, dtype="pint[h]")  # works even during dst
-        else:
-            # dur = ts_left.map(duration_peak)  # crashes due to behaviour of .map method
-            hours = (duration_peak(ts, freq) for ts in ts_left)  # has unit
-            return pd.Series(hours, ts_left, dtype="pint[h]")
+        hours = peak_duration(ts_left, freq, calendar)
+        return pd.Series(hours, ts_left, dtype="pint[h]")  # works even during dst
 
     # Assume it's a single timestamp.
-    if freq in ["15T", "H"]:
-        return stamps.duration(ts_left, freq) * is_peak_hour(ts_left)
-    elif freq == "D":
-        return Q_(0 if ts_left.isoweekday() >= 6 else 12, "h")
-    else:
-        ts_right = stamps.ts_right(ts_left, freq)
-        days = pd.date_range(ts_left, ts_right, freq="D", inclusive="left")
-        return Q_(sum(days.map(lambda day: day.isoweekday() < 6) * 12), "h")
+    hours = peak_duration(pd.DatetimeIndex([ts_left]), freq, calendar)[0]
+    return Q_(hours, "h")
 
 
 def duration_offpeak(
-    ts_left: Union[pd.Timestamp, pd.DatetimeIndex], freq: str = None
+    ts_left: Union[pd.Timestamp, pd.DatetimeIndex],
+    freq: str = None,
+    calendar: PeakCalendar = DEFAULT_CALENDAR,
 ) -> Union[Q_, pd.Series]:
     """
     Total duration of offpeak periods in a timestamp.
@@ -85,11 +84,13 @@ def duration_offpeak(
     --------
     .tools.stamps.duration
     """
-    return duration_base(ts_left, freq) - duration_peak(ts_left, freq)
+    return duration_base(ts_left, freq) - duration_peak(ts_left, freq, calendar)
 
 
 def duration_bpo(
-    ts_left: Union[pd.Timestamp, pd.DatetimeIndex], freq: str = None
+    ts_left: Union[pd.Timestamp, pd.DatetimeIndex],
+    freq: str = None,
+    calendar: PeakCalendar = DEFAULT_CALENDAR,
 ) -> Union[pd.Series, pd.DataFrame]:
     """
     Duration of base, peak and offpeak periods in a timestamp.
@@ -102,13 +103,15 @@ def duration_bpo(
         'AS' (year)}, optional
         Frequency to use in determining the durations.
         If none specified, use ``.freq`` attribute of ``ts_left``.
+    calendar : PeakCalendar, optional (default: Monday-Friday 08:00-20:00)
+        Definition of the peak periods.
 
     Returns
     -------
     Series (if ts_left is Timestamp) or DataFrame (if ts_left is DatetimeIndex).
     """
     b = duration_base(ts_left, freq)  # quantity or pint-series
-    p = duration_peak(ts_left, freq)  # quantity or pint-series
+    p = duration_peak(ts_left, freq, calendar)  # quantity or pint-series
 
     if isinstance(ts_left, pd.DatetimeIndex):
         return pd.DataFrame({"base": b, "peak": p, "offpeak": b - p}, dtype="pint[h]")
@@ -0,0 +1,167 @@
+"""Tables with the daylight-saving-time transitions of a timezone, to convert between
+universal and local (i.e., wall clock) time in bulk."""
+
+from collections import namedtuple
+from typing import Optional
+import datetime as dt
+import functools
+import pytz
+import pandas as pd
+import numpy as np
+
+
+TransitionTable = namedtuple("TransitionTable", ["utc", "offset"])
+TransitionTable.__doc__ = """UTC-offsets of a timezone.
+
+utc : np.ndarray
+    Sorted int64 array with the moments (ns since epoch, universal time) at which the
+    UTC-offset changes. The first value is a sentinel that lies before all timestamps.
+offset : np.ndarray
+    int64 array with the UTC-offset (ns) that applies from each moment onwards.
+"""
+
+_SENTINEL = np.iinfo(np.int64).min // 2  # allows adding an offset without overflow
+_NS_PER_S = 1_000_000_000
+
+
+def table(tz: dt.tzinfo, start_year: int, end_year: int) -> Optional[TransitionTable]:
+    """Transitions of a timezone in a range of years.
+
+    Parameters
+    ----------
+    tz : dt.tzinfo
+        Timezone, e.g. ``pd.DatetimeIndex.tz``.
+    start_year, end_year : int
+        First and last year (inclusive) for which the transitions are needed.
+
+    Returns
+    -------
+    TransitionTable
+        Read-only arrays. None if the transitions of the timezone cannot be determined
+        (i.e., if it is not a pytz or fixed-offset timezone).
+
+    Notes
+    -----
+    The most recently used tables are cached.
+    """
+    if isinstance(tz, pytz.BaseTzInfo) and tz.zone is not None:
+        key = tz.zone
+    elif (offset := tz.utcoffset(None)) is not None:
+        key = offset  # fixed-offset timezone (e.g. ``datetime.timezone``)
+    else:
+        return None
+    return _table(key, start_year, end_year)
+
+
+@functools.lru_cache(maxsize=64)
+def _table(key, start_year: int, end_year: int) -> TransitionTable:
+    if isinstance(key, dt.timedelta):
+        utc, offset = np.array([_SENTINEL]), np.array([_ns(key)])
+    else:
+        tz = pytz.timezone(key)
+        if not hasattr(tz, "_utc_transition_times"):  # no DST (e.g. UTC)
+            utc, offset = np.array([_SENTINEL]), np.array([_ns(tz.utcoffset(None))])
+        else:
+            moments = pd.DatetimeIndex(tz._utc_transition_times[1:]).asi8
+            offsets = np.array([_ns(info[0]) for info in tz._transition_info])
+            # Keep the transitions in the range, and the offset that applies before.
+            lo = pd.Timestamp(year=start_year - 1, month=12, day=30).value
+            hi = pd.Timestamp(year=end_year + 1, month=1, day=3).value
+            first = np.searchsorted(moments, lo, "right")
+            last = np.searchsorted(moments, hi, "right")
+            utc = np.concatenate([[_SENTINEL], moments[first:last]])
+            stop = last + 1  # one offset more than transitions: the one before first
+            offset = offsets[first:stop]
+    for a in (utc, offset):
+        a.flags.writeable = False
+    return TransitionTable(utc, offset)
+
+
+def _ns(offset: dt.timedelta) -> int:
+    return (offset.days * 86400 + offset.seconds) * _NS_PER_S
+
+
+def _table_for(tz: dt.tzinfo, values: np.ndarray) -> Optional[TransitionTable]:
+    """Table with the transitions in the years spanned by int64 ``values`` (ns)."""
+    years = values[[0, -1]].view("datetime64[ns]").astype("datetime64[Y]").astype(int)
+    start, end = np.sort(years + 1970)  # values are not necessarily sorted
+    return table(tz, int(start) - 1, int(end) + 1)
+
+
+def to_wall(i: pd.DatetimeIndex) -> np.ndarray:
+    """Local (i.e., wall clock) time of each timestamp in a tz-aware index.
+
+    Parameters
+    ----------
+    i : pd.DatetimeIndex
+        Timezone-aware index.
+
+    Returns
+    -------
+    np.ndarray
+        datetime64[ns] array.
+    """
+    if len(i) == 0 or (tt := _table_for(i.tz, i.asi8)) is None:
+        return i.tz_localize(None).values
+    utc = i.asi8
+    if len(tt.utc) == 1:
+        return (utc + tt.offset[0]).view("datetime64[ns]")
+    offset = tt.offset[np.searchsorted(tt.utc, utc, "right") - 1]
+    return (utc + offset).view("datetime64[ns]")
+
+
+def to_utc(wall: np.ndarray, tz: dt.tzinfo, ambiguous: str = "raise") -> np.ndarray:
+    """Universal time of local (i.e., wall clock) times in a timezone.
+
+    Parameters
+    ----------
+    wall : np.ndarray
+        datetime64[ns] array with local times.
+    tz : dt.tzinfo
+        Timezone of the local times.
+    ambiguous : {'raise', 'first', 'last'}, optional (default: 'raise')
+        What to do with local times that occur twice (at the end of DST): raise an
+        AmbiguousTimeError, or use their first or last occurrence.
+
+    Returns
+    -------
+    np.ndarray
+        int64 array with the moments (ns since epoch) in universal time.
+
+    Notes
+    -----
+    Local times that do not exist (at the start of DST) raise a NonExistentTimeError.
+    """
+    wall = np.asarray(wall, "datetime64[ns]").view("int64")
+    if len(wall) == 0 or (tt := _table_for(tz, wall)) is None:
+        localized = pd.DatetimeIndex(wall.view("datetime64[ns]"))
+        if ambiguous != "raise":
+            ambiguous = np.full(len(wall), ambiguous == "first")
+        return localized.tz_localize(tz, ambiguous=ambiguous).asi8
+    if len(tt.utc) == 1:
+        return wall - tt.offset[0]
+
+    # Local time at which each transition happens, as seen from before and after it.
+    before = tt.utc[1:] + tt.offset[:-1]
+    after = tt.utc[1:] + tt.offset[1:]
+    k_first = np.searchsorted(before, wall, "right")  # last transition before...
+    k_last = np.searchsorted(after, wall, "right")  # ...first/last occurrence
+    utc_first = wall - tt.offset[k_first]
+    utc_last = wall - tt.offset[k_last]
+
+    if (k_first != k_last).any():
+        # Before the first occurrence, but after the last one: time does not exist.
+        if (nonexistent := k_first > k_last).any():
+            raise pytz.NonExistentTimeError(pd.Timestamp(wall[nonexistent][0]))
+        if ambiguous == "raise":
+            ts = pd.Timestamp(wall[k_first != k_last][0])
+            raise pytz.AmbiguousTimeError(
+                f"Cannot infer dst time from {ts}, try using the 'ambiguous' argument"
+            )
+    return utc_first if ambiguous != "last" else utc_last
+
+
+def localize(wall: np.ndarray, tz: dt.tzinfo, ambiguous: str = "raise", name=None):
+    """Timezone-aware index from local (i.e., wall clock) times. See ``to_utc``."""
+    i = pd.DatetimeIndex(to_utc(wall, tz, ambiguous), tz="UTC", name=name)
+    return i.tz_convert(tz)
@@ -9,6 +9,8 @@ from typing import Iterable, Any, Union
 import pandas as pd
 import numpy as np
 import functools
+import pytz
+import warnings
 
 
 def standardize(
@@ -20,6 +22,7 @@ def standardize(
     floating: bool = True,
     index_col: str = None,
     force_freq: str = None,
+    copy: bool = True,
 ) -> NDFrame:
     """Standardize a series or dataframe.
 
@@ -45,6 +48,10 @@ def standardize(
     force_freq : str, optional
         If a frequency cannot be inferred from the data (e.g. due to gaps), it is
         resampled at this frequency. Default: raise Exception.
+    copy : bool, optional (default: True)
+        If False, the data is only copied where it must be changed. If ``fr`` is already
+        standardized, its data is not copied at all; the returned frame shares it, but
+        may be a new object (e.g. if the index name must be set).
 
     Returns
     -------
@@ -63,14 +70,19 @@ def standardize(
     ``portfolyo.force_tzaware``
     ``portfolyo.force_tzagnostic``
     """
-    kwargs = {"tz": tz, "floating": floating, "force_freq": force_freq}
+    kwargs = {"tz": tz, "floating": floating, "force_freq": force_freq, "copy": False}
 
     # Set index.
     if index_col and isinstance(fr, pd.DataFrame):
         fr = fr.set_index(index_col)
     else:
-        fr = fr.copy()  # don't change passed-in fr
-    fr.index = pd.DatetimeIndex(fr.index)  # turn / try to turn into datetime
+        if bound == "left" and _is_standardized(fr, force, tz, force_freq):
+            fr = fr.copy() if copy else fr
+            return _with_name(fr, "ts_left")  # quick path: only name may be missing
+        if copy:
+            fr = fr.copy()  # don't change passed-in fr; only copy needed
+    if not isinstance(fr.index, pd.DatetimeIndex):
+        fr = fr.set_axis(pd.DatetimeIndex(fr.index), copy=False)  # turn into datetime
 
     # We want to cover 2 additional cases for convenience sake:
     # a. The user passes a frame that still needs to be localized (--> freq unknown)
@@ -78,7 +90,7 @@ def standardize(
 
     # Make sure it has a frequency, i.e., make sure it is tz-aware or tz-agnostic.
     # Pipeline if frequency not yet found: right -> left -> localize -> tz-aware -> freq
-    fr = set_frequency(fr)
+    fr = set_frequency(fr, copy=False)
     freq_input, tz_input = fr.index.freq, fr.index.tz
 
     # The data may be right-bound.
@@ -86,7 +98,7 @@ def standardize(
     if bound == "right":  # right -> left
         for how in ["A", "B"]:
             try:
-                fr_left = fr.set_axis(stamps.right_to_left(fr.index, how))
+                fr_left = fr.set_axis(stamps.right_to_left(fr.index, how), copy=False)
                 return standardize(fr_left, force, "left", **kwargs)
             except ValueError as e:
                 if how == "B":
@@ -98,7 +110,7 @@ def standardize(
 
     if not freq_input and not tz_input and tz:  # left -> tz-aware (try)
         try:
-            fr_aware = fr.tz_localize(tz, ambiguous="infer")
+            fr_aware = fr.tz_localize(tz, ambiguous="infer", copy=False)
         except (AmbiguousTimeError, NonExistentTimeError):
             pass  # fr did not need / cound not be localized. Continue with fr as-is.
         else:
@@ -110,7 +122,8 @@ def standardize(
     if (not freq_input) and force_freq:
         # No freq has been found, but user specifies which freq it should be.
         fr_withfreq = fr.asfreq(force_freq)
-        return standardize(fr_withfreq, force, "left", tz=tz, floating=floating)
+        kwargs.pop("force_freq")
+        return standardize(fr_withfreq, force, "left", **kwargs)
 
     elif (not freq_input) and (not force_freq):
         # No freq has been bound, and user specifies no freq either.
@@ -133,9 +146,9 @@ def standardize(
 
     # Fix timezone.
     if force == "aware":
-        fr = zones.force_tzaware(fr, tz, floating=floating)
+        fr = zones.force_tzaware(fr, tz, floating=floating, copy=False)
     elif force == "agnostic" or force == "naive":
-        fr = zones.force_tzagnostic(fr)
+        fr = zones.force_tzagnostic(fr, copy=False)
     elif force is None:  # don't try to fix timezone.
         pass
     else:
@@ -143,10 +156,39 @@ def standardize(
             f"Parameter ``force`` must be one of 'aware', 'agnostic'; got {force}."
         )
 
-    # Standardize index name.
-    fr.index.name = "ts_left"
     # After standardizing timezone, the frequency should have been set.
-    return set_frequency(fr, freq_input, strict=force_freq)
+    fr = set_frequency(fr, freq_input, strict=force_freq, copy=False)
+    # Standardize index name.
+    return _with_name(fr, "ts_left")
+
+
+def _is_standardized(fr: NDFrame, force: str, tz: str, force_freq: str) -> bool:
+    """Quick check if standardizing a left-bound frame only needs to set the index name,
+    i.e., if its index has a valid frequency and the wanted timezone."""
+    i = fr.index
+    if not isinstance(i, pd.DatetimeIndex) or not i.freq or len(i) == 0:
+        return False
+    if i.freq not in stamps.FREQUENCIES or (force_freq and force_freq != i.freq):
+        return False
+    if force is None:
+        return True
+    if force == "aware":
+        if not tz or i.tz != (pytz.timezone(tz) if isinstance(tz, str) else tz):
+            return False
+    elif force not in ["agnostic", "naive"] or i.tz is not None:
+        return False
+    try:
+        stamps.assert_boundary_ts(i, i.freq)  # cached for this index
+    except AssertionError:
+        return False
+    return True
+
+
+def _with_name(fr: NDFrame, name: str) -> NDFrame:
+    """Frame with index name set, without changing ``fr`` or copying its data."""
+    if fr.index.name == name:
+        return fr
+    return fr.set_axis(fr.index.rename(name), copy=False)
 
 
 def assert_standardized(fr: NDFrame):
@@ -167,7 +209,9 @@ def assert_standardized(fr: NDFrame):
         ) from e
 
 
-def set_frequency(fr: NDFrame, wanted: str = None, strict: bool = False) -> NDFrame:
+def set_frequency(
+    fr: NDFrame, wanted: str = None, strict: bool = False, *, copy: bool = True
+) -> NDFrame:
     """Try to read, infer, and force frequency of frame's index.
 
     Parameters
@@ -178,6 +222,9 @@ def set_frequency(fr: NDFrame, wanted: str = None, strict: bool = False) -> NDFr
         Frequency to set. If none provided, try to infer.
     strict : bool, optional (default: False)
         If True, raise ValueError if a valid frequency is not found.
+    copy : bool, optional (default: True)
+        If False, the returned frame shares its data with ``fr``, and is ``fr`` itself
+        if its index already has a valid frequency.
 
     Returns
     -------
@@ -194,33 +241,54 @@ def set_frequency(fr: NDFrame, wanted: str = None, strict: bool = False) -> NDFr
             return fr
 
     # Find frequency.
-    fr = fr.copy()
-    if fr.index.freq:
-        pass
+    i = fr.index
+    if i.freq:
+        freq = i.freq
     elif wanted:
-        fr.index.freq = wanted
+        freq = _with_freq(i, wanted).freq  # raises if values don't fit
     else:
         try:
-            fr.index.freq = pd.infer_freq(fr.index)
+            freq = stamps.infer_frequency(i)
         except ValueError:
-            pass  # couldn't find one, e.g. because not enough values
+            freq = None  # couldn't find one, e.g. because not enough values
 
     # Correct if necessary.
-    freq = fr.index.freq
     if not freq and strict:  # No frequency found.
         raise ValueError("The data does not seem to have a regular frequency.")
     elif freq and freq not in stamps.FREQUENCIES:
         # Edge case: year-/quarterly but starting != Jan.
         if stamps.freq_up_or_down(freq, "AS") == 0:
-            fr.index.freq = "AS"  # will likely fail
+            freq = _with_freq(i, "AS").freq  # will likely fail
         elif stamps.freq_up_or_down(freq, "QS") == 0:
-            fr.index.freq = "QS"  # will only succeed if QS-APR, QS-JUL or QS-OCT
+            freq = _with_freq(i, "QS").freq  # will only succeed if QS-APR/-JUL/-OCT
         elif strict:
             raise ValueError(
                 "The data has a non-allowed frequency. Must be one of "
                 f"{', '.join(stamps.FREQUENCIES)}; found '{freq}'."
             )
-    return fr
+
+    # Set frequency on (a new) index; the data is shared.
+    if freq != i.freq:
+        fr = fr.set_axis(_with_freq(i, freq), copy=False)
+    return fr.copy() if copy else fr
+
+
+def _with_freq(i: pd.DatetimeIndex, freq) -> pd.DatetimeIndex:
+    """Index with frequency set; ``i`` is not changed. Raise ValueError if the values do
+    not conform to the frequency."""
+    if freq is None or i.freq is not None or len(i) == 0:
+        return pd.DatetimeIndex(i, freq=freq)
+    # Quicker than letting pandas validate the frequency (which first infers it).
+    try:
+        expected = pd.date_range(i[0], periods=len(i), freq=freq, name=i.name)
+        if not np.array_equal(expected.asi8, i.asi8):
+            raise ValueError
+    except ValueError as e:
+        raise ValueError(
+            f"Inferred frequency {i.inferred_freq} from passed values does not conform "
+            f"to passed frequency {freq}"
+        ) from e
+    return expected
 
 
 def fill_gaps(fr: NDFrame, maxgap: int = 2) -> NDFrame:
@@ -238,34 +306,60 @@ def fill_gaps(fr: NDFrame, maxgap: int = 2) -> NDFrame:
     pd.Series or pd.DataFrame
         with gaps filled up.
     """
-    if isinstance(fr, pd.DataFrame):
-        return pd.DataFrame({c: fill_gaps(s, maxgap) for c, s in fr.items()})
-
-    is_gap = fr.isna()
-    next_gap = is_gap.shift(-1)
-    prev_gap = is_gap.shift(1)
-    index_beforegap = fr[~is_gap & next_gap].index
-    index_aftergap = fr[~is_gap & prev_gap].index
-    # remove orphans at beginning and end
-    if index_beforegap.empty:
+    if isinstance(fr, pd.Series):
+        df = pd.DataFrame({"_": fr})
+        filled = fill_gaps(df, maxgap)
+        return fr if filled is df else filled.iloc[:, 0].rename(fr.name)
+
+    # Only columns with floats (with or without units) can have gaps.
+    cols = [c for c, d in enumerate(fr.dtypes) if _is_float_or_pint(d)]
+    if not cols or maxgap < 1:
+        return fr
+    values = np.column_stack([_magnitudes(fr.iloc[:, c]) for c in cols])
+    is_gap = np.isnan(values)
+    if not is_gap.any():
         return fr
-    elif index_beforegap[-1] > index_aftergap[-1]:
-        index_beforegap = index_beforegap[:-1]
-    if index_aftergap.empty:
+
+    # For each row: last row before it, and first row after it, that has a value.
+    # (-1 and n if there is none.)
+    n = len(values)
+    rows = np.arange(n)[:, np.newaxis]
+    before = np.maximum.accumulate(np.where(is_gap, -1, rows), axis=0)
+    after = np.minimum.accumulate(np.where(is_gap, n, rows)[::-1], axis=0)[::-1]
+    # Fill gaps that are enclosed by values, and not too long.
+    to_fill = is_gap & (before >= 0) & (after < n) & (after - before - 1 <= maxgap)
+    if not to_fill.any():
         return fr
-    elif index_aftergap[0] < index_beforegap[0]:
-        index_aftergap = index_aftergap[1:]
+
+    # Linear interpolation between the values before and after, using index distance.
+    r, c = np.nonzero(to_fill)
+    r0, r1 = before[r, c], after[r, c]
+    x = _positions(fr.index)
+    y0, y1 = values[r0, c], values[r1, c]
+    values[r, c] = y0 + (x[r] - x[r0]) / (x[r1] - x[r0]) * (y1 - y0)
+
     fr = fr.copy()
-    for i_before, i_after in zip(index_beforegap, index_aftergap):
-        section = fr.loc[i_before:i_after]
-        if len(section) > maxgap + 2:
-            continue
-        x0, y0, x1, y1 = i_before, fr[i_before], i_after, fr[i_after]
-        dx, dy = x1 - x0, y1 - y0
-        fr.loc[i_before:i_after] = y0 + (section.index - x0) / dx * dy
+    for j, c in enumerate(cols):
+        fr.isetitem(c, pd.Series(values[:, j], fr.index).astype(fr.dtypes.iloc[c]))
     return fr
 
 
+def _is_float_or_pint(dtype) -> bool:
+    return hasattr(dtype, "units") or pd.api.types.is_float_dtype(dtype)
+
+
+def _magnitudes(s: pd.Series) -> np.ndarray:
+    """Float values of series, without units."""
+    return (s.pint.m if hasattr(s.dtype, "units") else s).to_numpy(float)
+
+
+def _positions(i: pd.Index) -> np.ndarray:
+    """Position of the index values on a numeric axis."""
+    if isinstance(i, pd.DatetimeIndex):
+        return (i.asi8 - i.asi8[0]).astype(float)
+    return i.to_numpy(float)
+
+
 def add_header(df: pd.DataFrame, header: Any, axis: int = 1) -> pd.DataFrame:
     """Add additional (top-)level to dataframe axis (column or index).
 
@@ -457,6 +551,11 @@ def _wavg_df(
     -----
     Will raise error if axis == 1 and columns have distinct unit-dimensions.
     """
+    # Quick path: all values (and weights) as one float array.
+    result = _wavg_block(df, weights, axis)
+    if result is not None:
+        return result
+
     # Prep: orient so that we can always average over rows.
     if axis == 1:
         df = df.T
@@ -480,6 +579,94 @@ def _wavg_df(
     return result
 
 
+def _wavg_block(
+    df: pd.DataFrame,
+    weights: Union[Iterable, pd.Series, pd.DataFrame] = None,
+    axis: int = 0,
+) -> Union[pd.Series, None]:
+    """Weighted average of dataframe, calculated on a 2D float array in one operation.
+    See ``_wavg_df``. Returns None if not possible for these values and weights, e.g.
+    if the weights do not have the same labels as the values."""
+    if axis not in [0, 1] or df.empty:
+        return None
+
+    # Values.
+    units = [getattr(d, "units", None) for d in df.dtypes]
+    numeric = [pd.api.types.is_numeric_dtype(d) for d in df.dtypes]
+    if not all(u is not None or isnum for u, isnum in zip(units, numeric)):
+        return None
+    if any(u is None for u in units) and any(u is not None for u in units):
+        return None  # mix of values with and without units
+    factors = np.ones(len(units))
+    if axis == 1 and units[0] is not None:
+        try:  # express all values in same unit
+            factors = np.array([nits.Q_(1.0, u).to(units[0]).m for u in units])
+        except DimensionalityError:
+            return None
+        units = [units[0]]
+    values = np.column_stack([_magnitudes(s) for _, s in df.items()]) * factors
+
+    # Unweighted average if no weights provided.
+    if weights is None:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)  # all-nan slices
+            result = np.nanmean(values, axis=axis)
+        return _wavg_result(result, df, units, axis)
+
+    # Weights; same shape as values, or 1D along the axis that is averaged over.
+    labels = df.axes[axis]
+    if isinstance(weights, pd.DataFrame):
+        if weights.shape != df.shape:
+            return None
+        if not (weights.index.is_unique and weights.columns.is_unique):
+            return None
+        rows = weights.index.get_indexer(df.index)
+        cols = weights.columns.get_indexer(df.columns)
+        if (rows == -1).any() or (cols == -1).any():
+            return None
+        w = np.column_stack([_magnitudes(weights.iloc[:, c]) for c in cols])[rows]
+    elif isinstance(weights, pd.Series):
+        if not weights.index.is_unique or len(weights) != len(labels):
+            return None
+        positions = weights.index.get_indexer(labels)
+        if (positions == -1).any():
+            return None
+        w = _magnitudes(weights)[positions]
+    else:
+        w = np.asarray(weights, float)
+        if w.shape != (len(labels),):
+            return None
+    if w.ndim == 1:
+        w = w[:, np.newaxis] if axis == 0 else w[np.newaxis, :]
+
+    total = np.nansum(w, axis=axis, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = (values * (w / total)).sum(axis=axis)
+    # Special case: if total weight is 0, but all values are identical, return this.
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-nan slices
+        identical = np.nanmin(values, axis=axis) == np.nanmax(values, axis=axis)
+    use_first = np.isclose(total, 0).squeeze(axis=axis) & identical
+    if use_first.any():
+        first = values[0, :] if axis == 0 else values[:, 0]
+        result = np.where(use_first, first, result)
+    return _wavg_result(result, df, units, axis)
+
+
+def _wavg_result(result: np.ndarray, df: pd.DataFrame, units: list, axis: int):
+    """Series with weighted averages, with units reattached."""
+    index = df.columns if axis == 0 else df.index
+    if units[0] is None:
+        return pd.Series(result, index)
+    if all(u == units[0] for u in units):
+        return pd.Series(result, index, dtype=f"pint[{units[0]}]")
+    try:  # express in same unit, if possible
+        factors = np.array([nits.Q_(1.0, u).to(units[0]).m for u in units])
+        return pd.Series(result * factors, index, dtype=f"pint[{units[0]}]")
+    except DimensionalityError:
+        return pd.Series([nits.Q_(r, u) for r, u in zip(result, units)], index)
+
+
 # TODO: move to testing folder
 @functools.wraps(np.allclose)
 def series_allclose(s1, s2, *args, **kwargs):
@@ -0,0 +1,97 @@
+"""Cache for values that are derived from a DatetimeIndex, such as durations, right-bound
+timestamps or peak hours. These are needed many times for the same few indices."""
+
+from collections import OrderedDict, namedtuple
+from typing import Any, Callable, Hashable, Optional, Tuple
+import pandas as pd
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+_maxsize = 128
+_entries = OrderedDict()  # fingerprint -> dict with derived values of that index
+_hits = _misses = 0
+
+
+def fingerprint(i: pd.DatetimeIndex) -> Optional[Tuple]:
+    """Key that uniquely identifies an index without looking at all its values.
+
+    Parameters
+    ----------
+    i : pd.DatetimeIndex
+
+    Returns
+    -------
+    Tuple
+        (start, freq, tz, length) of the index. None if index has no frequency (in which
+        case its values are not fully determined by these attributes).
+    """
+    if i.freq is None or len(i) == 0:
+        return None
+    return (i.asi8[0], i.freq, i.tz, len(i))
+
+
+def get(i: pd.DatetimeIndex, key: Hashable, calculate: Callable[[], Any]) -> Any:
+    """Get derived value of index from cache, or calculate (and store) it if not found.
+
+    Parameters
+    ----------
+    i : pd.DatetimeIndex
+        Index from which value is derived.
+    key : Hashable
+        Identifies the derived value, e.g. ``("duration", "MS")``.
+    calculate : Callable[[], Any]
+        Function that calculates the value, called without arguments on a cache miss.
+
+    Returns
+    -------
+    Any
+        The derived value. Must be treated as read-only by the caller.
+    """
+    global _hits, _misses
+
+    fp = fingerprint(i)
+    if fp is None or _maxsize == 0:
+        _misses += 1
+        return calculate()
+
+    entry = _entries.get(fp)
+    if entry is not None and key in entry:
+        _hits += 1
+        _entries.move_to_end(fp)
+        return entry[key]
+
+    _misses += 1
+    value = calculate()
+    if entry is None:
+        entry = _entries[fp] = {}
+        while len(_entries) > _maxsize:
+            _entries.popitem(last=False)  # remove least recently used
+    else:
+        _entries.move_to_end(fp)
+    entry[key] = value
+    return value
+
+
+def cache_info() -> CacheInfo:
+    """Statistics of the cache: hits, misses, maximum number of indices (maxsize), and
+    current number of indices (currsize)."""
+    return CacheInfo(_hits, _misses, _maxsize, len(_entries))
+
+
+def cache_clear() -> None:
+    """Remove all values from the cache and reset the statistics."""
+    global _hits, _misses
+    _entries.clear()
+    _hits = _misses = 0
+
+
+def set_maxsize(maxsize: int) -> None:
+    """Set the maximum number of indices for which values are kept. The least recently
+    used indices are discarded first. Use 0 to disable caching."""
+    global _maxsize
+    if maxsize < 0:
+        raise ValueError(f"Parameter ``maxsize`` must be 0 or larger; got {maxsize}.")
+    _maxsize = maxsize
+    while len(_entries) > _maxsize:
+        _entries.popitem(last=False)
@@ -2,9 +2,10 @@
 Module for doing basic timestamp and frequency operations.
 """
 
+from . import dst, indexcache
 from .nits import Q_
 
-from typing import Any, Union, Tuple
+from typing import Any, Optional, Union, Tuple
 from pytz import AmbiguousTimeError
 import pandas as pd
 import numpy as np
@@ -48,6 +49,83 @@ def guess_frequency(tdelta: pd.Timedelta) -> str:
         )
 
 
+_NS_PER_H = 3_600_000_000_000
+_STEPS = {900_000_000_000: "15T", _NS_PER_H: "H"}  # fixed duration in universal time
+_BUSINESSHOUR_STEPS = [17 * _NS_PER_H, 65 * _NS_PER_H]  # (besides 1h) overnight/weekend
+_SAMPLESIZE = 100  # number of timestamps at start and at end of index that are sampled
+
+
+def infer_frequency(i: pd.DatetimeIndex) -> Union[str, None]:
+    """Infer the frequency of an index. Same result as ``pd.infer_freq``, but faster for
+    long indices.
+
+    Parameters
+    ----------
+    i : pd.DatetimeIndex
+        Index of which to infer the frequency.
+
+    Returns
+    -------
+    str
+        Frequency; None if no frequency could be inferred.
+
+    Notes
+    -----
+    A candidate frequency ('15T', 'H' or 'D') is found from the first timestamps. It is
+    checked on a sample (the start and end of the index and, if it is tz-aware, around
+    its DST-transitions), and then for all timestamps at once. The full analysis by
+    ``pd.infer_freq`` is only done for short indices, for other candidates, or if the
+    result is not clear from the irregular timestamps that were found.
+    """
+    if len(i) < 10 * _SAMPLESIZE or i.hasnans:
+        return pd.infer_freq(i)
+
+    # Candidate: fixed duration in universal time, or 1 day in local time.
+    if (step := i.asi8[1] - i.asi8[0]) in _STEPS:
+        freq, values = _STEPS[step], _utc_ns
+    elif np.diff(_wall_ns(i[:2]))[0] == (step := 24 * _NS_PER_H):
+        freq, values = "D", _wall_ns
+    else:
+        return pd.infer_freq(i)
+
+    # Check sample, then check all.
+    pos = _sample_positions(i)
+    deltas = np.diff(values(i[np.stack([pos, pos + 1], axis=1).ravel()]))[::2]
+    if (deltas == step).all():
+        deltas = np.diff(values(i))
+        if (deltas == step).all():
+            return freq
+
+    # Irregular. If tz-agnostic with steps shorter than a day, pandas finds no frequency
+    # (it might only find business hours, if all other steps are overnight or weekend).
+    if i.tz is None and freq != "D":
+        other = deltas[deltas != step]
+        if freq == "15T" or not np.isin(other, _BUSINESSHOUR_STEPS).all():
+            return None
+    return pd.infer_freq(i)
+
+
+def _sample_positions(i: pd.DatetimeIndex) -> np.ndarray:
+    """Positions of timestamps at start and end of index and, if tz-aware, around its
+    DST-transitions. Each position is followed by another timestamp in the index."""
+    n = len(i)
+    pos = [np.arange(_SAMPLESIZE), np.arange(n - _SAMPLESIZE - 1, n - 1)]
+    if i.tz is not None:
+        years = sorted([i[0].year, i[-1].year])
+        if (tt := dst.table(i.tz, *years)) is not None:
+            transitions = np.searchsorted(i.asi8, tt.utc[1:])
+            pos.append((transitions[:, np.newaxis] + np.arange(-2, 2)).ravel())
+    return np.clip(np.concatenate(pos), 0, n - 2)
+
+
+def _utc_ns(i: pd.DatetimeIndex) -> np.ndarray:
+    return i.asi8
+
+
+def _wall_ns(i: pd.DatetimeIndex) -> np.ndarray:
+    return _wall_values(i).view("int64")
+
+
 def right_to_left(i: pd.DatetimeIndex, how: str = "A") -> pd.DatetimeIndex:
     """Turn an index with right-bound timestamps into one with left-bound timestamps.
 
@@ -79,10 +157,10 @@ def right_to_left(i: pd.DatetimeIndex, how: str = "A") -> pd.DatetimeIndex:
 
     # Get frequency.
     if freq is None:
-        freq = pd.infer_freq(i)
+        freq = infer_frequency(i)
 
     if freq is None:  # Couldn't infer frequency. Try from median timedelta.
-        freq = guess_frequency((i[1:] - i[:-1]).median())
+        freq = guess_frequency(pd.Timedelta(np.median(np.diff(i.asi8))))
 
     # Make leftbound.
     td = timedelta(freq)
@@ -127,6 +205,18 @@ def intersection(*indices: pd.DatetimeIndex) -> pd.DatetimeIndex:
 
     freq, name, tz = indices[0].freq, indices[0].name, indices[0].tz
 
+    if freq is not None and all(len(i) for i in indices):
+        # Indices with a frequency have no gaps, so the intersection is the overlapping
+        # part of the first index. (Unless indices are not aligned, e.g. hours starting
+        # at :00 and at :30; checked by looking up the first value in the others.)
+        first = indices[0]
+        start, end = max(i[0] for i in indices), min(i[-1] for i in indices)
+        lo, hi = first.searchsorted(start), first.searchsorted(end, "right")
+        idx = first[lo:hi]
+        if len(idx) and all(idx[0] in i for i in indices[1:]):
+            return idx
+        return pd.DatetimeIndex([], freq=freq, name=name, tz=tz)
+
     # Calculation is cumbersome: pandas DatetimeIndex.intersection not working correctly on timezone-aware indices.
     values = set(indices[0])
     for idx in indices[1:]:
@@ -136,6 +226,51 @@ def intersection(*indices: pd.DatetimeIndex) -> pd.DatetimeIndex:
     return idx
 
 
+def contiguous_slice(i: pd.DatetimeIndex, arg: Any) -> Optional[slice]:
+    """Positions of the values in an index that are selected with ``.loc[arg]``, if
+    they are a contiguous part of the index.
+
+    Parameters
+    ----------
+    i : pd.DatetimeIndex
+        Index with a frequency.
+    arg : Any
+        Argument passed to ``.loc``. Only slices (of timestamps or strings) and
+        DatetimeIndices with the same frequency (and name, if any) are considered.
+
+    Returns
+    -------
+    slice
+        With step 1, such that ``i[slice]`` are the selected values. None if these are
+        not a (non-empty) contiguous part of the index, or if that cannot be determined
+        without looking at all values; e.g. if ``arg`` is a list or a boolean mask.
+    """
+    if i.freq is None or len(i) == 0:
+        return None
+    try:
+        if isinstance(arg, slice):
+            if arg.step is not None:
+                return None
+            positions = i.slice_indexer(arg.start, arg.stop)
+        elif isinstance(arg, pd.DatetimeIndex):
+            if arg.freq != i.freq or len(arg) == 0:
+                return None
+            if arg.name is not None and arg.name != i.name:
+                return None  # selection would get name of ``arg``
+            start = i.get_loc(arg[0])
+            positions = slice(start, start + len(arg))
+            if indexcache.fingerprint(i[positions]) != indexcache.fingerprint(arg):
+                return None  # e.g. distinct timezone, or not all values in ``i``
+        else:
+            return None
+    except (KeyError, TypeError, ValueError):
+        return None
+    start, stop, step = positions.indices(len(i))
+    if step != 1 or stop <= start:
+        return None
+    return slice(start, stop)
+
+
 def floor_ts(
     ts: Union[pd.Timestamp, pd.DatetimeIndex], freq=None, future: int = 0
 ) -> Union[pd.Timestamp, pd.DatetimeIndex]:
@@ -180,18 +315,17 @@ def floor_ts(
     if freq is None:
         freq = ts.freq
 
+    if isinstance(ts, pd.DatetimeIndex):
+        return _floor_index(ts, freq, future)
+
     # Rounding to short (< day) frequencies.
     try:
-        # Can only infer if it's an index.
-        kwargs = {"ambiguous": "infer"} if isinstance(ts, pd.DatetimeIndex) else {}
         if freq == "15T":
-            return ts.floor("15T", **kwargs) + pd.Timedelta(minutes=future * 15)
+            return ts.floor("15T") + pd.Timedelta(minutes=future * 15)
         elif freq == "H":
-            return ts.floor("H", **kwargs) + pd.Timedelta(hours=future)
+            return ts.floor("H") + pd.Timedelta(hours=future)
     except AmbiguousTimeError:
-        # converting to UTC and then flooring to nearest hour.
-        # TODO: this is incorrect for timezones with fractional offset to UTC.
-        return floor_ts(ts.tz_convert("UTC"), freq, future).tz_convert(ts.tz)
+        return _floor_index(pd.DatetimeIndex([ts]), freq, future)[0]
 
     # Rounding to longer (>= day) frequencies.
     ts = ts.floor("D")  # make sure we return a midnight value
@@ -213,6 +347,26 @@ def floor_ts(
         )
 
 
+def _floor_index(i: pd.DatetimeIndex, freq, future: int = 0) -> pd.DatetimeIndex:
+    """Floor all timestamps in index at once, on the local (wall clock) time axis."""
+    wall = _wall_values(i)
+    floored = _floor_wall(wall, freq)
+    if freq in ["15T", "H"]:
+        # Fixed duration; subtract on universal time axis, so that repeated wall times
+        # (at end of DST) and fractional UTC-offsets are handled correctly.
+        utc = i.asi8 - (wall - floored).view("int64")
+        if future:
+            utc = utc + future * timedelta(freq).value
+        if i.tz is None:
+            return pd.DatetimeIndex(utc.view("datetime64[ns]"), name=i.name)
+        return pd.DatetimeIndex(utc, tz="UTC", name=i.name).tz_convert(i.tz)
+    if future:
+        floored = _shift_wall(floored, freq, future)
+    if i.tz is None:
+        return pd.DatetimeIndex(floored, name=i.name)
+    return dst.localize(floored, i.tz, name=i.name)
+
+
 def ceil_ts(
     ts: Union[pd.Timestamp, pd.DatetimeIndex], freq=None, future: int = 0
 ) -> Union[pd.Timestamp, pd.DatetimeIndex]:
@@ -255,7 +409,12 @@ def ceil_ts(
     Timestamp('2020-07-01 00:00:00')
     """
     if isinstance(ts, pd.DatetimeIndex):
-        return pd.DatetimeIndex([ceil_ts(t, freq, future) for t in ts])
+        # if ts at start of period, ceil==floor
+        at_start = _floor_index(ts, freq if freq is not None else ts.freq) == ts
+        if at_start.all():
+            return floor_ts(ts, freq, future)
+        later = floor_ts(ts, freq, future + 1)
+        return later.where(~at_start, floor_ts(ts, freq, future))
     # if ts at start of period, ceil==floor
     offset = 1 if ts != floor_ts(ts, freq, 0) else 0
     return floor_ts(ts, freq, future + offset)
@@ -285,7 +444,14 @@ def assert_boundary_ts(ts: Union[pd.Timestamp, pd.DatetimeIndex], freq: str) ->
     """
 
     if isinstance(ts, pd.DatetimeIndex):
-        if (floor_ts(ts, freq) != ts).any():
+
+        def is_boundary() -> bool:
+            if freq in FREQUENCIES:
+                wall = _wall_values(ts)
+                return bool((_floor_wall(wall, freq) == wall).all())
+            return bool((floor_ts(ts, freq) == ts).all())
+
+        if not indexcache.get(ts, ("boundary", freq), is_boundary):
             raise AssertionError(
                 f"Not all values in ``ts`` are a valid boundary timestamp for the frequency {freq}."
             )
@@ -406,7 +572,10 @@ def ts_right(
     assert_boundary_ts(ts_left, freq)
 
     if isinstance(ts_left, pd.DatetimeIndex):
-        return pd.Series(ts_left + timedelta(freq), ts_left, name="ts_right")
+        right = indexcache.get(
+            ts_left, ("ts_right", freq), lambda: _ts_right_index(ts_left, freq)
+        )
+        return pd.Series(right, ts_left, name="ts_right")
 
     # Assume it's a single timestamp.
     return ts_left + timedelta(freq)
@@ -449,8 +618,10 @@ def duration(
             # Speed-up things for fixed-duration frequencies.
             h = 1 if freq == "H" else 0.25
         else:
-            # Individual calculations for non-fixed-duration frequencies.
-            h = [td.total_seconds() / 3600 for td in ts_right(ts_left, freq) - ts_left]
+            # Non-fixed-duration frequencies: difference between the (UTC) values.
+            h = indexcache.get(
+                ts_left, ("duration", freq), lambda: _duration_hours(ts_left, freq)
+            ).copy()
         return pd.Series(h, ts_left, dtype="pint[h]").rename("duration")
 
     # Assume it's a single timestamp.
@@ -460,6 +631,114 @@ def duration(
         return Q_((ts_right(ts_left, freq) - ts_left).total_seconds() / 3600, "h")
 
 
+def group_codes(i: pd.DatetimeIndex, freq: str) -> np.ndarray:
+    """Number of the period (with frequency ``freq``) that each timestamp falls into.
+
+    Parameters
+    ----------
+    i : pd.DatetimeIndex
+        Sorted left-bound timestamps, with a frequency that is equal to or shorter than
+        ``freq``.
+    freq : {'15T' (quarter-hour), 'H' (hour), 'D' (day), 'MS' (month), 'QS' (quarter),
+        'AS' (year)}
+        Frequency of the periods.
+
+    Returns
+    -------
+    np.ndarray
+        Read-only integer array with same length as ``i``, starting at 0 and increasing
+        by 1 whenever a new period starts.
+
+    Examples
+    --------
+    >>> group_codes(pd.date_range('2020-01-30', periods=4, freq='D'), 'MS')
+    array([0, 0, 1, 1])
+    """
+
+    def calculate() -> np.ndarray:
+        wall = _wall_values(i)
+        floored = _floor_wall(wall, freq)
+        if freq in ["15T", "H"]:
+            # Fixed duration; compare period starts on universal time axis, so that
+            # repeated wall times (at end of DST) are in distinct periods.
+            floored = i.asi8 - (wall - floored).view("int64")
+        codes = np.zeros(len(i), np.int64)
+        np.cumsum(floored[1:] != floored[:-1], out=codes[1:])
+        codes.flags.writeable = False
+        return codes
+
+    return indexcache.get(i, ("group_codes", freq), calculate)
+
+
+def _duration_hours(i: pd.DatetimeIndex, freq: str) -> np.ndarray:
+    """Duration (in hours) of each (validated) left-bound timestamp in index."""
+    h = (_ts_right_index(i, freq).asi8 - i.asi8) / 3_600_000_000_000  # ns -> h
+    h.flags.writeable = False
+    return h
+
+
+def _wall_values(i: pd.DatetimeIndex) -> np.ndarray:
+    """Local (i.e., wall clock) time of each timestamp in index, as datetime64[ns] array."""
+    return dst.to_wall(i) if i.tz is not None else i.values
+
+
+def _floor_wall(wall: np.ndarray, freq: str) -> np.ndarray:
+    """Floor local times (datetime64[ns] array) to start of period."""
+    if freq == "15T":
+        ns = wall.astype("datetime64[ns]").view("int64")
+        return (ns - ns % (15 * 60 * 1_000_000_000)).view("datetime64[ns]")
+    elif freq == "H":
+        return wall.astype("datetime64[h]").astype(wall.dtype)
+    elif freq == "D":
+        return wall.astype("datetime64[D]").astype(wall.dtype)
+    elif freq == "MS":
+        return wall.astype("datetime64[M]").astype(wall.dtype)
+    elif freq == "QS":
+        months = wall.astype("datetime64[M]")
+        return (months - months.astype("int64") % 3).astype(wall.dtype)
+    elif freq == "AS":
+        return wall.astype("datetime64[Y]").astype(wall.dtype)
+    raise ValueError(
+        f"Parameter ``freq`` must be one of {', '.join(FREQUENCIES)}; got {freq}."
+    )
+
+
+def _shift_wall(wall: np.ndarray, freq: str, periods: int = 1) -> np.ndarray:
+    """Shift local times (datetime64[ns] array of period starts) by a number of periods."""
+    if freq == "15T":
+        return wall + np.timedelta64(15 * periods, "m")
+    elif freq == "H":
+        return wall + np.timedelta64(periods, "h")
+    elif freq == "D":
+        return (wall.astype("datetime64[D]") + periods).astype(wall.dtype)
+    elif freq == "MS":
+        return (wall.astype("datetime64[M]") + periods).astype(wall.dtype)
+    elif freq == "QS":
+        return (wall.astype("datetime64[M]") + 3 * periods).astype(wall.dtype)
+    elif freq == "AS":
+        return (wall.astype("datetime64[Y]") + periods).astype(wall.dtype)
+    raise ValueError(
+        f"Parameter ``freq`` must be one of {', '.join(FREQUENCIES)}; got {freq}."
+    )
+
+
+def _ts_right_index(i: pd.DatetimeIndex, freq: str) -> pd.DatetimeIndex:
+    """Right-bound timestamps belonging to (validated) left-bound timestamps in index."""
+    if freq in ["15T", "H"]:
+        # Fixed duration; add on universal time axis.
+        return i + timedelta(freq)
+    elif freq in FREQUENCIES:
+        if len(i) > 1 and i.freq == freq:
+            # Gapless index: the right timestamps are the next left timestamps. Only the
+            # final one must be calculated.
+            return i[1:].append(_ts_right_index(i[-1:], freq))
+        # Add on local time axis, then find UTC-offset of each right timestamp in bulk.
+        right = _shift_wall(_wall_values(i), freq)
+        return pd.DatetimeIndex(right) if i.tz is None else dst.localize(right, i.tz)
+    else:
+        return i + timedelta(freq)
+
+
 def ts_leftright(left=None, right=None) -> Tuple[pd.Timestamp, pd.Timestamp]:
     """Makes 2 timestamps coherent to one another.
 
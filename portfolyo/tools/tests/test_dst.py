@@ -0,0 +1,77 @@
+from portfolyo.tools import dst
+import datetime as dt
+import pandas as pd
+import numpy as np
+import pytest
+import pytz
+
+TIMEZONES = [
+    None,
+    "Europe/Berlin",
+    "America/New_York",
+    "Asia/Kolkata",
+    "Australia/Adelaide",
+    pytz.FixedOffset(-90),
+    dt.timezone(dt.timedelta(hours=3)),
+]
+
+
+@pytest.mark.parametrize("tz", TIMEZONES)
+@pytest.mark.parametrize("freq", ["15T", "H", "D"])
+def test_to_wall(tz, freq):
+    """Test if local time is same as found by pandas."""
+    i = pd.date_range("2019-06", "2022-06", freq=freq, tz=tz or "UTC")
+    expected = i.tz_localize(None).values
+    np.testing.assert_array_equal(dst.to_wall(i), expected)
+
+
+@pytest.mark.parametrize("tz", TIMEZONES)
+@pytest.mark.parametrize("freq", ["H", "D", "MS"])
+def test_to_utc(tz, freq):
+    """Test if universal time is same as found by pandas, for local times that are
+    unambiguous."""
+    tz = pytz.timezone(tz) if isinstance(tz, str) else tz or pytz.utc
+    wall = pd.date_range("2019-06", "2022-06", freq=freq)
+    if freq == "H":  # keep only the times that exist exactly once
+        aware = pd.date_range(wall[0], wall[-1], freq="H", tz=tz)
+        local = aware.tz_localize(None)
+        wall = local[~local.duplicated(keep=False)]
+    expected = wall.tz_localize(tz).asi8
+    np.testing.assert_array_equal(dst.to_utc(wall.values, tz), expected)
+
+
+@pytest.mark.parametrize("ambiguous", ["first", "last"])
+@pytest.mark.parametrize("tz", ["Europe/Berlin", "Australia/Adelaide"])
+def test_to_utc_ambiguous(tz, ambiguous):
+    """Test if local times that occur twice are correctly converted, or raise error."""
+    tz = pytz.timezone(tz)
+    aware = pd.date_range("2020", "2022", freq="15T", tz=tz, inclusive="left")
+    wall = aware.tz_localize(None)
+    expected = wall.tz_localize(tz, ambiguous=np.full(len(wall), ambiguous == "first"))
+
+    result = dst.to_utc(wall.values, tz, ambiguous)
+
+    np.testing.assert_array_equal(result, expected.asi8)
+    with pytest.raises(pytz.AmbiguousTimeError):
+        dst.to_utc(wall.values, tz)
+
+
+@pytest.mark.parametrize("wall", ["2020-03-29 02:00", "2020-03-29 02:45"])
+def test_to_utc_nonexistent(wall):
+    """Test if local times that do not exist raise error."""
+    tz = pytz.timezone("Europe/Berlin")
+    with pytest.raises(pytz.NonExistentTimeError):
+        dst.to_utc(np.array([wall], "datetime64[ns]"), tz)
+
+
+def test_table():
+    """Test if table contains transitions in the requested years, and is cached."""
+    tz = pytz.timezone("Europe/Berlin")
+    table = dst.table(tz, 2020, 2021)
+
+    moments = pd.DatetimeIndex(table.utc[1:], tz="UTC")
+    assert list(moments.tz_convert(tz).year) == [2020, 2020, 2021, 2021]
+    assert list(table.offset // 3_600_000_000_000) == [1, 2, 1, 2, 1]
+    assert dst.table(tz, 2020, 2021) is table
+    assert not table.utc.flags.writeable
+    assert dst.table(dt.timezone(dt.timedelta(hours=1)), 2020, 2021).utc.shape == (1,)
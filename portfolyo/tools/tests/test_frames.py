@@ -213,6 +213,37 @@ def test_standardize_gaps(freq, in_tz, removesome, series_or_df, force_freq):
     assert result.index.freq == expected_freq
 
 
+@pytest.mark.parametrize("series_or_df", ["series", "df"])
+@pytest.mark.parametrize("in_tz", [None, "Europe/Berlin"])
+@pytest.mark.parametrize("name", ["ts_left", "t"])
+@pytest.mark.parametrize("withfreq", [True, False])
+@pytest.mark.parametrize("copy", [True, False])
+def test_standardize_copy(in_tz, name, withfreq, copy, series_or_df):
+    """Test if data is only shared with the input frame when allowed, and if the input
+    frame is not changed."""
+    force = "agnostic" if in_tz is None else "aware"
+    i = pd.date_range("2020", freq="H", periods=500, tz=in_tz, name=name)
+    if not withfreq:
+        i = pd.DatetimeIndex(i, freq=None)
+    fr = pd.DataFrame({"a": np.random.rand(500), "b": np.random.rand(500)}, i)
+    if series_or_df == "series":
+        fr = fr["a"]
+    original = fr.copy()
+
+    result = frames.standardize(fr, force, copy=copy)
+
+    assert result.index.freq == "H"
+    assert result.index.name == "ts_left"
+    if series_or_df == "series":
+        pd.testing.assert_series_equal(fr, original)
+        shared = np.shares_memory(result.values, fr.values)
+    else:
+        pd.testing.assert_frame_equal(fr, original)
+        shared = np.shares_memory(result.iloc[:, 0].values, fr.iloc[:, 0].values)
+    assert shared is not copy
+    assert (result is fr) is (not copy and withfreq and name == "ts_left")
+
+
 @pytest.mark.parametrize(
     ("values", "maxgap", "gapvalues"),
     [
@@ -250,6 +281,26 @@ def test_fill_gaps(values, index, maxgap, gapvalues, tol):
     pd.testing.assert_frame_equal(df_new, df, rtol=tol)
 
 
+@pytest.mark.parametrize("maxgap", [1, 2, 5])
+def test_fill_gaps_dataframe(maxgap):
+    """Test if all columns of a dataframe are filled at once, keeping units, with same
+    result as for each individual column."""
+    i = pd.date_range("2020", periods=1000, freq="15T", tz="Europe/Berlin")
+    values = np.random.rand(len(i), 3) * 100
+    values[np.random.rand(*values.shape) < 0.3] = nan
+    df = pd.DataFrame(values, i, ["a", "b", "c"])
+    df["b"] = df["b"].astype("pint[MW]")
+    df["d"] = np.arange(len(i))  # integer column: no gaps
+
+    result = frames.fill_gaps(df, maxgap)
+
+    assert result["b"].dtype == df["b"].dtype
+    for col in ["a", "c", "d"]:
+        pd.testing.assert_series_equal(result[col], frames.fill_gaps(df[col], maxgap))
+    expected_b = frames.fill_gaps(df["b"].pint.m, maxgap)
+    pd.testing.assert_series_equal(result["b"].pint.m, expected_b)
+
+
 @pytest.mark.parametrize(
     ("df_columns", "header", "expected_columns"),
     [
@@ -699,6 +750,42 @@ def test_wavg_valuesasdataframe_0weights(weightsas: str, axis: int):
     )
 
 
+@pytest.mark.parametrize("weightsas", ["none", "series", "dataframe"])
+@pytest.mark.parametrize("axis", [0, 1])
+def test_wavg_valuesasdataframe_large(weightsas: str, axis: int):
+    """Test if weighted average of a large dataframe with units is same as when
+    calculated for each row or column separately."""
+    i = pd.date_range("2020", freq="15T", periods=500, tz="Europe/Berlin")
+    values = pd.DataFrame(
+        {
+            "a": pd.Series(np.random.uniform(-99, 99, 500), i).astype("pint[Eur/MWh]"),
+            "b": pd.Series(np.random.uniform(-9, 9, 500), i).astype("pint[ctEur/kWh]"),
+        }
+    )
+    weights = pd.DataFrame(np.random.uniform(0, 10, (500, 2)), i, ["a", "b"])
+    weights.iloc[:5] = 0  # rows in which all weights are 0
+    weights = weights.astype("pint[MWh]")
+    if weightsas == "none":
+        weights = None
+    elif weightsas == "series":
+        weights = weights.iloc[:, 0] if axis == 0 else weights.iloc[0] + pf.Q_(1, "MWh")
+
+    result = frames.wavg(values, weights, axis)
+
+    if axis == 0:
+        for c in values:
+            w = weights if weights is None or weightsas == "series" else weights[c]
+            expected = frames.wavg(values[c], w)
+            assert result[c].to(expected.u).m == pytest.approx(expected.m)
+    else:
+        result = result.pint.to("Eur/MWh").pint.m
+        values = values.astype("pint[Eur/MWh]")
+        for ts in i[::25]:
+            w = weights if weights is None or weightsas == "series" else weights.loc[ts]
+            expected = frames.wavg(values.loc[ts], w).to("Eur/MWh").m
+            assert result[ts] == pytest.approx(expected, nan_ok=True)
+
+
 vals1 = np.array([1, 2.0, -4.1234, 0])
 vals2 = np.array([1, 2.0, -4.1234, 0.5])
 
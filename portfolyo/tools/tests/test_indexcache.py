@@ -0,0 +1,112 @@
+from portfolyo.tools import indexcache, stamps
+import pandas as pd
+import numpy as np
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    indexcache.cache_clear()
+    yield
+    indexcache.set_maxsize(128)
+    indexcache.cache_clear()
+
+
+def test_hits_and_misses():
+    i = pd.date_range("2020", freq="MS", periods=24, tz="Europe/Berlin")
+    calls = []
+
+    def calculate():
+        calls.append(1)
+        return 42
+
+    assert indexcache.get(i, "answer", calculate) == 42
+    assert indexcache.get(i, "answer", calculate) == 42
+    # Equal index, different object.
+    i2 = pd.date_range("2020", freq="MS", periods=24, tz="Europe/Berlin")
+    assert indexcache.get(i2, "answer", calculate) == 42
+    assert len(calls) == 1
+    assert indexcache.cache_info() == (2, 1, 128, 1)
+
+
+@pytest.mark.parametrize(
+    "i2",
+    [
+        pd.date_range("2020", freq="MS", periods=25, tz="Europe/Berlin"),
+        pd.date_range("2020-02", freq="MS", periods=24, tz="Europe/Berlin"),
+        pd.date_range("2020", freq="MS", periods=24, tz="Asia/Kolkata"),
+        pd.date_range("2020", freq="MS", periods=24),
+        pd.date_range("2020", freq="D", periods=24, tz="Europe/Berlin"),
+    ],
+)
+def test_different_index(i2):
+    i = pd.date_range("2020", freq="MS", periods=24, tz="Europe/Berlin")
+    assert indexcache.get(i, "x", lambda: 1) == 1
+    assert indexcache.get(i2, "x", lambda: 2) == 2
+    assert indexcache.cache_info().misses == 2
+
+
+def test_index_without_freq_not_cached():
+    i = pd.DatetimeIndex(["2020-01-01", "2020-01-02", "2020-01-04"])
+    assert indexcache.get(i, "x", lambda: 1) == 1
+    assert indexcache.get(i, "x", lambda: 2) == 2
+    assert indexcache.cache_info() == (0, 2, 128, 0)
+
+
+def test_maxsize():
+    indexcache.set_maxsize(2)
+    indices = [pd.date_range("2020", freq="D", periods=n) for n in (10, 20, 30)]
+    for i in indices:
+        indexcache.get(i, "x", lambda: len(i))
+    assert indexcache.cache_info().currsize == 2
+    # Least recently used index was removed.
+    assert indexcache.get(indices[0], "x", lambda: None) is None
+    assert indexcache.get(indices[2], "x", lambda: None) == 30
+
+    indexcache.set_maxsize(0)
+    assert indexcache.cache_info().currsize == 0
+    assert indexcache.get(indices[2], "x", lambda: None) is None
+
+    with pytest.raises(ValueError):
+        indexcache.set_maxsize(-1)
+
+
+def test_cache_clear():
+    i = pd.date_range("2020", freq="D", periods=10)
+    indexcache.get(i, "x", lambda: 1)
+    indexcache.cache_clear()
+    assert indexcache.cache_info() == (0, 0, 128, 0)
+    assert indexcache.get(i, "x", lambda: 2) == 2
+
+
+def test_duration_uses_cache():
+    i = pd.date_range("2020", freq="MS", periods=24, tz="Europe/Berlin")
+    d1 = stamps.duration(i)
+    d2 = stamps.duration(i)
+    assert indexcache.cache_info().hits > 0
+    pd.testing.assert_series_equal(d1, d2)
+    # Returned values are not shared with the cache.
+    d1.iloc[0] = d1.iloc[0] * 2
+    pd.testing.assert_series_equal(stamps.duration(i), d2)
+
+
+@pytest.mark.parametrize("tz", [None, "Europe/Berlin"])
+@pytest.mark.parametrize(
+    ("freq", "periods", "target", "expected_groups"),
+    [
+        ("H", 24 * 366, "D", 366),
+        ("D", 366, "MS", 12),
+        ("D", 366, "QS", 4),
+        ("MS", 36, "AS", 3),
+        ("15T", 4 * 24 * 3, "H", 24 * 3),
+    ],
+)
+def test_group_codes(tz, freq, periods, target, expected_groups):
+    i = pd.date_range("2020", freq=freq, periods=periods, tz=tz)
+    codes = stamps.group_codes(i, target)
+    assert codes[0] == 0
+    assert codes[-1] == expected_groups - 1
+    assert np.all(np.diff(codes) >= 0)
+    expected = pd.Series(i, i).apply(lambda ts: stamps.floor_ts(ts, target))
+    assert (pd.Series(codes).groupby(expected.values).nunique() == 1).all()
+    assert not codes.flags.writeable
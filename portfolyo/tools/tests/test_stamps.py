@@ -365,6 +365,30 @@ def test_guessfrequency_dst(start, end, expected):
         assert result == expected
 
 
+@pytest.mark.parametrize("tz", [None, "Europe/Berlin", "America/New_York"])
+@pytest.mark.parametrize("freq", ["15T", "H", "D", "30T", "BH"])
+@pytest.mark.parametrize(
+    "change", ["none", "gap", "localtime", "duplicate", "reverse", "offset"]
+)
+def test_inferfrequency(tz, freq, change):
+    """Test if frequency is inferred as by pandas, also for long irregular indices."""
+    periods = 3000 if freq == "D" else 15_000
+    i = pd.date_range("2020-01-01", freq=freq, periods=periods, tz=tz)
+    i = pd.DatetimeIndex(i, freq=None)
+    if change == "gap":
+        i = i.delete([100, 10_000 % periods])
+    elif change == "localtime":  # with gaps and repeated timestamps at DST-transitions
+        i = i.tz_localize(None)
+    elif change == "duplicate":
+        i = i.insert(1000, i[1000])
+    elif change == "reverse":
+        i = i[::-1]
+    elif change == "offset":
+        i = i[1:].insert(0, i[0] - pd.Timedelta(minutes=7))
+
+    assert stamps.infer_frequency(i) == pd.infer_freq(i)
+
+
 @pytest.mark.parametrize("tz", [None, "Europe/Berlin", "Asia/Kolkata"])
 @pytest.mark.parametrize("remove_freq", [True, False])
 @pytest.mark.parametrize(
@@ -658,6 +682,37 @@ def test_intersection(idxs, expected):
         testing.assert_index_equal(result, expected)
 
 
+_i = pd.date_range("2020", freq="D", periods=100, tz="Europe/Berlin")
+
+
+@pytest.mark.parametrize(
+    ("arg", "expected"),
+    [
+        (slice("2020-02", "2020-02"), slice(31, 60)),
+        (slice("2020-02-10", None), slice(40, 100)),
+        (slice(None, _i[9]), slice(0, 10)),
+        (slice("2019", "2019-12"), None),  # empty
+        (slice("2020-02", "2020-03", 2), None),
+        (_i[20:30], slice(20, 30)),
+        (_i[20:30].rename("other"), None),
+        (pd.date_range("2020-03", freq="D", periods=200, tz="Europe/Berlin"), None),
+        (_i[20:30].tz_convert("Asia/Kolkata"), None),
+        (_i[20:30].tz_localize(None), None),
+        (pd.DatetimeIndex(_i[[20, 22, 25]]), None),
+        (pd.date_range("2020", freq="MS", periods=2, tz="Europe/Berlin"), None),
+        (_i < "2020-02", None),
+        ([_i[0], _i[1]], None),
+        (_i[5], None),
+    ],
+)
+def test_contiguousslice(arg, expected):
+    """Test if contiguous parts of index are correctly identified."""
+    result = stamps.contiguous_slice(_i, arg)
+    assert result == expected
+    if expected is not None:
+        testing.assert_index_equal(_i[result], pd.Series(0, _i).loc[arg].index)
+
+
 @pytest.mark.parametrize("iterable", [False, True])  # make iterable or not
 @pytest.mark.parametrize("tz", [None, "Europe/Berlin", "Asia/Kolkata"])
 @pytest.mark.parametrize(
@@ -848,6 +903,27 @@ def test_floorceilts_2(function, ts, tz, freq, expected_floor, expected_ceil):
     assert result == expected
 
 
+@pytest.mark.parametrize("tz", ["Europe/Berlin", "Australia/Adelaide"])
+@pytest.mark.parametrize("freq", ["15T", "H"])
+def test_floorceilts_dst(tz, freq):
+    """Test if timestamps in the repeated hour at end of DST are floored and ceiled on
+    the local time axis, also for UTC-offsets that are not a whole number of hours."""
+    day = "2020-10-25" if tz == "Europe/Berlin" else "2020-04-05"
+    i = pd.date_range(day, freq="15T", periods=24 * 4 + 4, tz=tz)
+    step = stamps.timedelta(freq)
+    ts = i + pd.Timedelta(minutes=7)
+    # Floored and ceiled timestamps have the same UTC-offset as the original ones.
+    wall = ts.tz_localize(None)
+    expected_floor = ts - (wall - wall.floor(freq))
+    expected_ceil = expected_floor + step
+
+    testing.assert_index_equal(stamps.floor_ts(ts, freq), expected_floor)
+    testing.assert_index_equal(stamps.ceil_ts(ts, freq), expected_ceil)
+    testing.assert_index_equal(stamps.floor_ts(ts, freq, 2), expected_floor + 2 * step)
+    for t, expected in zip(ts, expected_floor):
+        assert stamps.floor_ts(t, freq) == expected
+
+
 @pytest.mark.parametrize("tz", [None, "Europe/Berlin", "Asia/Kolkata"])
 @pytest.mark.parametrize(
     ("ts", "freq", "is_boundary"),
@@ -1040,6 +1116,22 @@ def test_duration(ts, freq, hours):
     assert stamps.duration(ts, freq) == nits.Q_(hours, "h")
 
 
+@pytest.mark.parametrize("tz", [None, "Europe/Berlin", "Asia/Kolkata"])
+@pytest.mark.parametrize("freq", ["15T", "H", "D", "MS", "QS", "AS"])
+@pytest.mark.parametrize("has_freq", [True, False])
+def test_duration_and_tsright_index(tz, freq, has_freq):
+    """Test if duration and right timestamp of index are same as of each timestamp."""
+    periods = {"15T": 400, "H": 400, "D": 400, "MS": 30, "QS": 12, "AS": 5}[freq]
+    i = pd.date_range("2020-03-01", freq=freq, periods=periods, tz=tz)
+    if not has_freq:
+        i = i[::2]  # gaps; no frequency
+    result_right = stamps.ts_right(i, freq)
+    result_duration = stamps.duration(i, freq)
+    for ts, right, duration in zip(i, result_right, result_duration):
+        assert right == stamps.ts_right(ts, freq)
+        assert duration == stamps.duration(ts, freq)
+
+
 @pytest.mark.parametrize("freq1", freqs_small_to_large)
 @pytest.mark.parametrize("freq2", freqs_small_to_large)
 def test_frequpordown(freq1, freq2):
@@ -3,6 +3,7 @@ from portfolyo.tools import zones, frames, stamps
 from portfolyo import testing
 from pathlib import Path
 import pandas as pd
+import numpy as np
 import pytest
 import functools
 
@@ -197,3 +198,43 @@ def test_conversionBtoA_fromexcel(aggfreq, tzt_in, tzt_out, series_or_df):
 #         return frames.set_frequency(fr_out, aggfreq)
 
 #     do_conversion_test(aggfreq, tzt_in, tzt_out, series_or_df, conversion_fn)
+
+
+@pytest.mark.parametrize("series_or_df", ["series", "df"])
+@pytest.mark.parametrize("freq", ["15T", "H"])
+@pytest.mark.parametrize("day", ["2020-03-29", "2020-10-25"])
+def test_conversion_dst(day, freq, series_or_df):
+    """Test if values are correctly repeated or dropped at DST-transitions when
+    converting between type A and type B."""
+    per_hour = 4 if freq == "15T" else 1
+    start = pd.Timestamp(day, tz="Europe/Berlin")
+    end = start + pd.DateOffset(days=1)
+    i_a = pd.date_range(start, end, freq=freq, inclusive="left")
+    i_b = pd.date_range(day, freq=freq, periods=24 * per_hour)
+    values_a = np.arange(len(i_a)) * 1.0
+    # Position, in A, of the value at each timestamp in B.
+    hour2, hour3 = slice(2 * per_hour, 3 * per_hour), slice(3 * per_hour, 4 * per_hour)
+    after2 = slice(3 * per_hour, None)
+    positions = np.arange(24 * per_hour)
+    if day.endswith("03-29"):  # 2:00-3:00 missing in A: use 1:00-2:00
+        positions[hour2] -= per_hour
+        positions[after2] -= per_hour
+    else:  # 2:00-3:00 repeated in A: use first
+        positions[after2] += per_hour
+    fr_a = pd.Series(values_a, i_a, name="col1")
+    fr_b = pd.Series(values_a[positions], i_b, name="col1")
+    if series_or_df == "df":
+        fr_a, fr_b = pd.DataFrame({"col1": fr_a}), pd.DataFrame({"col1": fr_b})
+    if series_or_df == "df":
+        assert_fn = testing.assert_frame_equal
+    else:
+        assert_fn = testing.assert_series_equal
+
+    assert_fn(zones._aware_to_agnostic(fr_a), fr_b)
+    result = zones._agnostic_to_aware(fr_b, "Europe/Berlin")
+    if day.endswith("03-29"):
+        assert_fn(result, fr_a)
+    else:  # repeated hour gets value of first occurence
+        expected = fr_a.copy()
+        expected.iloc[hour3] = fr_a.iloc[hour2].to_numpy()
+        assert_fn(result, expected)
@@ -1,7 +1,8 @@
 """Tools to deal with timezones."""
 
-from . import frames, stamps
+from . import dst, frames, stamps
 import pytz
+import numpy as np
 from pandas.core.frame import NDFrame
 import pandas as pd
 
@@ -54,7 +55,9 @@ It's therefore hard to determine, which it is.
 """
 
 
-def force_tzaware(fr: NDFrame, tz: str, *, floating: bool = True) -> NDFrame:
+def force_tzaware(
+    fr: NDFrame, tz: str, *, floating: bool = True, copy: bool = True
+) -> NDFrame:
     """Convert/set series or dataframe to a specific timezone.
 
     Parameters
@@ -76,6 +79,9 @@ def force_tzaware(fr: NDFrame, tz: str, *, floating: bool = True) -> NDFrame:
           '2020-03-01 12:00+0530 Asia/Kolkata' --> '2020-03-01 07:30+0100 Europe/Berlin'
           Conversion in many cases (e.g. daily values and longer) impossible as there is
           no 1-to-1 relation between source and target timezones.
+    copy : bool, optional (default: True)
+        If False, and ``fr`` already has the target timezone, the returned frame shares
+        its data with ``fr``.
 
     Returns
     -------
@@ -108,8 +114,8 @@ def force_tzaware(fr: NDFrame, tz: str, *, floating: bool = True) -> NDFrame:
             "No timezone was specified. To convert to standardized timezone-agnostic frame, use ``force_tzagnostic`` instead."
         )
 
-    # Copy, try to set freq, and store original attributes.
-    fr = frames.set_frequency(fr)
+    # Try to set freq, and store original attributes.
+    fr = frames.set_frequency(fr, copy=False)
     freq_input, tz_input = fr.index.freq, fr.index.tz
 
     if not freq_input:
@@ -123,9 +129,10 @@ def force_tzaware(fr: NDFrame, tz: str, *, floating: bool = True) -> NDFrame:
 
     else:  # input is standardized tz-agnostic
         fr_out = _B_to_A(fr, tz=tz)
+    converted = fr_out is not fr  # if so, the data is already a copy
 
     # Return: set frequency, and if succesful, check if all timestamps are valid for it.
-    fr_out = frames.set_frequency(fr_out, freq_input)
+    fr_out = frames.set_frequency(fr_out, freq_input, copy=copy and not converted)
     try:
         stamps.assert_boundary_ts(fr_out.index, freq_input)
     except AssertionError as e:
@@ -133,13 +140,16 @@ def force_tzaware(fr: NDFrame, tz: str, *, floating: bool = True) -> NDFrame:
     return fr_out
 
 
-def force_tzagnostic(fr: NDFrame) -> NDFrame:
+def force_tzagnostic(fr: NDFrame, *, copy: bool = True) -> NDFrame:
     """Turn a frame (series or dataframe) into timezone-agnostic frame.
 
     Parameters
     ----------
     fr : NDFrame
         Pandas Series or Dataframe with tz-aware or (standardized) tz-agnostic index.
+    copy : bool, optional (default: True)
+        If False, and ``fr`` is already tz-agnostic, the returned frame shares its data
+        with ``fr``.
 
     Returns
     -------
@@ -166,8 +176,8 @@ def force_tzagnostic(fr: NDFrame) -> NDFrame:
       duplicated to TWO values of 4 [MW] each in the Europe/Berlin timezone. Note that
       this conversion is probably what we want, regardless of the unit.
     """
-    # Copy, try to set freq, and store original attributes.
-    fr = frames.set_frequency(fr)
+    # Try to set freq, and store original attributes.
+    fr = frames.set_frequency(fr, copy=False)
     freq_input, tz_input = fr.index.freq, fr.index.tz
 
     if not freq_input:
@@ -181,9 +191,10 @@ def force_tzagnostic(fr: NDFrame) -> NDFrame:
 
     else:  # input is already standardized tz-agnostic
         fr_out = fr
+    converted = fr_out is not fr  # if so, the data is already a copy
 
     # Return: set frequency, and if succesful, check if all timestamps are valid for it.
-    fr_out = frames.set_frequency(fr_out, freq_input)
+    fr_out = frames.set_frequency(fr_out, freq_input, copy=copy and not converted)
     stamps.assert_boundary_ts(fr_out.index, freq_input)
     return fr_out
 
@@ -215,7 +226,7 @@ def _B_to_A(fr: NDFrame, *, tz) -> NDFrame:
 
 
 def _idx_after_conversion(fr: NDFrame, tz) -> pd.DatetimeIndex:
-    fr = frames.set_frequency(fr)
+    fr = frames.set_frequency(fr, copy=False)
     freq_input = fr.index.freq
     if not freq_input:
         raise ValueError("Cannot recalculate values if frequency is not known.")
@@ -246,8 +257,12 @@ def _agnostic_to_aware(fr: NDFrame, tz: str) -> NDFrame:
     # Convert hourly or shorter.
     # There may be multiple timestamps in output receiving same input value. (And some
     # that are lost). But importantly: each timestamp in output exists in input.
-    mapping_onto_input_index = idx_out.tz_localize(None)
-    return fr.loc[mapping_onto_input_index].set_axis(idx_out)
+    wallclock = pd.DatetimeIndex(dst.to_wall(idx_out))
+    positions = fr.index.get_indexer(wallclock)
+    if (positions == -1).any():
+        missing = wallclock[positions == -1]
+        raise KeyError(f"Timestamps not found in input: {list(missing[:3])}.")
+    return fr.take(positions).set_axis(idx_out)
 
 
 def _aware_to_agnostic(fr: NDFrame) -> NDFrame:
@@ -267,13 +282,14 @@ def _aware_to_agnostic(fr: NDFrame) -> NDFrame:
     # Convert hourly or shorter.
     # There are timestamps in the output that do not exist in the input. In that case,
     # repeat the value of the previous hour.
-    partly = fr.tz_localize(None)
-    partly = partly[~partly.index.duplicated()]  # remove duplicates
-
-    def value(ts):  # Take value of prev hour if current time not found in the input.
-        try:
-            return partly.loc[ts]
-        except KeyError:
-            return partly.loc[ts - pd.Timedelta(hours=1)]
-
-    return fr.__class__([value(ts) for ts in idx_out], index=idx_out)
+    wallclock = pd.DatetimeIndex(dst.to_wall(fr.index))
+    firsts = np.flatnonzero(~wallclock.duplicated())  # position of first occurence
+    unique = wallclock[firsts]
+    positions = unique.get_indexer(idx_out)
+    if (notfound := positions == -1).any():  # take value of prev hour
+        prevhour = idx_out[notfound] - pd.Timedelta(hours=1)
+        positions[notfound] = unique.get_indexer(prevhour)
+        if (positions == -1).any():
+            missing = idx_out[positions == -1]
+            raise KeyError(f"Timestamps not found in input: {list(missing[:3])}.")
+    return fr.take(firsts[positions]).set_axis(idx_out)